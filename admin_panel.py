@@ -1,9 +1,48 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 from tkcalendar import Calendar
 import database
+import seat_feed
+import sessions
+from seat_canvas import SeatCanvas, fit_cell_size
+from seat_map import available_layouts
+from task_runner import run_in_background
 from datetime import datetime, timedelta
 
+# Seat Management polling period, used when the live seat feed is not running
+AUTO_REFRESH_INTERVAL_MS = 1000
+# How often Live Updates re-reads seat holds (holds expire without feed events)
+HOLD_REFRESH_INTERVAL_MS = 2000
+# Quick-pick buttons in the show time dialog (any HH:MM can be typed)
+QUICK_SHOW_TIMES = ["10:00", "13:00", "16:00", "19:00", "22:00"]
+# Seat Management cards: colors per seat state (fill, text) and grid size
+ADMIN_SEAT_STYLES = {
+    'available': ('#202020', 'white'),
+    'held': ('#4a3b12', 'white'),
+    'booked': ('#ff3b3b', 'white'),
+}
+ADMIN_SEAT_AREA_SIZE = (900, 520)
+MOVIE_GENRES = [
+    'Action',
+    'Adventure', 
+    'Animation',
+    'Comedy',
+    'Crime',
+    'Drama',
+    'Fantasy',
+    'Horror',
+    'Mystery',
+    'Romance',
+    'Sci-Fi',
+    'Thriller',
+    'Documentary',
+    'Family',
+    'Musical',
+    'War',
+    'Western',
+    'Superhero'
+]
+
 # Import refresh_movies_display from nova_movie module
 try:
     from nova_movie import refresh_movies_display
@@ -37,7 +76,13 @@ def create_back_button(parent, command):
     return back_btn
 
 def create_admin_panel(root, user=None):
-    """Create admin panel window with authentication check."""
+    """
+    Create admin panel window with authentication check.
+
+    The admin is taken from the session on the main window (root.master),
+    not from `user`; admin actions re-check it (admin_session_valid).
+    """
+    user = sessions.get_session_user(getattr(root.master, 'session_token', None))
     if user is None or user.get('role') != 'admin':
         messagebox.showerror("Access Denied", "You must be logged in as an admin to access this panel.")
         root.destroy()
@@ -57,15 +102,7 @@ def create_admin_panel(root, user=None):
     
     def handle_back():
         if messagebox.askyesno("Confirm", "Return to main window? You will be logged out."):
-            root.master.logged_in_user = None  # Clear login state
-            root.destroy()
-            root.master.deiconify()  # Show the main window
-            # Update login button text in main window
-            for widget in root.master.winfo_children():
-                if isinstance(widget, tk.Button) and widget.cget('text') in ["Login", "Logout"]:
-                    widget.config(text="Login")
-            # Call refresh directly on the main window
-            root.master.after(100, lambda: root.master.refresh_movies_display())
+            end_admin_session(root)
     
     # Add back button
     back_btn = create_back_button(root, handle_back)
@@ -105,6 +142,85 @@ def create_admin_panel(root, user=None):
                           command=lambda: handle_logout(root))
     logout_btn.place(relx=0.95, rely=0.02, anchor='ne')
 
+def attach_pager(tree, scrollbar, fetch_page, row_values, page_size, status_label, noun,
+                 filters=None):
+    """
+    Fill a Treeview a page at a time as it is scrolled towards its end.
+
+    Each row's item id is its first value (the table's primary key), so
+    callers can update or delete single rows with tree.item/tree.delete.
+
+    Args:
+        tree (ttk.Treeview): Tree to fill; takes over its yscrollcommand
+        scrollbar (ttk.Scrollbar): The tree's scrollbar
+        fetch_page (callable): fetch_page(after, filters) -> rows following
+            row `after` (None for the first page); runs on a worker thread
+        row_values (callable): Row -> tuple of column values
+        page_size (int): Rows per full page; a shorter page is the last
+        status_label (tk.Label): Shows how many rows are loaded
+        noun (str): What the rows are, e.g. 'users'
+        filters (dict): Filters for fetch_page, edited on the Tk thread;
+            reload() takes a copy, so every page of one listing uses the
+            same filters and workers never see the dict change
+
+    Returns:
+        callable: reload() - clear the tree and load the first page again
+    """
+    state = {'last_row': None, 'has_more': False, 'filters': {}}
+    key = ('pager', str(tree))
+
+    def load_page():
+        # Clearing has_more first also stops the scroll callback re-entering
+        # while the page is on its way
+        state['has_more'] = False
+        status_label.config(text=f"Loading {noun}...")
+        run_in_background(fetch_page, state['last_row'], state['filters'], on_done=show_page,
+                          on_error=page_failed, owner=tree, key=key)
+
+    def page_failed(e):
+        print(f"[ERROR] Failed to load {noun}: {e}")
+        status_label.config(text=f"Failed to load {noun}: {e}")
+
+    def show_page(rows):
+        for row in rows:
+            values = row_values(row)
+            if not tree.exists(values[0]):
+                tree.insert('', 'end', iid=values[0], values=values)
+        if rows:
+            state['last_row'] = rows[-1]
+        state['has_more'] = len(rows) >= page_size
+        status_label.config(text=f"{len(tree.get_children())} {noun} shown" +
+                            (" - scroll down for more" if state['has_more'] else ""))
+
+    def on_tree_scroll(first, last):
+        scrollbar.set(first, last)
+        if state['has_more'] and float(last) >= 0.9:
+            load_page()
+
+    def reload():
+        state.update(last_row=None, has_more=False, filters=dict(filters or {}))
+        tree.delete(*tree.get_children())
+        tree.yview_moveto(0)
+        load_page()
+
+    tree.configure(yscrollcommand=on_tree_scroll)
+    return reload
+
+def debounce(widget, callback, delay_ms=300):
+    """Return a function that calls `callback` once calls pause for delay_ms."""
+    pending = [None]
+
+    def trigger(*args):
+        if pending[0] is not None:
+            widget.after_cancel(pending[0])
+        pending[0] = widget.after(delay_ms, fire)
+
+    def fire():
+        pending[0] = None
+        callback()
+
+    return trigger
+
 def create_users_tab(parent):
     frame = tk.Frame(parent, bg='#151515')
     frame.pack(expand=True, fill='both', padx=10, pady=10)
@@ -115,6 +231,34 @@ def create_users_tab(parent):
                           bg='#151515', fg='white')
     title_label.pack(pady=(0, 20))
 
+    # Filters (applied by the database, see database.search_users)
+    filter_frame = tk.Frame(frame, bg='#151515')
+    filter_frame.pack(fill='x', pady=(0, 10))
+
+    username_var = tk.StringVar()
+    role_var = tk.StringVar(value='All')
+    from_var = tk.StringVar()
+    to_var = tk.StringVar()
+
+    tk.Label(filter_frame, text="Username starts with:", bg='#151515',
+             fg='white').pack(side='left')
+    tk.Entry(filter_frame, textvariable=username_var, width=16).pack(side='left', padx=(5, 15))
+    tk.Label(filter_frame, text="Role:", bg='#151515', fg='white').pack(side='left')
+    role_combo = ttk.Combobox(filter_frame, textvariable=role_var, width=10,
+                              values=['All', 'admin', 'customer'], state='readonly')
+    role_combo.pack(side='left', padx=(5, 15))
+    tk.Label(filter_frame, text="Joined from:", bg='#151515', fg='white').pack(side='left')
+    from_entry = tk.Entry(filter_frame, textvariable=from_var, width=11)
+    from_entry.pack(side='left', padx=5)
+    tk.Label(filter_frame, text="to:", bg='#151515', fg='white').pack(side='left')
+    to_entry = tk.Entry(filter_frame, textvariable=to_var, width=11)
+    to_entry.pack(side='left', padx=5)
+    tk.Label(filter_frame, text="(YYYY-MM-DD)", bg='#151515',
+             fg='#888888').pack(side='left')
+
+    status_label = tk.Label(frame, text="", bg='#151515', fg='#888888', anchor='w')
+    status_label.pack(fill='x')
+
     # Create treeview
     columns = ('ID', 'Name', 'Username', 'Phone', 'Role', 'Created At')
     tree = ttk.Treeview(frame, columns=columns, show='headings', height=20)
@@ -126,45 +270,76 @@ def create_users_tab(parent):
 
     # Add scrollbar
     scrollbar = ttk.Scrollbar(frame, orient='vertical', command=tree.yview)
-    tree.configure(yscrollcommand=scrollbar.set)
     
     tree.pack(side='left', expand=True, fill='both')
     scrollbar.pack(side='right', fill='y')
 
+    def read_filters():
+        dates = []
+        for entry, var in ((from_entry, from_var), (to_entry, to_var)):
+            text = var.get().strip()
+            try:
+                dates.append(datetime.strptime(text, '%Y-%m-%d').date() if text else None)
+                entry.configure(bg='white')
+            except ValueError:
+                entry.configure(bg='#ffcccc')
+                return None
+        return {
+            'username_prefix': username_var.get().strip() or None,
+            'role': None if role_var.get() == 'All' else role_var.get(),
+            'created_from': dates[0],
+            'created_to': dates[1],
+        }
+
+    # Rows are fetched a page at a time as the list is scrolled towards
+    # its end, so opening the tab never loads the whole user table
+    filters = {}
+    reload_users = attach_pager(
+        tree, scrollbar,
+        lambda after, page_filters: database.search_users(after=after, **page_filters),
+        lambda user: (user['user_id'], user['name'], user['username'],
+                      user['phone_number'], user['role'], user['created_at']),
+        database.USER_PAGE_SIZE, status_label, 'users', filters)
+
     def load_users():
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        conn = database.get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM nm_users")
-        
-        for user in cursor.fetchall():
-            tree.insert('', 'end', values=(
-                user['user_id'],
-                user['name'],
-                user['username'],
-                user['phone_number'],
-                user['role'],
-                user['created_at']
-            ))
-            
-        cursor.close()
-        conn.close()
+        new_filters = read_filters()
+        if new_filters is None:
+            status_label.config(text="Dates must be YYYY-MM-DD")
+            return
+        filters.clear()
+        filters.update(new_filters)
+        reload_users()
+
+    on_filter_change = debounce(frame, load_users)
+    for var in (username_var, role_var, from_var, to_var):
+        var.trace_add('write', on_filter_change)
 
     # Add refresh button
     tk.Button(frame, text="Refresh", command=load_users,
              bg='#ff3b3b', fg='white').pack(pady=10)
 
+    def delete_selected_users():
+        selected = tree.selection()
+        delete_user(tree, on_deleted=lambda: tree.delete(*selected))
+
     # Add delete button
     tk.Button(frame, text="Delete User", 
-             command=lambda: delete_user(tree) and load_users(),
+             command=delete_selected_users,
              bg='#ff3b3b', fg='white').pack(side='left', padx=5)
 
     # Load initial data
     load_users()
     return frame
 
+def parse_show_time(text):
+    """Turn '9:30', '09:30' or '09:30:00' into 'HH:MM:SS' (None if invalid)."""
+    text = text.strip()
+    try:
+        parsed = datetime.strptime(text, '%H:%M:%S' if text.count(':') == 2 else '%H:%M')
+    except ValueError:
+        return None
+    return parsed.strftime('%H:%M:%S')
+
 def create_movies_tab(parent):
     frame = tk.Frame(parent, bg='#151515')
     frame.pack(expand=True, fill='both', padx=10, pady=10)
@@ -175,8 +350,29 @@ def create_movies_tab(parent):
                           bg='#151515', fg='white')
     title_label.pack(pady=(0, 20))
 
+    # Search (applied by the database, see database.search_movies)
+    filter_frame = tk.Frame(frame, bg='#151515')
+    filter_frame.pack(fill='x', pady=(0, 10))
+
+    title_var = tk.StringVar()
+    genre_filter_var = tk.StringVar(value='All')
+    status_filter_var = tk.StringVar(value='All')
+
+    tk.Label(filter_frame, text="Title starts with:", bg='#151515',
+             fg='white').pack(side='left')
+    tk.Entry(filter_frame, textvariable=title_var, width=20).pack(side='left', padx=(5, 15))
+    tk.Label(filter_frame, text="Genre:", bg='#151515', fg='white').pack(side='left')
+    ttk.Combobox(filter_frame, textvariable=genre_filter_var, width=12,
+                 values=['All'] + MOVIE_GENRES, state='readonly').pack(side='left', padx=(5, 15))
+    tk.Label(filter_frame, text="Status:", bg='#151515', fg='white').pack(side='left')
+    ttk.Combobox(filter_frame, textvariable=status_filter_var, width=10,
+                 values=['All', 'active', 'inactive'], state='readonly').pack(side='left', padx=5)
+
+    status_label = tk.Label(frame, text="", bg='#151515', fg='#888888', anchor='w')
+    status_label.pack(fill='x')
+
     # Create treeview
-    columns = ('ID', 'Title', 'Genre', 'Price', 'Show Date', 'Show Time', 'Status')
+    columns = ('ID', 'Title', 'Genre', 'Price', 'Show Date', 'Show Time', 'Screen', 'Status')
     tree = ttk.Treeview(frame, columns=columns, show='headings', height=20)
     
     # Configure columns
@@ -186,49 +382,82 @@ def create_movies_tab(parent):
 
     # Add scrollbar
     scrollbar = ttk.Scrollbar(frame, orient='vertical', command=tree.yview)
-    tree.configure(yscrollcommand=scrollbar.set)
     
     tree.pack(side='left', expand=True, fill='both')
     scrollbar.pack(side='right', fill='y')
 
-    def load_movies():
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        conn = database.get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM nm_movies ORDER BY show_date, show_time")
-        
-        for movie in cursor.fetchall():
-            tree.insert('', 'end', values=(
-                movie['movie_id'],
-                movie['title'],
-                movie['genre'],
-                f"₹{movie['price']}",
-                movie['show_date'],
-                movie['show_time'],
-                movie['status']
-            ))
-            
-        cursor.close()
-        conn.close()
+    def movie_values(movie):
+        return (
+            movie['movie_id'],
+            movie['title'],
+            movie['genre'],
+            f"₹{movie['price']}",
+            movie['show_date'],
+            movie['show_time'],
+            movie['screen_name'] or '',
+            movie['status']
+        )
 
-    def add_edit_movie(movie_id=None):
-        """Create window for adding/editing movies."""
-        window = tk.Toplevel()
-        window.title("Edit Movie" if movie_id else "Add Movie")
-        window.configure(bg='#151515')
-        window.geometry("500x600")
+    # Shows are fetched a page at a time as the list is scrolled; edits
+    # update their own row instead of reloading the list
+    filters = {}
+    reload_movies = attach_pager(
+        tree, scrollbar,
+        lambda after, page_filters: database.search_movies(after=after, **page_filters),
+        movie_values, database.MOVIE_PAGE_SIZE, status_label, 'shows', filters)
 
-        # Get existing data if editing
-        movie_data = {}
+    def load_movies():
+        filters.clear()
+        filters.update(
+            title_prefix=title_var.get().strip() or None,
+            genre=None if genre_filter_var.get() == 'All' else genre_filter_var.get(),
+            status=None if status_filter_var.get() == 'All' else status_filter_var.get(),
+        )
+        reload_movies()
+
+    def refresh_movie_row(movie_id):
+        """Re-read one show and update (or add) its row in place."""
+        run_in_background(database.get_show, movie_id,
+                          on_done=lambda movie: show_movie_row(movie_id, movie),
+                          on_error=lambda e: print(f"[ERROR] Failed to reload movie {movie_id}: {e}"),
+                          owner=tree)
+
+    def show_movie_row(movie_id, movie):
+        if movie is None:
+            if tree.exists(movie_id):
+                tree.delete(movie_id)
+        elif tree.exists(movie_id):
+            tree.item(movie_id, values=movie_values(movie))
+        else:
+            # New shows go on top, where the admin is looking
+            tree.insert('', 0, iid=movie_id, values=movie_values(movie))
+            tree.selection_set(movie_id)
+            tree.see(movie_id)
+
+    on_filter_change = debounce(frame, load_movies)
+    for var in (title_var, genre_filter_var, status_filter_var):
+        var.trace_add('write', on_filter_change)
+
+    def add_edit_movie(movie_id=None, copy_from=None):
+        """
+        Create window for adding/editing movies.
+
+        Each row is one show; pass copy_from to schedule another show of
+        an existing movie (same title, genre and price, new date/time).
+        """
+        run_in_background(load_movie_form, movie_id or copy_from,
+                          on_done=lambda data: open_movie_form(movie_id, copy_from, *data),
+                          owner=frame, key='movie_form')
+
+    def open_movie_form(movie_id, copy_from, movie_data, screens):
+        """Build the add/edit window from the show being edited or copied."""
+        window = tk.Toplevel()
         if movie_id:
-            conn = database.get_db_connection()
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM nm_movies WHERE movie_id = %s", (movie_id,))
-            movie_data = cursor.fetchone() or {}
-            cursor.close()
-            conn.close()
+            window.title("Edit Movie")
+        else:
+            window.title("Schedule Show" if copy_from else "Add Movie")
+        window.configure(bg='#151515')
+        window.geometry("500x720")
 
         # Create form fields
         tk.Label(window, text="Movie Title:", bg='#151515', fg='white').pack(pady=5)
@@ -237,28 +466,8 @@ def create_movies_tab(parent):
         title_entry.pack(pady=5)
 
         tk.Label(window, text="Genre:", bg='#151515', fg='white').pack(pady=5)
-        genres = [
-            'Action',
-            'Adventure', 
-            'Animation',
-            'Comedy',
-            'Crime',
-            'Drama',
-            'Fantasy',
-            'Horror',
-            'Mystery',
-            'Romance',
-            'Sci-Fi',
-            'Thriller',
-            'Documentary',
-            'Family',
-            'Musical',
-            'War',
-            'Western',
-            'Superhero'
-        ]
-        genre_var = tk.StringVar(value=movie_data.get('genre', genres[0]))
-        genre_combo = ttk.Combobox(window, textvariable=genre_var, values=genres)
+        genre_var = tk.StringVar(value=movie_data.get('genre', MOVIE_GENRES[0]))
+        genre_combo = ttk.Combobox(window, textvariable=genre_var, values=MOVIE_GENRES)
         genre_combo.pack(pady=5)
 
         tk.Label(window, text="Price (₹):", bg='#151515', fg='white').pack(pady=5)
@@ -294,9 +503,26 @@ def create_movies_tab(parent):
                 print(f"Error setting date: {e}")
                 # If there's an error, keep the current date
 
+        # Screen and show time
+        screen_ids = {screen['name']: screen['screen_id'] for screen in screens}
+        current_screen = next((screen['name'] for screen in screens
+                               if screen['screen_id'] == movie_data.get('screen_id')),
+                              screens[0]['name'] if screens else '')
+        
+        tk.Label(window, text="Screen:", bg='#151515', fg='white').pack(pady=5)
+        screen_var = tk.StringVar(value=current_screen)
+        ttk.Combobox(window, textvariable=screen_var, values=list(screen_ids),
+                     state='readonly').pack(pady=5)
+        
+        tk.Label(window, text="Show Time (HH:MM):", bg='#151515', fg='white').pack(pady=5)
+        time_entry = tk.Entry(window, width=10)
+        if movie_data.get('show_time') is not None and not copy_from:
+            time_entry.insert(0, str(movie_data['show_time'])[:5])
+        time_entry.pack(pady=5)
+
         # Status (default to inactive for new movies)
         tk.Label(window, text="Status:", bg='#151515', fg='white').pack(pady=5)
-        status_var = tk.StringVar(value=movie_data.get('status', 'inactive'))
+        status_var = tk.StringVar(value='inactive' if copy_from else movie_data.get('status', 'inactive'))
         status_frame = tk.Frame(window, bg='#151515')
         status_frame.pack(pady=5)
         
@@ -317,70 +543,43 @@ def create_movies_tab(parent):
                 messagebox.showerror("Error", "Invalid price!")
                 return
 
-            # Check active movie limit for the selected date
-            if status_var.get() == 'active':
-                active_count = database.check_active_movies_for_date(
-                    cal.get_date(), 
-                    movie_id
-                )
-                
-                if active_count >= 3:
+            show_time = parse_show_time(time_entry.get()) if time_entry.get().strip() else None
+            if time_entry.get().strip() and not show_time:
+                messagebox.showerror("Error", "Invalid show time! Use HH:MM, e.g. 18:30")
+                return
+            screen_id = screen_ids.get(screen_var.get())
+            if status_var.get() == 'active' and not show_time:
+                messagebox.showerror("Error", "Active shows need a show time!")
+                return
+
+            show = (title_entry.get(), genre_var.get(), price, cal.get_date(),
+                    show_time, screen_id, status_var.get())
+
+            def finish_save(saved_id):
+                if saved_id is None:
                     messagebox.showerror(
                         "Error", 
-                        "Maximum limit of 3 active movies reached for this date! "
-                        "Please deactivate another movie first or choose a different date."
+                        f"{screen_var.get()} already has a show within "
+                        f"{database.SHOW_SLOT_MINUTES} minutes of {show_time[:5]} on this date! "
+                        "Please choose a different time or screen."
                     )
                     return
-
-            # Save to database
-            conn = database.get_db_connection()
-            cursor = conn.cursor()
-            
-            try:
-                if movie_id:
-                    cursor.execute("""
-                        UPDATE nm_movies 
-                        SET title = %s, genre = %s, price = %s,
-                            show_date = %s, status = %s
-                        WHERE movie_id = %s
-                    """, (
-                        title_entry.get(),
-                        genre_var.get(),
-                        price,
-                        cal.get_date(),
-                        status_var.get(),
-                        movie_id
-                    ))
-                else:
-                    cursor.execute("""
-                        INSERT INTO nm_movies 
-                        (title, genre, price, show_date, status)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (
-                        title_entry.get(),
-                        genre_var.get(),
-                        price,
-                        cal.get_date(),
-                        status_var.get()
-                    ))
-                
-                conn.commit()
                 messagebox.showinfo("Success", 
                     "Movie updated successfully!" if movie_id else "Movie added successfully!")
                 window.destroy()
-                load_movies()
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save movie: {str(e)}")
-                conn.rollback()
-            
-            finally:
-                cursor.close()
-                conn.close()
+                refresh_movie_row(saved_id)
+
+            if not admin_session_valid(parent):
+                return
+            run_in_background(database.save_show, movie_id, show, on_done=finish_save,
+                              on_error=lambda e: messagebox.showerror(
+                                  "Error", f"Failed to save movie: {str(e)}"),
+                              busy=(save_button,))
 
         # Save button
-        tk.Button(window, text="Save Changes", command=save_movie,
-                 bg='#ff3b3b', fg='white', font=("Helvetica", 12, "bold")).pack(pady=20)
+        save_button = tk.Button(window, text="Save Changes", command=save_movie,
+                 bg='#ff3b3b', fg='white', font=("Helvetica", 12, "bold"))
+        save_button.pack(pady=20)
 
     def toggle_movie_status():
         """Handle movie status toggle with improved UI."""
@@ -391,140 +590,168 @@ def create_movies_tab(parent):
         
         movie_id = tree.item(selected[0])['values'][0]
         movie_title = tree.item(selected[0])['values'][1]
-        current_status = tree.item(selected[0])['values'][6]
+        current_status = tree.item(selected[0])['values'][7]
         new_status = 'inactive' if current_status == 'active' else 'active'
         
         if new_status == 'active':
-            # Check active movie limit
-            active_count = database.get_active_movie_count()
-            if active_count >= 3:
-                messagebox.showerror(
-                    "Error", 
-                    "Maximum limit of 3 active movies reached!\nPlease deactivate another movie first."
-                )
-                return
-            
-            # Create and configure time selection dialog
-            time_dialog = tk.Toplevel()
-            time_dialog.title(f"Set Show Time - {movie_title}")
-            time_dialog.geometry("400x500")
-            time_dialog.configure(bg='#151515')
-            
-            # Center the dialog
-            screen_width = time_dialog.winfo_screenwidth()
-            screen_height = time_dialog.winfo_screenheight()
-            x = (screen_width - 400) // 2
-            y = (screen_height - 500) // 2
-            time_dialog.geometry(f"400x500+{x}+{y}")
-            
-            # Create main container
-            main_frame = tk.Frame(time_dialog, bg='#151515', padx=30, pady=20)
-            main_frame.pack(expand=True, fill='both')
-            
-            # Header
-            header_frame = tk.Frame(main_frame, bg='#151515')
-            header_frame.pack(fill='x', pady=(0, 20))
-            
-            tk.Label(header_frame, 
-                    text="Activate Movie", 
-                    font=("Helvetica", 16, "bold"),
-                    bg='#151515', fg='#ff3b3b').pack()
-                    
-            tk.Label(header_frame, 
-                    text=movie_title,
-                    font=("Helvetica", 12),
-                    bg='#151515', fg='white').pack(pady=5)
-            
-            # Time slots section
-            tk.Label(main_frame, 
-                    text="Select Available Time Slot", 
-                    font=("Helvetica", 12, "bold"),
-                    bg='#151515', fg='white').pack(pady=(0, 10))
-            
-            # Create time slots container
-            time_frame = tk.Frame(main_frame, bg='#151515')
-            time_frame.pack(pady=10)
-            
-            # Fixed show times
-            times = ["10:00:00", "13:00:00", "16:00:00", "19:00:00"]
-            selected_time = tk.StringVar()
-            time_buttons = []
-            
-            def select_time(time):
-                selected_time.set(time)
-                for btn in time_buttons:
-                    if btn['text'] == time[:5]:
-                        btn.configure(bg='#ff3b3b', fg='white')
-                    else:
-                        btn.configure(bg='#202020', fg='white')
-            
-            # Create time slot buttons
-            for time in times:
-                try:
-                    if database.check_time_slot_available(time, movie_id):
-                        btn = tk.Button(time_frame, 
-                                      text=time[:5],
-                                      width=10, height=2,
-                                      font=("Helvetica", 11),
-                                      bg='#202020', fg='white',
-                                      command=lambda t=time: select_time(t))
-                        btn.pack(pady=5)
-                        time_buttons.append(btn)
-                    else:
-                        # Show unavailable time slots as disabled
-                        tk.Button(time_frame,
-                                 text=f"{time[:5]} (Taken)",
-                                 width=15, height=2,
-                                 font=("Helvetica", 11),
-                                 bg='#333333', fg='#666666',
-                                 state='disabled').pack(pady=5)
-                except Exception as e:
-                    print(f"Error checking time slot {time}: {e}")
-            
-            def confirm_time():
-                if not selected_time.get():
-                    messagebox.showwarning("Warning", "Please select a time slot")
-                    return
-                    
-                try:
-                    database.set_movie_active_status(movie_id, new_status, selected_time.get())
-                    messagebox.showinfo("Success", 
-                                      f"Movie '{movie_title}' activated\nShow time set to {selected_time.get()[:5]}")
-                    load_movies()
-                    time_dialog.destroy()
-                except Exception as e:
-                    messagebox.showerror("Error", str(e))
-            
-            # Buttons frame
-            button_frame = tk.Frame(main_frame, bg='#151515')
-            button_frame.pack(pady=20)
-            
-            # Cancel button
-            tk.Button(button_frame,
-                     text="Cancel",
-                     width=12,
-                     font=("Helvetica", 11),
-                     bg='#333333', fg='white',
-                     command=time_dialog.destroy).pack(side='left', padx=5)
-            
-            # Confirm button
-            tk.Button(button_frame,
-                     text="Activate",
-                     width=12,
-                     font=("Helvetica", 11, "bold"),
-                     bg='#ff3b3b', fg='white',
-                     command=confirm_time).pack(side='left', padx=5)
-            
+            run_in_background(load_movie_form, movie_id,
+                              on_done=lambda data: open_activation_dialog(movie_id, movie_title, *data),
+                              owner=tree, key='movie_form')
         else:
             # Deactivating movie
             if messagebox.askyesno("Confirm Deactivate", 
                                  f"Are you sure you want to deactivate '{movie_title}'?"):
-                try:
-                    database.set_movie_active_status(movie_id, new_status)
+                def finish_deactivate(result):
                     messagebox.showinfo("Success", f"Movie '{movie_title}' deactivated")
-                    load_movies()
-                except Exception as e:
-                    messagebox.showerror("Error", str(e))
+                    refresh_movie_row(movie_id)
+
+                if not admin_session_valid(parent):
+                    return
+                run_in_background(database.set_movie_active_status, movie_id, new_status,
+                                  on_done=finish_deactivate,
+                                  on_error=lambda e: messagebox.showerror("Error", str(e)),
+                                  owner=tree)
+
+    def open_activation_dialog(movie_id, movie_title, show, screens):
+        """Ask for the screen and show time of a show being activated."""
+        if not show:
+            messagebox.showerror("Error", "Movie not found")
+            return
+        
+        # Shows dated in the past are re-run today
+        today = datetime.now().date()
+        show_date = show['show_date'] if show['show_date'] and show['show_date'] >= today else today
+        screen_ids = {screen['name']: screen['screen_id'] for screen in screens}
+        
+        # Create and configure time selection dialog
+        time_dialog = tk.Toplevel()
+        time_dialog.title(f"Set Show Time - {movie_title}")
+        time_dialog.geometry("400x540")
+        time_dialog.configure(bg='#151515')
+        
+        # Center the dialog
+        screen_width = time_dialog.winfo_screenwidth()
+        screen_height = time_dialog.winfo_screenheight()
+        x = (screen_width - 400) // 2
+        y = (screen_height - 540) // 2
+        time_dialog.geometry(f"400x540+{x}+{y}")
+        
+        # Create main container
+        main_frame = tk.Frame(time_dialog, bg='#151515', padx=30, pady=20)
+        main_frame.pack(expand=True, fill='both')
+        
+        # Header
+        header_frame = tk.Frame(main_frame, bg='#151515')
+        header_frame.pack(fill='x', pady=(0, 20))
+        
+        tk.Label(header_frame, 
+                text="Activate Movie", 
+                font=("Helvetica", 16, "bold"),
+                bg='#151515', fg='#ff3b3b').pack()
+                
+        tk.Label(header_frame, 
+                text=f"{movie_title} - {show_date}",
+                font=("Helvetica", 12),
+                bg='#151515', fg='white').pack(pady=5)
+        
+        # Screen selection
+        tk.Label(main_frame, 
+                text="Screen", 
+                font=("Helvetica", 12, "bold"),
+                bg='#151515', fg='white').pack(pady=(0, 5))
+        
+        current_screen = next((screen['name'] for screen in screens
+                               if screen['screen_id'] == show['screen_id']),
+                              screens[0]['name'] if screens else '')
+        screen_var = tk.StringVar(value=current_screen)
+        screen_combo = ttk.Combobox(main_frame, textvariable=screen_var,
+                                    values=list(screen_ids), state='readonly')
+        screen_combo.pack(pady=(0, 5))
+        
+        taken_label = tk.Label(main_frame,
+                              font=("Helvetica", 9),
+                              bg='#151515', fg='#888888',
+                              wraplength=320, justify='center')
+        taken_label.pack(pady=(0, 10))
+        
+        # Time section
+        tk.Label(main_frame, 
+                text="Show Time (HH:MM)", 
+                font=("Helvetica", 12, "bold"),
+                bg='#151515', fg='white').pack(pady=(0, 10))
+        
+        time_var = tk.StringVar(value=str(show['show_time'])[:5] if show['show_time'] is not None else '')
+        tk.Entry(main_frame, textvariable=time_var, width=10,
+                font=("Helvetica", 12), justify='center').pack()
+        
+        # Quick picks fill the entry; any other time can be typed
+        time_frame = tk.Frame(main_frame, bg='#151515')
+        time_frame.pack(pady=10)
+        for quick_time in QUICK_SHOW_TIMES:
+            tk.Button(time_frame, 
+                      text=quick_time,
+                      width=6,
+                      font=("Helvetica", 10),
+                      bg='#202020', fg='white',
+                      command=lambda t=quick_time: time_var.set(t)).pack(side='left', padx=2)
+        
+        def show_taken_times(*args):
+            """List the screen's other shows that day."""
+            run_in_background(database.get_screen_schedule,
+                              screen_ids.get(screen_var.get()), show_date,
+                              on_done=list_taken_times,
+                              on_error=lambda e: print(f"Error loading screen schedule: {e}"),
+                              owner=taken_label, key=('taken_times', movie_id))
+
+        def list_taken_times(schedule):
+            taken = [f"{str(show_time)[:5]} {title}" for show_time, title, other_id in schedule
+                     if other_id != movie_id]
+            taken_label.config(text="Taken: " + ", ".join(taken) if taken else "No other shows on this screen")
+        
+        screen_var.trace_add('write', show_taken_times)
+        show_taken_times()
+        
+        def confirm_time():
+            show_time = parse_show_time(time_var.get())
+            if not show_time:
+                messagebox.showwarning("Warning", "Please enter a show time as HH:MM")
+                return
+                
+            def finish_activate(result):
+                messagebox.showinfo("Success", 
+                                  f"Movie '{movie_title}' activated\n"
+                                  f"Show time set to {show_time[:5]} on {screen_var.get()}")
+                refresh_movie_row(movie_id)
+                time_dialog.destroy()
+
+            if not admin_session_valid(parent):
+                return
+            run_in_background(database.set_movie_active_status, movie_id, 'active', show_time,
+                              screen_ids.get(screen_var.get()),
+                              on_done=finish_activate,
+                              on_error=lambda e: messagebox.showerror("Error", str(e)),
+                              busy=(activate_button,))
+        
+        # Buttons frame
+        button_frame = tk.Frame(main_frame, bg='#151515')
+        button_frame.pack(pady=20)
+        
+        # Cancel button
+        tk.Button(button_frame,
+                 text="Cancel",
+                 width=12,
+                 font=("Helvetica", 11),
+                 bg='#333333', fg='white',
+                 command=time_dialog.destroy).pack(side='left', padx=5)
+        
+        # Confirm button
+        activate_button = tk.Button(button_frame,
+                 text="Activate",
+                 width=12,
+                 font=("Helvetica", 11, "bold"),
+                 bg='#ff3b3b', fg='white',
+                 command=confirm_time)
+        activate_button.pack(side='left', padx=5)
 
     # Add buttons frame
     button_frame = tk.Frame(frame, bg='#151515')
@@ -542,12 +769,55 @@ def create_movies_tab(parent):
         )
     )
     edit_btn.pack(side='left', padx=5)
+    
+    def schedule_show():
+        """Add another show (date, time, screen) of the selected movie."""
+        if not tree.selection():
+            messagebox.showwarning("Warning", "Please select a movie")
+            return
+        add_edit_movie(copy_from=int(tree.item(tree.selection()[0])['values'][0]))
+    
+    tk.Button(button_frame, text="Schedule Show", command=schedule_show,
+             bg='#ff3b3b', fg='white').pack(side='left', padx=5)
+    
+    def add_new_screen():
+        name = simpledialog.askstring("Add Screen", "Screen name:", parent=frame)
+        if not name or not name.strip():
+            return
+        layouts = available_layouts()
+        layout = simpledialog.askstring(
+            "Add Screen", f"Seat layout ({', '.join(layouts)}):",
+            initialvalue=database.DEFAULT_SCREEN_LAYOUT, parent=frame)
+        if not layout:
+            return
+        if layout.strip() not in layouts:
+            messagebox.showerror("Error", f"Unknown seat layout '{layout.strip()}'")
+            return
+        name = name.strip()
+
+        def finish_add_screen(screen_id):
+            if screen_id:
+                messagebox.showinfo("Success", f"Screen '{name}' added")
+            else:
+                messagebox.showerror("Error", f"Screen '{name}' already exists")
+
+        if not admin_session_valid(parent):
+            return
+        run_in_background(database.add_screen, name, layout.strip(),
+                          on_done=finish_add_screen, owner=frame)
+    
+    tk.Button(button_frame, text="Add Screen", command=add_new_screen,
+             bg='#ff3b3b', fg='white').pack(side='left', padx=5)
     tk.Button(button_frame, text="Refresh", command=load_movies,
              bg='#ff3b3b', fg='white').pack(side='left', padx=5)
 
+    def delete_selected_movies():
+        selected = tree.selection()
+        delete_movie(tree, on_deleted=lambda: tree.delete(*selected))
+
     # Add delete button
     tk.Button(button_frame, text="Delete Movie", 
-             command=lambda: delete_movie(tree) and load_movies(),
+             command=delete_selected_movies,
              bg='#ff3b3b', fg='white').pack(side='left', padx=5)
 
     # Add status toggle button
@@ -559,6 +829,16 @@ def create_movies_tab(parent):
     load_movies()
     return frame
 
+def load_movie_form(show_id):
+    """
+    Read what the add/edit movie window needs (worker thread).
+
+    Returns:
+        tuple: (show being edited or copied, or {} for a new movie; screens)
+    """
+    movie_data = (database.get_show(show_id) or {}) if show_id else {}
+    return movie_data, database.get_screens()
+
 def create_seat_status_tab(parent):
     """Create tab for viewing seat status."""
     frame = tk.Frame(parent, bg='#080808')
@@ -579,11 +859,11 @@ def create_seat_status_tab(parent):
     controls_frame.pack(side='right')
 
     # Auto refresh switch with modern design
-    auto_refresh_var = tk.BooleanVar(value=False)
+    auto_refresh_var = tk.BooleanVar(value=True)
     switch_frame = tk.Frame(controls_frame, bg='#080808')
     switch_frame.pack(side='left', padx=15)
     
-    tk.Label(switch_frame, text="Auto Refresh", 
+    tk.Label(switch_frame, text="Live Updates", 
             font=("Helvetica", 10),
             bg='#080808', fg='#666666').pack(side='left', padx=(0,10))
             
@@ -597,17 +877,23 @@ def create_seat_status_tab(parent):
     buttons_frame = tk.Frame(controls_frame, bg='#080808')
     buttons_frame.pack(side='left')
     
+    def finish_clear_seats(result):
+        success, message = result
+        if success:
+            messagebox.showinfo("Success", "✓ " + message)
+            refresh_seat_status()
+        else:
+            messagebox.showerror("Error", f"Failed to clear seats: {message}")
+
     def clear_all_seats():
         if messagebox.askyesno("Confirm Clear All", 
                              "⚠️ Warning: This will clear ALL seat bookings for today.\n\n"
                              "This action cannot be undone!", 
                              icon='warning'):
-            success, message = database.clear_seats_for_movie()
-            if success:
-                messagebox.showinfo("Success", "✓ " + message)
-                refresh_seat_status()
-            else:
-                messagebox.showerror("Error", f"Failed to clear seats: {message}")
+            if not admin_session_valid(parent):
+                return
+            run_in_background(database.clear_seats_for_movie,
+                              on_done=finish_clear_seats, busy=(clear_all_button,))
 
     tk.Button(buttons_frame,
               text="⟳ Refresh",
@@ -617,13 +903,14 @@ def create_seat_status_tab(parent):
               width=12,
               relief='flat').pack(side='left', padx=5)
               
-    tk.Button(buttons_frame,
+    clear_all_button = tk.Button(buttons_frame,
               text="🗑️ Clear All",
               command=clear_all_seats,
               bg='#ff3b3b', fg='white',
               font=("Helvetica", 10, "bold"),
               width=12,
-              relief='flat').pack(side='left', padx=5)
+              relief='flat')
+    clear_all_button.pack(side='left', padx=5)
 
     # Main content area
     content_frame = tk.Frame(frame, bg='#101010')
@@ -632,7 +919,6 @@ def create_seat_status_tab(parent):
     def create_movie_card(movie_data, parent):
         """Create modern card for each movie."""
         card = tk.Frame(parent, bg='#151515', padx=20, pady=15)
-        card.pack(fill='x', padx=15, pady=8)
         
         # Header with movie info and controls
         header = tk.Frame(card, bg='#151515')
@@ -642,57 +928,53 @@ def create_seat_status_tab(parent):
         info = tk.Frame(header, bg='#151515')
         info.pack(side='left')
         
-        tk.Label(info, 
+        title_label = tk.Label(info, 
                 text=movie_data['title'],
                 font=("Helvetica", 16, "bold"),
-                bg='#151515', fg='white').pack(anchor='w')
+                bg='#151515', fg='white')
+        title_label.pack(anchor='w')
                 
-        tk.Label(info,
-                text=f"🕒 {str(movie_data['show_time'])[:5]}",
+        time_label = tk.Label(info,
+                text=f"🕒 {str(movie_data['show_time'])[:5]}  {movie_data.get('screen_name') or ''}",
                 font=("Helvetica", 12),
-                bg='#151515', fg='#888888').pack(anchor='w')
+                bg='#151515', fg='#888888')
+        time_label.pack(anchor='w')
 
         # Right side - Stats and controls
         controls = tk.Frame(header, bg='#151515')
         controls.pack(side='right')
         
-        booked_seats = movie_data['booked_seats'].split(',') if movie_data['booked_seats'] else []
-        total_seats = 49
-        booked_count = len(booked_seats)
-        available = total_seats - booked_count
-        
-        # Stats with icons
+        # Stats with icons (filled in by update_movie_card)
         stats = tk.Frame(controls, bg='#151515')
         stats.pack(side='left', padx=15)
         
-        tk.Label(stats,
-                text=f"🔴 {booked_count} Booked",
+        booked_label = tk.Label(stats,
                 font=("Helvetica", 12),
-                bg='#151515', fg='#ff3b3b').pack(side='left', padx=10)
+                bg='#151515', fg='#ff3b3b')
+        booked_label.pack(side='left', padx=10)
                 
-        tk.Label(stats,
-                text=f"🟢 {available} Available",
+        available_label = tk.Label(stats,
                 font=("Helvetica", 12),
-                bg='#151515', fg='#4CAF50').pack(side='left', padx=10)
+                bg='#151515', fg='#4CAF50')
+        available_label.pack(side='left', padx=10)
 
         # Clear button
         def clear_movie_seats():
             if messagebox.askyesno("Confirm Clear",
                                  f"Clear all bookings for '{movie_data['title']}'?",
                                  icon='warning'):
-                success, message = database.clear_seats_for_movie(movie_data['movie_id'])
-                if success:
-                    messagebox.showinfo("Success", "✓ " + message)
-                    refresh_seat_status()
-                else:
-                    messagebox.showerror("Error", f"Failed to clear seats: {message}")
+                if not admin_session_valid(parent):
+                    return
+                run_in_background(database.clear_seats_for_movie, movie_data['movie_id'],
+                                  on_done=finish_clear_seats, busy=(clear_button,))
 
-        tk.Button(controls,
+        clear_button = tk.Button(controls,
                  text="Clear Seats",
                  command=clear_movie_seats,
                  bg='#ff3b3b', fg='white',
                  font=("Helvetica", 10),
-                 relief='flat').pack(side='right')
+                 relief='flat')
+        clear_button.pack(side='right')
 
         # Seat grid
         seats_frame = tk.Frame(card, bg='#151515')
@@ -700,199 +982,345 @@ def create_seat_status_tab(parent):
         
         def show_booking_details(seat_num):
             """Show booking details for a seat."""
-            try:
-                connection = database.get_db_connection()
-                cursor = connection.cursor(dictionary=True)
-                
-                # Get booking details including user info
-                cursor.execute("""
-                    SELECT s.*, u.name, u.phone_number 
-                    FROM nm_seats s
-                    JOIN nm_users u ON s.user_id = u.user_id
-                    WHERE s.movie_id = %s 
-                    AND s.seat_number = %s 
-                    AND s.booking_date = CURDATE()
-                """, (movie_data['movie_id'], seat_num))
-                
-                booking = cursor.fetchone()
-                cursor.close()
-                connection.close()
-                
-                if booking:
-                    # Create details window
-                    details_window = tk.Toplevel()
-                    details_window.title(f"Booking Details - Seat {seat_num}")
-                    details_window.configure(bg='#151515')
-                    
-                    # Center the window
-                    window_width = 400
-                    window_height = 350  # Increased height for new button
-                    screen_width = details_window.winfo_screenwidth()
-                    screen_height = details_window.winfo_screenheight()
-                    x = (screen_width - window_width) // 2
-                    y = (screen_height - window_height) // 2
-                    details_window.geometry(f"{window_width}x{window_height}+{x}+{y}")
-                    
-                    # Add details
-                    tk.Label(details_window, 
-                            text="Booking Details",
-                            font=("Helvetica", 16, "bold"),
-                            bg='#151515', fg='#ff3b3b').pack(pady=20)
-                    
-                    details_frame = tk.Frame(details_window, bg='#151515')
-                    details_frame.pack(pady=10)
-                    
-                    details = [
-                        ("Movie", movie_data['title']),
-                        ("Seat", seat_num),
-                        ("Customer Name", booking['name']),
-                        ("Phone Number", booking['phone_number']),
-                        ("Booking Date", booking['booking_date'].strftime("%Y-%m-%d")),
-                    ]
-                    
-                    for label, value in details:
-                        row = tk.Frame(details_frame, bg='#151515')
-                        row.pack(pady=5, fill='x')
-                        
-                        tk.Label(row, text=f"{label}:", 
-                                font=("Helvetica", 11),
-                                width=15, anchor='e',
-                                bg='#151515', fg='#888888').pack(side='left', padx=5)
-                                
-                        tk.Label(row, text=value,
-                                font=("Helvetica", 11, "bold"),
-                                bg='#151515', fg='white').pack(side='left', padx=5)
-                    
-                    # Add buttons frame
-                    buttons_frame = tk.Frame(details_window, bg='#151515')
-                    buttons_frame.pack(pady=20)
-                    
-                    def clear_single_booking():
-                        if messagebox.askyesno("Confirm Clear",
-                                             f"Are you sure you want to clear the booking for seat {seat_num}?",
-                                             icon='warning'):
-                            success, message = database.clear_single_seat(movie_data['movie_id'], seat_num)
-                            if success:
-                                messagebox.showinfo("Success", f"Booking for seat {seat_num} has been cleared")
-                                details_window.destroy()
-                                refresh_seat_status()  # Refresh the seat display
-                            else:
-                                messagebox.showerror("Error", f"Failed to clear booking: {message}")
-                    
-                    # Clear booking button
-                    tk.Button(buttons_frame,
-                             text="Clear Booking",
-                             command=clear_single_booking,
-                             bg='#ff3b3b', fg='white',
-                             font=("Helvetica", 11),
-                             width=15).pack(side='left', padx=5)
-                    
-                    # Close button
-                    tk.Button(buttons_frame,
-                             text="Close",
-                             command=details_window.destroy,
-                             bg='#333333', fg='white',
-                             font=("Helvetica", 11),
-                             width=15).pack(side='left', padx=5)
-                    
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to fetch booking details: {str(e)}")
-            finally:
-                if 'cursor' in locals():
-                    cursor.close()
-                if 'connection' in locals():
-                    connection.close()
+            # The seat's whole booking (customer and all its seats)
+            if not admin_session_valid(parent):
+                return
+            run_in_background(
+                database.get_seat_booking, movie_data['movie_id'], seat_num,
+                on_done=lambda booking: open_booking_details(seat_num, booking),
+                on_error=lambda e: messagebox.showerror(
+                    "Error", f"Failed to fetch booking details: {str(e)}"),
+                owner=card)
         
-        rows = "ABCDEFG"
-        for row_idx, row in enumerate(rows):
-            tk.Label(seats_frame,
-                    text=row,
-                    font=("Helvetica", 10),
-                    bg='#151515', fg='#666666').grid(row=row_idx, column=0, padx=10)
+        def open_booking_details(seat_num, booking):
+            """Open the details window of a seat's booking."""
+            if not booking:
+                return
             
-            for col in range(7):
-                seat_num = f"{row}{col+1}"
-                is_booked = seat_num in booked_seats
-                
-                seat = tk.Frame(seats_frame,
-                              bg='#ff3b3b' if is_booked else '#202020',
-                              width=35, height=35)
-                seat.grid(row=row_idx, column=col+1, padx=2, pady=2)
-                seat.pack_propagate(False)
+            # Create details window
+            details_window = tk.Toplevel()
+            details_window.title(f"Booking Details - Seat {seat_num}")
+            details_window.configure(bg='#151515')
+            
+            # Center the window
+            window_width = 420
+            window_height = 420
+            screen_width = details_window.winfo_screenwidth()
+            screen_height = details_window.winfo_screenheight()
+            x = (screen_width - window_width) // 2
+            y = (screen_height - window_height) // 2
+            details_window.geometry(f"{window_width}x{window_height}+{x}+{y}")
+            
+            # Add details
+            tk.Label(details_window, 
+                    text="Booking Details",
+                    font=("Helvetica", 16, "bold"),
+                    bg='#151515', fg='#ff3b3b').pack(pady=20)
+            
+            details_frame = tk.Frame(details_window, bg='#151515')
+            details_frame.pack(pady=10)
+            
+            details = [
+                ("Booking ID", booking['booking_id'] or "-"),
+                ("Movie", movie_data['title']),
+                ("Seat", seat_num),
+                ("Seats in Booking", ", ".join(booking['seat_numbers'])),
+                ("Customer Name", booking['name']),
+                ("Phone Number", booking['phone_number']),
+                ("Booking Date", booking['booking_date'].strftime("%Y-%m-%d")),
+            ]
+            
+            for label, value in details:
+                row = tk.Frame(details_frame, bg='#151515')
+                row.pack(pady=5, fill='x')
                 
-                seat_label = tk.Label(seat,
-                        text=seat_num,
-                        font=("Helvetica", 8),
-                        bg='#151515' if is_booked else '#101010',
-                        fg='white')
-                seat_label.pack(expand=True)
+                tk.Label(row, text=f"{label}:", 
+                        font=("Helvetica", 11),
+                        width=15, anchor='e',
+                        bg='#151515', fg='#888888').pack(side='left', padx=5)
+                        
+                tk.Label(row, text=value,
+                        font=("Helvetica", 11, "bold"),
+                        bg='#151515', fg='white').pack(side='left', padx=5)
+            
+            # Add buttons frame
+            buttons_frame = tk.Frame(details_window, bg='#151515')
+            buttons_frame.pack(pady=20)
+            
+            def clear_single_booking():
+                if not messagebox.askyesno("Confirm Clear",
+                                         f"Are you sure you want to clear the booking for seat {seat_num}?",
+                                         icon='warning'):
+                    return
                 
-                if is_booked:
-                    # Make booked seats clickable
-                    seat_label.bind('<Button-1>', lambda e, s=seat_num: show_booking_details(s))
-                    seat_label.configure(cursor='hand2')  # Change cursor to hand on hover
-                    
-                    # Add tooltip
-                    create_tooltip(seat_label, "Click to view booking details")
+                def finish_clear(result):
+                    success, message = result
+                    if success:
+                        messagebox.showinfo("Success", f"Booking for seat {seat_num} has been cleared")
+                        details_window.destroy()
+                        refresh_seat_status()  # Refresh the seat display
+                    else:
+                        messagebox.showerror("Error", f"Failed to clear booking: {message}")
                 
-                if col == 3:  # Add aisle
-                    tk.Frame(seats_frame, width=20, bg='#151515').grid(
-                        row=row_idx, column=col+2)
-
-    def refresh_seat_status():
-        # Clear existing content
-        for widget in content_frame.winfo_children():
-            widget.destroy()
-
-        movies = database.get_movie_seat_status()
-        
-        if not movies:
-            empty = tk.Frame(content_frame, bg='#101010')
-            empty.pack(expand=True)
+                if not admin_session_valid(parent):
+                    return
+                run_in_background(database.clear_single_seat, movie_data['movie_id'], seat_num,
+                                  on_done=finish_clear, busy=(clear_button,))
+            
+            # Clear booking button
+            clear_button = tk.Button(buttons_frame,
+                                     text="Clear Booking",
+                                     command=clear_single_booking,
+                                     bg='#ff3b3b', fg='white',
+                                     font=("Helvetica", 11),
+                                     width=15)
+            clear_button.pack(side='left', padx=5)
             
-            tk.Label(empty,
-                    text="No Active Movies",
-                    font=("Helvetica", 18, "bold"),
-                    bg='#101010', fg='#666666').pack(pady=(100,10))
-            tk.Label(empty,
-                    text="Activate movies to view seat status",
-                    font=("Helvetica", 12),
-                    bg='#101010', fg='#444444').pack()
+            # Close button
+            tk.Button(buttons_frame,
+                     text="Close",
+                     command=details_window.destroy,
+                     bg='#333333', fg='white',
+                     font=("Helvetica", 11),
+                     width=15).pack(side='left', padx=5)
+        
+        card_state = {
+            'card': card,
+            'title_label': title_label,
+            'time_label': time_label,
+            'booked_label': booked_label,
+            'available_label': available_label,
+            'seat_map': database.get_show_seat_map(movie_data['movie_id']),
+            'canvas': None,     # SeatCanvas with one state per seat
+            'bitmap': 0,
+            'held': 0,          # bitmap of seats held by customers still choosing
+            'version': None,
+        }
+        
+        # One canvas per card; booked seats open their booking on click
+        seat_map = card_state['seat_map']
+        card_state['canvas'] = SeatCanvas(
+            seats_frame, seat_map, ADMIN_SEAT_STYLES,
+            cell=fit_cell_size(seat_map, *ADMIN_SEAT_AREA_SIZE, largest=35, smallest=12),
+            bg='#151515',
+            on_click=show_booking_details,
+            clickable=('booked',),
+            tooltip=("Click to view booking details", ('booked',)))
+        card_state['canvas'].pack(anchor='w', padx=10)
+        
+        update_movie_card(card_state, movie_data)
+        return card_state
+
+    def paint_seats(card_state, changed):
+        """Recolor the seats in the `changed` bitmap from the card's booked/held state."""
+        bitmap = card_state['bitmap']
+        held = card_state['held'] & ~bitmap
+        canvas = card_state['canvas']
+        canvas.paint(changed & bitmap, 'booked')
+        canvas.paint(changed & held, 'held')
+        canvas.paint(changed & ~bitmap & ~held, 'available')
+
+    def update_card_holds(card_state, held):
+        """Recolor seats whose hold state changed."""
+        changed = card_state['held'] ^ held
+        card_state['held'] = held
+        paint_seats(card_state, changed)
+
+    def update_movie_card(card_state, movie_data):
+        """Recolor only the seats whose state changed since the last refresh."""
+        card_state['movie'] = movie_data
+        if card_state['version'] == movie_data['seat_version']:
             return
-
-        # Create scrollable container
-        canvas = tk.Canvas(content_frame, bg='#101010', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(content_frame, orient="vertical", command=canvas.yview)
-        scrollable = tk.Frame(canvas, bg='#101010')
         
-        scrollable.bind("<Configure>",
-                       lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        bitmap = movie_data['seat_bitmap']
+        changed = card_state['bitmap'] ^ bitmap
+        card_state['bitmap'] = bitmap
+        paint_seats(card_state, changed)
         
-        canvas.create_window((0, 0), window=scrollable, anchor="nw", width=canvas.winfo_reqwidth())
-        canvas.configure(yscrollcommand=scrollbar.set)
+        booked_count = bin(bitmap).count("1")
+        card_state['booked_label'].config(text=f"🔴 {booked_count} Booked")
+        card_state['available_label'].config(
+            text=f"🟢 {card_state['seat_map'].total_seats - booked_count} Available")
+        
+        time_text = f"🕒 {str(movie_data['show_time'])[:5]}  {movie_data.get('screen_name') or ''}"
+        if card_state['time_label'].cget('text') != time_text:
+            card_state['time_label'].config(text=time_text)
+        if card_state['title_label'].cget('text') != movie_data['title']:
+            card_state['title_label'].config(text=movie_data['title'])
+        
+        card_state['version'] = movie_data['seat_version']
 
-        # Create movie cards
+    # Widgets are built once and kept alive; refreshes only recolor seats
+    cards = {}      # movie_id -> card state from create_movie_card
+    
+    canvas = tk.Canvas(content_frame, bg='#101010', highlightthickness=0)
+    scrollbar = ttk.Scrollbar(content_frame, orient="vertical", command=canvas.yview)
+    scrollable = tk.Frame(canvas, bg='#101010')
+    
+    scrollable.bind("<Configure>",
+                   lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+    
+    canvas.create_window((0, 0), window=scrollable, anchor="nw", width=canvas.winfo_reqwidth())
+    canvas.configure(yscrollcommand=scrollbar.set)
+    
+    empty = tk.Frame(content_frame, bg='#101010')
+    tk.Label(empty,
+            text="No Active Movies",
+            font=("Helvetica", 18, "bold"),
+            bg='#101010', fg='#666666').pack(pady=(100,10))
+    tk.Label(empty,
+            text="Activate movies to view seat status",
+            font=("Helvetica", 12),
+            bg='#101010', fg='#444444').pack()
+
+    def show_cards(visible):
+        if visible and not canvas.winfo_manager():
+            empty.pack_forget()
+            canvas.pack(side="left", fill="both", expand=True, pady=10)
+            scrollbar.pack(side="right", fill="y")
+        elif not visible and not empty.winfo_manager():
+            canvas.pack_forget()
+            scrollbar.pack_forget()
+            empty.pack(expand=True)
+
+    status_task = [None]
+
+    def refresh_seat_status(poll=False):
+        """
+        Re-read every active show's seats in the background.
+
+        A poll is skipped while an earlier refresh is still running, so a
+        slow database is not flooded with queued refreshes; other refreshes
+        replace a running one.
+        """
+        task = status_task[0]
+        if poll and task is not None and not (task.done or task.cancelled):
+            return
+        status_task[0] = run_in_background(
+            database.get_movie_seat_status, on_done=show_seat_status,
+            on_error=lambda e: print(f"Error refreshing seat status: {e}"),
+            owner=frame, key=('seat_status', str(frame)))
+
+    def show_seat_status(movies):
+        movie_ids = [movie['movie_id'] for movie in movies]
+        layout_changed = list(cards) != movie_ids
+        
+        # Drop cards of movies that are no longer active
+        for movie_id in [m for m in cards if m not in movie_ids]:
+            cards.pop(movie_id)['card'].destroy()
+        
         for movie in movies:
-            create_movie_card(movie, scrollable)
+            card_state = cards.get(movie['movie_id'])
+            if (card_state is not None
+                    and card_state['seat_map'] is not database.get_show_seat_map(movie['movie_id'])):
+                # Show moved to a screen with another layout: rebuild its grid
+                cards.pop(movie['movie_id'])['card'].destroy()
+                card_state = None
+                layout_changed = True
+            if card_state is None:
+                cards[movie['movie_id']] = create_movie_card(movie, scrollable)
+            else:
+                update_movie_card(card_state, movie)
+        
+        if layout_changed:
+            # Keep cards in query order (show time) after additions/removals
+            ordered = {movie_id: cards[movie_id] for movie_id in movie_ids}
+            cards.clear()
+            cards.update(ordered)
+            for card_state in cards.values():
+                card_state['card'].pack_forget()
+            for card_state in cards.values():
+                card_state['card'].pack(fill='x', padx=15, pady=8)
+        
+        show_cards(bool(movies))
 
-        canvas.pack(side="left", fill="both", expand=True, pady=10)
-        scrollbar.pack(side="right", fill="y")
+    def on_seat_events(events):
+        """Apply change-feed deltas to the open cards without re-querying."""
+        if not frame.winfo_exists():
+            return
+        if any(e['seat_number'] is None or e['movie_id'] not in cards for e in events):
+            # Whole show cleared, (de)activated, or a show without a card yet
+            refresh_seat_status()
+            return
+        for movie_id in {e['movie_id'] for e in events}:
+            card_state = cards[movie_id]
+            snapshot = database.get_seat_snapshot(movie_id)
+            update_movie_card(card_state, dict(card_state['movie'],
+                                               seat_bitmap=snapshot['bitmap'],
+                                               seat_version=snapshot['version']))
+
+    auto_refresh_job = [None]
+    feed_subscription = [None]
+    hold_refresh_job = [None]
+
+    def refresh_holds():
+        hold_refresh_job[0] = None
+        if not (auto_refresh_var.get() and frame.winfo_exists()):
+            return
+        run_in_background(database.get_seat_holds, on_done=show_holds,
+                          on_error=holds_failed, owner=frame,
+                          key=('seat_holds', str(frame)))
+
+    def show_holds(holds):
+        for movie_id, card_state in cards.items():
+            update_card_holds(card_state, holds.get(movie_id, 0))
+        schedule_holds()
+
+    def holds_failed(e):
+        print(f"Error refreshing seat holds: {e}")
+        schedule_holds()
+
+    def schedule_holds():
+        # The next read starts once this one is done, however long it took
+        if hold_refresh_job[0] is None and auto_refresh_var.get() and frame.winfo_exists():
+            hold_refresh_job[0] = frame.after(HOLD_REFRESH_INTERVAL_MS, refresh_holds)
 
     def auto_refresh():
-        if auto_refresh_var.get():
+        auto_refresh_job[0] = None
+        if auto_refresh_var.get() and frame.winfo_exists():
+            refresh_seat_status(poll=True)
+            auto_refresh_job[0] = frame.after(AUTO_REFRESH_INTERVAL_MS, auto_refresh)
+
+    def on_auto_refresh_toggle(*args):
+        if auto_refresh_job[0] is not None:
+            frame.after_cancel(auto_refresh_job[0])
+            auto_refresh_job[0] = None
+        if hold_refresh_job[0] is not None:
+            frame.after_cancel(hold_refresh_job[0])
+            hold_refresh_job[0] = None
+        if feed_subscription[0] is not None:
+            feed_subscription[0]()
+            feed_subscription[0] = None
+        
+        feed = seat_feed.get_seat_feed()
+        if auto_refresh_var.get() and feed:
+            # Live updates: the shared feed pushes deltas, no polling needed
             refresh_seat_status()
-            frame.after(30000, auto_refresh)  # Refresh every 30 seconds
+            feed_subscription[0] = feed.subscribe(on_seat_events)
+        else:
+            auto_refresh()
+        refresh_holds()
 
-    # Start auto-refresh if enabled
-    auto_refresh()
-    
-    # Initial load
-    refresh_seat_status()
+    def on_tab_destroy(event):
+        if event.widget is frame and feed_subscription[0] is not None:
+            feed_subscription[0]()
+            feed_subscription[0] = None
+
+    frame.bind('<Destroy>', on_tab_destroy, add='+')
+
+    auto_refresh_var.trace_add('write', on_auto_refresh_toggle)
+
+    # Start live updates / auto-refresh (both include the initial load)
+    on_auto_refresh_toggle()
+    if not auto_refresh_var.get():
+        refresh_seat_status()
     return frame
 
-def create_tooltip(widget, text):
-    """Create tooltip for widgets."""
+def create_tooltip(widget, text, when=None):
+    """Create tooltip for widgets, optionally only while when() is true."""
     def show_tooltip(event):
+        if when is not None and not when():
+            return
         tooltip = tk.Toplevel()
         tooltip.wm_overrideredirect(True)
         tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
@@ -912,28 +1340,56 @@ def create_tooltip(widget, text):
 def handle_logout(root):
     """Handle admin logout."""
     if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
-        # Get reference to main window
-        main_window = root.master
-        
-        # Clear login state
-        main_window.logged_in_user = None
-        
-        # Destroy admin window
-        root.destroy()
-        
-        # Show and update main window
-        main_window.deiconify()
-        
-        # Update login button text
-        for widget in main_window.winfo_children():
-            if isinstance(widget, tk.Button) and widget.cget('text') in ["Login", "Logout"]:
-                widget.config(text="Login")
-        
-        # Call refresh directly on the main window
-        main_window.after(100, lambda: main_window.refresh_movies_display())
+        end_admin_session(root)
+
+def end_admin_session(root):
+    """End the admin's session, close the admin window and show the main window."""
+    # Get reference to main window
+    main_window = root.master
+    
+    # End the session; the main window also resets its Login button
+    main_window.log_out()
+    
+    # Destroy admin window
+    root.destroy()
+    
+    # Show and update main window
+    main_window.deiconify()
+    
+    # Call refresh directly on the main window
+    main_window.after(100, lambda: main_window.refresh_movies_display())
+
+def admin_session_valid(widget):
+    """
+    Check that the admin's session is still live before an admin action.
 
-def delete_user(tree):
-    """Delete selected user."""
+    The session token is kept on the main window, the master of the admin
+    window that `widget` belongs to. If the session expired or was ended,
+    the admin panel is closed.
+
+    Returns:
+        bool: True if the action may go ahead
+    """
+    admin_window = widget
+    while admin_window.master is not None and not hasattr(admin_window.master, 'session_token'):
+        admin_window = admin_window.master
+    main_window = admin_window.master
+    user = sessions.get_session_user(getattr(main_window, 'session_token', None))
+    if user is not None and user.get('role') == 'admin':
+        return True
+    messagebox.showerror("Session Expired", "Your admin session has expired. Please login again.")
+    if main_window is not None:
+        end_admin_session(admin_window)
+    return False
+
+def delete_user(tree, on_deleted=None):
+    """
+    Delete the selected users (in the background).
+
+    Args:
+        tree (ttk.Treeview): Users tree; the user id is the first value
+        on_deleted (callable): Called once the users are deleted
+    """
     selected = tree.selection()
     if not selected:
         messagebox.showwarning("Warning", "Please select a user to delete")
@@ -941,30 +1397,32 @@ def delete_user(tree):
         
     if not messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this user?"):
         return
-        
-    try:
-        connection = database.get_db_connection()
-        cursor = connection.cursor()
-        
-        for item in selected:
-            user_id = tree.item(item)['values'][0]
-            cursor.execute("DELETE FROM nm_users WHERE user_id = %s", (user_id,))
-            
-        connection.commit()
+    
+    if not admin_session_valid(tree):
+        return
+    
+    user_ids = [tree.item(item)['values'][0] for item in selected]
+    
+    def finish_delete(result):
         messagebox.showinfo("Success", "User(s) deleted successfully")
-        return True
-        
-    except Exception as e:
+        if on_deleted:
+            on_deleted()
+    
+    def delete_failed(e):
         print(f"Error deleting user: {e}")
         messagebox.showerror("Error", f"Failed to delete user: {str(e)}")
-        return False
-        
-    finally:
-        cursor.close()
-        connection.close()
+    
+    run_in_background(sessions.delete_users, user_ids,
+                      on_done=finish_delete, on_error=delete_failed, owner=tree)
+
+def delete_movie(tree, on_deleted=None):
+    """
+    Delete the selected movies (in the background).
 
-def delete_movie(tree):
-    """Delete selected movie."""
+    Args:
+        tree (ttk.Treeview): Movies tree; the movie id is the first value
+        on_deleted (callable): Called once the movies are deleted
+    """
     selected = tree.selection()
     if not selected:
         messagebox.showwarning("Warning", "Please select a movie to delete")
@@ -972,27 +1430,23 @@ def delete_movie(tree):
         
     if not messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this movie?"):
         return
-        
-    try:
-        connection = database.get_db_connection()
-        cursor = connection.cursor()
-        
-        for item in selected:
-            movie_id = tree.item(item)['values'][0]
-            cursor.execute("DELETE FROM nm_movies WHERE movie_id = %s", (movie_id,))
-            
-        connection.commit()
+    
+    if not admin_session_valid(tree):
+        return
+    
+    movie_ids = [tree.item(item)['values'][0] for item in selected]
+    
+    def finish_delete(result):
         messagebox.showinfo("Success", "Movie(s) deleted successfully")
-        return True
-        
-    except Exception as e:
+        if on_deleted:
+            on_deleted()
+    
+    def delete_failed(e):
         print(f"Error deleting movie: {e}")
         messagebox.showerror("Error", f"Failed to delete movie: {str(e)}")
-        return False
-        
-    finally:
-        cursor.close()
-        connection.close()
+    
+    run_in_background(database.delete_movies, movie_ids,
+                      on_done=finish_delete, on_error=delete_failed, owner=tree)
 
 def show_seat_selection_window():
     """
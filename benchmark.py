@@ -0,0 +1,406 @@
+"""
+Benchmark runner for the booking, availability, login and ticket hot paths.
+
+Seeds a local database with a configurable number of users, movies and
+bookings, times each hot path and reports p50/p95/p99 latency and
+throughput as JSON, so results from two commits can be compared.
+
+Usage:
+    python benchmark.py --users 500 --movies 3 --bookings 100 --iterations 300
+    python benchmark.py --threads 4 --output after.json --compare before.json
+
+By default the data is seeded into a throw-away SQLite file; pass
+--backend mysql to benchmark a MySQL server instead (DB_HOST, DB_USER,
+DB_PASSWORD apply, and DB_NAME defaults to nova_movie_bench so the real
+database is never touched).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_PASSWORD = "bench-password"
+TICKET_CASES = ('generate_ticket_qr', 'create_ticket_image', 'render_ticket', 'save_ticket_png')
+CASES = (
+    'check_login',
+    'check_login_cached',
+    'hash_password',
+    'login_throttled',
+    'get_active_movies_for_date',
+    'get_catalog',
+    'get_occupied_seats',
+    'get_movie_seat_status',
+    'mark_seats_as_occupied',
+) + TICKET_CASES
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark Nova Movies hot paths")
+    parser.add_argument('--backend', choices=('sqlite', 'mysql'), default='sqlite')
+    parser.add_argument('--users', type=int, default=200, help="Seeded customers")
+    parser.add_argument('--movies', type=int, default=3, help="Seeded active shows today")
+    parser.add_argument('--bookings', type=int, default=60,
+                        help="Seeded booked seats per active show (max 49)")
+    parser.add_argument('--iterations', type=int, default=200, help="Timed calls per case")
+    parser.add_argument('--warmup', type=int, default=10, help="Untimed calls per case")
+    parser.add_argument('--threads', type=int, default=1,
+                        help="Concurrent callers per case (simulates several kiosks)")
+    parser.add_argument('--seats-per-booking', type=int, default=2)
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write results JSON to this file")
+    parser.add_argument('--compare', help="Earlier results JSON to diff against")
+    parser.add_argument('--keep-db', action='store_true',
+                        help="Keep the seeded SQLite file for inspection")
+    return parser.parse_args()
+
+
+def seed_database(database, args, rng):
+    """
+    Fill an empty database with benchmark data.
+
+    Active shows get --bookings random seats each; booking benchmarks run
+    against separate inactive shows so they never run out of free seats
+    and do not change what the availability benchmarks read.
+    """
+    if not database.create_database():
+        raise SystemExit("Database setup failed")
+
+    # One scrypt hash for every seeded user keeps seeding fast; verifying
+    # it costs the same as verifying per-user hashes
+    import passwords
+    password = passwords.hash_password(BENCH_PASSWORD)
+    seats = database.bitmap_to_seats((1 << database.TOTAL_SEATS) - 1)
+    seats_needed = (args.iterations + args.warmup) * args.seats_per_booking
+    booking_shows = -(-seats_needed // len(seats))
+
+    connection = database.get_db_connection()
+    cursor = connection.cursor()
+    try:
+        connection.start_transaction()
+        cursor.executemany("""
+            INSERT INTO nm_users (name, username, password, phone_number)
+            VALUES (%s, %s, %s, %s)
+        """, [(f"Bench User {i}", f"bench_user_{i}", password, f"9{i:09d}")
+              for i in range(args.users)])
+        cursor.execute("SELECT user_id, username FROM nm_users WHERE username LIKE 'bench_user_%'")
+        users = cursor.fetchall()
+
+        cursor.execute("SELECT MIN(screen_id) FROM nm_screens")
+        screen_id = cursor.fetchone()[0]
+
+        active_ids = []
+        for i in range(args.movies):
+            cursor.execute("""
+                INSERT INTO nm_movies (title, genre, price, show_date, show_time, status, screen_id)
+                VALUES (%s, 'Drama', 250.00, CURDATE(), %s, 'active', %s)
+            """, (f"Benchmark Movie {i}", f"{10 + i % 12:02d}:00:00", screen_id))
+            active_ids.append(cursor.lastrowid)
+
+        # Shows that receive the benchmark bookings; book_seats only books
+        # active shows, so they are only active (and listed next to the
+        # seeded shows) when the booking case runs
+        booking_status = 'active' if 'mark_seats_as_occupied' in args.cases else 'inactive'
+        booking_ids = []
+        for i in range(booking_shows):
+            cursor.execute("""
+                INSERT INTO nm_movies (title, genre, price, show_date, show_time, status, screen_id)
+                VALUES (%s, 'Drama', 250.00, CURDATE(), '23:00:00', %s, %s)
+            """, (f"Benchmark Booking Show {i}", booking_status, screen_id))
+            booking_ids.append(cursor.lastrowid)
+
+        booked = []
+        for movie_id in active_ids:
+            for seat in rng.sample(seats, min(args.bookings, len(seats))):
+                booked.append((movie_id, rng.choice(users)[0], seat))
+        if booked:
+            cursor.executemany("""
+                INSERT INTO nm_seats (movie_id, user_id, seat_number, booking_date)
+                VALUES (%s, %s, %s, CURDATE())
+            """, booked)
+        connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+
+    free_seats = [(movie_id, seat) for movie_id in booking_ids for seat in seats]
+    return {
+        'usernames': [username for _, username in users],
+        'user_ids': [user_id for user_id, _ in users],
+        'active_movie_ids': active_ids,
+        'free_seats': free_seats,
+    }
+
+
+def make_cases(database, data, args, rng, ticket_dir):
+    """Build {case name: zero-argument callable} for the selected cases."""
+    lock = threading.Lock()
+    free_seats = iter(data['free_seats'])
+
+    def next_booking():
+        with lock:
+            return [next(free_seats) for _ in range(args.seats_per_booking)]
+
+    def cached_login():
+        user = database.check_login(rng.choice(data['usernames']), BENCH_PASSWORD)
+        assert user, "check_login rejected a seeded user"
+
+    def login():
+        # Every login pays for a full scrypt verification, as a first login does
+        passwords.clear_cache()
+        cached_login()
+
+    def stuffed_login():
+        # Guesses at one account; once its bucket is empty they never reach the database
+        try:
+            sessions.login(data['usernames'][0], "wrong-password", kiosk="bench")
+        except sessions.LoginThrottledError:
+            pass
+
+    def occupied():
+        database.get_occupied_seats(rng.choice(data['active_movie_ids']))
+
+    def book():
+        picked = next_booking()
+        movie_id = picked[0][0]
+        success = database.mark_seats_as_occupied(
+            movie_id,
+            [seat for seat_movie, seat in picked if seat_movie == movie_id],
+            rng.choice(data['user_ids'])
+        )
+        assert success, "mark_seats_as_occupied failed on a free seat"
+
+    import passwords
+    import sessions
+    cases = {
+        'check_login': login,
+        'check_login_cached': cached_login,
+        'hash_password': lambda: passwords.hash_password(BENCH_PASSWORD),
+        'login_throttled': stuffed_login,
+        'get_active_movies_for_date': lambda: database.get_active_movies_for_date(None),
+        'get_catalog': lambda: database.get_catalog()['by_id'],
+        'get_occupied_seats': occupied,
+        'get_movie_seat_status': database.get_movie_seat_status,
+        'mark_seats_as_occupied': book,
+    }
+
+    if any(case in args.cases for case in TICKET_CASES):
+        cases.update(make_ticket_cases(rng, ticket_dir))
+    return {name: fn for name, fn in cases.items() if name in args.cases}
+
+
+def make_ticket_cases(rng, ticket_dir):
+    """Ticket rendering cases (skipped if Pillow or qrcode are missing)."""
+    try:
+        from PIL import Image
+        import ticket_renderer
+    except ImportError as e:
+        print(f"[WARN] Skipping ticket benchmarks: {e}")
+        return {}
+
+    # Same size as the cached 'ticket' poster variant
+    poster = Image.new('RGB', (200, 300), '#203040')
+
+    booking_data = {
+        'booking_id': "01JGZ3Q4R5S6T7V8W9XYZABCDE",
+        'movie_id': 1,
+        'show_date': datetime.date.today(),
+        'movie_title': "Benchmark Movie 0",
+        'show_time': "10:00:00",
+        'seat_numbers': ["C4", "C5"],
+        'user_name': "Bench User 0",
+        'phone_number': "9000000000",
+        'price': 500.0,
+    }
+    qr_image = ticket_renderer.generate_ticket_qr(booking_data)
+    ticket_image = ticket_renderer.create_ticket_image(booking_data, qr_image, poster)
+    ticket_renderer.get_ticket_template().reset_stats()
+    counter = iter(range(10 ** 9))
+
+    def save_png():
+        path = os.path.join(ticket_dir, f"ticket_{next(counter)}.png")
+        ticket_image.save(path)
+
+    return {
+        'generate_ticket_qr': lambda: ticket_renderer.generate_ticket_qr(booking_data),
+        'create_ticket_image': lambda: ticket_renderer.create_ticket_image(
+            booking_data, qr_image, poster),
+        'render_ticket': lambda: ticket_renderer.render_ticket(booking_data, poster),
+        'save_ticket_png': save_png,
+    }
+
+
+def run_case(fn, iterations, warmup, threads):
+    """
+    Time `iterations` calls of fn spread over `threads` threads.
+
+    Returns:
+        dict: Latency percentiles (ms) and throughput (calls/s)
+    """
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counts = [iterations // threads + (1 if i < iterations % threads else 0)
+              for i in range(threads)]
+
+    def worker(count):
+        local = []
+        for _ in range(count):
+            started = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(count,)) for count in counts]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if errors:
+        print(f"  [WARN] {len(errors)} call(s) failed, first: {errors[0]}")
+    return summarize(latencies, elapsed, len(errors))
+
+
+def summarize(latencies, elapsed, errors=0):
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'iterations': 0, 'errors': errors}
+
+    def percentile(p):
+        # Nearest-rank percentile
+        index = max(0, -(-len(latencies) * p // 100) - 1)
+        return round(latencies[int(index)] * 1000, 4)
+
+    return {
+        'iterations': len(latencies),
+        'errors': errors,
+        'p50_ms': percentile(50),
+        'p95_ms': percentile(95),
+        'p99_ms': percentile(99),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 4),
+        'min_ms': round(latencies[0] * 1000, 4),
+        'max_ms': round(latencies[-1] * 1000, 4),
+        'throughput_per_s': round(len(latencies) / elapsed, 2) if elapsed else None,
+    }
+
+
+def compare(results, baseline_path):
+    """Print the p50/p95/p99 change of every case versus an earlier run."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    print(f"\nChange versus {baseline_path} (negative is faster):")
+    for case, current in results.items():
+        before = baseline.get(case)
+        if not before or 'p50_ms' not in before or 'p50_ms' not in current:
+            continue
+        changes = []
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if before[key]:
+                changes.append(f"{key[:3]} {(current[key] - before[key]) / before[key]:+.1%}")
+        print(f"  {case:<28} {'  '.join(changes)}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    work_dir = tempfile.mkdtemp(prefix="nova_bench_")
+
+    # Configure the backend before database.py opens its first connection
+    os.environ['DB_BACKEND'] = args.backend
+    if args.backend == 'sqlite':
+        os.environ['DB_SQLITE_PATH'] = os.path.join(work_dir, "bench.db")
+    else:
+        os.environ.setdefault('DB_NAME', "nova_movie_bench")
+    import database
+    import passwords
+
+    try:
+        print(f"Seeding {args.backend} database "
+              f"({args.users} users, {args.movies} shows, {args.bookings} seats booked per show)...")
+        data = seed_database(database, args, rng)
+        cases = make_cases(database, data, args, rng, work_dir)
+
+        results = {}
+        for name in args.cases:
+            if name not in cases:
+                continue
+            print(f"Running {name}...")
+            results[name] = run_case(cases[name], args.iterations, args.warmup, args.threads)
+
+        report = {
+            'meta': {
+                'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'backend': args.backend,
+                'users': args.users,
+                'movies': args.movies,
+                'bookings_per_movie': args.bookings,
+                'iterations': args.iterations,
+                'warmup': args.warmup,
+                'threads': args.threads,
+                'seed': args.seed,
+                'pool': database.get_pool_stats(),
+                'password_cost': {
+                    'scrypt_log_n': passwords.SCRYPT_LOG_N,
+                    'scrypt_r': passwords.SCRYPT_R,
+                    'scrypt_p': passwords.SCRYPT_P,
+                    'workers': passwords.PASSWORD_WORKERS,
+                },
+            },
+            'results': results,
+        }
+        if 'ticket_renderer' in sys.modules:
+            # Where ticket render time goes, across all ticket cases
+            report['ticket_stages'] = sys.modules['ticket_renderer'].get_ticket_template().stats()
+        output = json.dumps(report, indent=2, default=str)
+        print(output)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+        if args.compare:
+            compare(results, args.compare)
+    finally:
+        database.close_connection_pool()
+        passwords.shutdown()
+        if args.keep_db and args.backend == 'sqlite':
+            print(f"Seeded database kept at {os.environ['DB_SQLITE_PATH']}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
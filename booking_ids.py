@@ -0,0 +1,54 @@
+import os
+import threading
+import time
+
+# Crockford base32 (no I, L, O, U), as used by ULIDs
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_LENGTH = 26
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+
+def new_booking_id():
+    """
+    Generate a collision-free, time-ordered booking id (a ULID).
+
+    48 bits of millisecond timestamp followed by 80 random bits, written
+    as 26 Crockford base32 characters. Ids sort by creation time, so they
+    index well as a primary key, and two kiosks booking in the same
+    millisecond still get different ids. Within one process, ids created
+    in the same millisecond are strictly increasing.
+
+    Returns:
+        str: e.g. '01JAB3C4D5E6F7G8H9JKMNPQRS'
+    """
+    global _last_ms, _last_random
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms <= _last_ms:
+            # Same millisecond (or clock went back): keep ids monotonic
+            now_ms = _last_ms
+            random_part = _last_random + 1
+            if random_part >= 1 << 80:
+                now_ms += 1
+                random_part = int.from_bytes(os.urandom(10), 'big')
+        else:
+            random_part = int.from_bytes(os.urandom(10), 'big')
+        _last_ms, _last_random = now_ms, random_part
+
+    value = (now_ms << 80) | random_part
+    chars = []
+    for _ in range(ULID_LENGTH):
+        value, index = divmod(value, 32)
+        chars.append(ULID_ALPHABET[index])
+    return "".join(reversed(chars))
+
+
+def booking_id_time(booking_id):
+    """Return the creation time (seconds since epoch) encoded in a booking id."""
+    value = 0
+    for char in booking_id.upper():
+        value = value * 32 + ULID_ALPHABET.index(char)
+    return (value >> 80) / 1000
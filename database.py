@@ -1,94 +1,123 @@
-import mysql.connector as mysql
-from datetime import datetime
-import hashlib
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+import os
+import threading
+import time
+from booking_ids import new_booking_id
+from db_backend import ADDED_COLUMNS, ADDED_INDEXES, TABLES, DatabaseError, create_backend
+from db_pool import ConnectionPool, PoolExhaustedError
+import passwords
+from seat_map import load_seat_map
+
+# Connection pool settings (override through environment variables)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POOL_MIN_IDLE = int(os.getenv("DB_POOL_MIN_IDLE", "1"))
+POOL_CHECKOUT_TIMEOUT = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "10"))
+POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300"))
+POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30"))
+
+_backend = None
+_connection_pool = None
+_connection_pool_lock = threading.Lock()
+
+# Screen created on setup; shows without a screen are moved onto it
+DEFAULT_SCREEN_NAME = "Screen 1"
+DEFAULT_SCREEN_LAYOUT = "standard"
+
+# Seat layout of the default screen (rows A-G with seats 1-7). Every screen
+# names its own layout; see seat_map.py and get_show_seat_map()
+STANDARD_SEAT_MAP = load_seat_map(DEFAULT_SCREEN_LAYOUT)
+TOTAL_SEATS = STANDARD_SEAT_MAP.total_seats
+
+# Layout name per show (movie_id), learned from show queries
+_show_layouts = {}
+
+# Minutes a show occupies its screen (film, ads and cleaning): two active
+# shows on one screen must start at least this far apart
+SHOW_SLOT_MINUTES = int(os.getenv("SHOW_SLOT_MINUTES", "180"))
+
+# Today's active shows (see get_catalog). Edits made through this process
+# drop the cache at once; CATALOG_TTL bounds how long edits made by other
+# kiosks or the admin panel of another machine take to show up
+CATALOG_TTL = float(os.getenv("CATALOG_TTL", "60"))
+_catalog = None
+_catalog_lock = threading.Lock()
+
+# Seat holds: seconds a seat stays reserved for the customer choosing it,
+# and how often expired holds are swept from nm_seat_holds
+SEAT_HOLD_TTL = int(os.getenv("SEAT_HOLD_TTL", "120"))
+HOLD_SWEEP_INTERVAL = 30
+_last_hold_sweep = 0.0
+
+# Days booked seats and bookings of past shows are kept (0 = forever); see
+# clear_old_seat_data
+BOOKING_RETENTION_DAYS = int(os.getenv("BOOKING_RETENTION_DAYS", "365"))
+
+# Seat change feed (nm_seat_events). Event ids are handed out at INSERT
+# time, so a booking that commits late can surface below ids already read;
+# missing ids are re-checked for SEAT_EVENT_GAP_GRACE seconds. Idle feeds
+# poll every SEAT_FEED_MIN_INTERVAL seconds, backing off to
+# SEAT_FEED_MAX_INTERVAL; changes made by this process wake them at once
+SEAT_EVENT_GAP_GRACE = float(os.getenv("SEAT_EVENT_GAP_GRACE", "120"))
+SEAT_EVENT_MAX_GAPS = 10000
+SEAT_FEED_MIN_INTERVAL = float(os.getenv("SEAT_FEED_MIN_INTERVAL", "1"))
+SEAT_FEED_MAX_INTERVAL = float(os.getenv("SEAT_FEED_MAX_INTERVAL", "5"))
+_seat_event_signal = threading.Condition()
+_seat_event_serial = 0
+
+# Rows per page of the admin user and movie lists (search_users, search_movies)
+USER_PAGE_SIZE = int(os.getenv("USER_PAGE_SIZE", "200"))
+MOVIE_PAGE_SIZE = int(os.getenv("MOVIE_PAGE_SIZE", "200"))
+
+# Occupancy bitmap per (movie_id, booking_date): bit n set = seat n booked
+_seat_bitmaps = {}
+_seat_bitmap_lock = threading.Lock()
+_seat_bitmap_version = 0
+
+class ShowUnavailableError(Exception):
+    """The show is not running today (deactivated, deleted or rescheduled)."""
+
+def get_backend():
+    """
+    Return the configured storage backend (see db_backend.create_backend).
+
+    Set DB_BACKEND=sqlite to run on an embedded SQLite file instead of a
+    MySQL server; all functions in this module work with either.
+    """
+    global _backend
+    with _connection_pool_lock:
+        if _backend is None:
+            _backend = create_backend()
+        return _backend
 
 def create_database_connection():
-    """Create a connection to MySQL server without selecting a database."""
-    try:
-        connection = mysql.connect(
-            host="localhost",
-            user="root",
-            password="bhagyesh123",
-            autocommit=True,
-            connect_timeout=5,
-            use_pure=True
-        )
-        return connection
-    except mysql.Error as err:
-        error_message = ""
-        if err.errno == mysql.errorcode.CR_CONN_HOST_ERROR:
-            error_message = (
-                "\n[ERROR] Could not connect to MySQL server:"
-                "\n1. Check if MySQL service is running"
-                "\n2. Verify MySQL is installed correctly"
-                "\n3. Check if port 3306 is not blocked"
-                f"\nError details: {err}"
-            )
-        elif err.errno == mysql.errorcode.ER_ACCESS_DENIED_ERROR:
-            error_message = (
-                "\n[ERROR] Access denied:"
-                "\n1. Username 'root' might be incorrect"
-                "\n2. Password might be wrong"
-                "\n3. User might not have required permissions"
-                f"\nError details: {err}"
-            )
-        elif err.errno == 2003:
-            error_message = (
-                "\n[ERROR] MySQL server connection failed:"
-                "\n1. MySQL service might not be running"
-                "\n2. Server might be down"
-                "\n3. Network issues might be present"
-                f"\nError details: {err}"
-            )
-        else:
-            error_message = f"\n[ERROR] Unexpected MySQL error: {err}"
-        
-        print(error_message)
+    """Create a connection to the database server without selecting a database."""
+    backend = get_backend()
+    try:
+        return backend.connect_server()
+    except backend.Error as err:
+        print(backend.describe_connect_error(err))
         return None
     except Exception as e:
         print(f"\n[ERROR] Unexpected error while connecting to database: {e}")
         return None
 
-def get_db_connection():
-    """Create a connection to the nova_movie database."""
-    try:
-        connection = mysql.connect(
-            host="localhost",
-            user="root",
-            password="bhagyesh123",
-            database="nova_movie",
-            autocommit=True,
-            connect_timeout=5,
-            use_pure=True
-        )
-        return connection
-    except mysql.Error as err:
-        error_message = ""
-        if err.errno == mysql.errorcode.ER_BAD_DB_ERROR:
+def _open_db_connection():
+    """Open a new physical connection to the nova_movie database."""
+    backend = get_backend()
+    try:
+        return backend.connect()
+    except backend.Error as err:
+        if backend.is_missing_database(err):
             print("\n[ERROR] Database 'nova_movie' not found. Attempting to create...")
             try:
                 if create_database():
-                    return get_db_connection()
-                else:
-                    error_message = "[ERROR] Failed to create database"
+                    return _open_db_connection()
+                error_message = "[ERROR] Failed to create database"
             except Exception as create_err:
                 error_message = f"[ERROR] Database creation failed: {create_err}"
-        elif err.errno == mysql.errorcode.CR_CONN_HOST_ERROR:
-            error_message = (
-                "\n[ERROR] Could not connect to MySQL server:"
-                "\n1. Check if MySQL service is running"
-                "\n2. Verify MySQL is installed correctly"
-                "\n3. Check if port 3306 is not blocked"
-            )
-        elif err.errno == mysql.errorcode.ER_ACCESS_DENIED_ERROR:
-            error_message = (
-                "\n[ERROR] Access denied:"
-                "\n1. Username 'root' might be incorrect"
-                "\n2. Password might be wrong"
-                "\n3. User might not have required permissions"
-            )
         else:
-            error_message = f"\n[ERROR] Unexpected MySQL error: {err}"
+            error_message = backend.describe_connect_error(err)
         
         print(error_message)
         return None
@@ -96,58 +125,139 @@ def get_db_connection():
         print(f"\n[ERROR] Unexpected error while connecting to database: {e}")
         return None
 
+def get_connection_pool():
+    """Return the shared connection pool, creating it on first use."""
+    global _connection_pool
+    with _connection_pool_lock:
+        if _connection_pool is None:
+            _connection_pool = ConnectionPool(
+                _open_db_connection,
+                size=POOL_SIZE,
+                min_idle=POOL_MIN_IDLE,
+                checkout_timeout=POOL_CHECKOUT_TIMEOUT,
+                idle_timeout=POOL_IDLE_TIMEOUT,
+                health_check_interval=POOL_HEALTH_CHECK_INTERVAL
+            )
+        return _connection_pool
+
+def get_db_connection():
+    """
+    Check out a pooled connection to the nova_movie database.
+
+    The returned connection behaves like a normal mysql-connector connection
+    (on either backend); calling close() on it returns it to the pool
+    instead of dropping the link.
+    """
+    try:
+        return get_connection_pool().acquire()
+    except PoolExhaustedError as err:
+        print(f"\n[ERROR] Database busy: {err}")
+        return None
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error while connecting to database: {e}")
+        return None
+
+@contextmanager
+def pooled_connection():
+    """Check out a pooled connection for the duration of a with-block."""
+    connection = get_db_connection()
+    if not connection:
+        raise Exception("Failed to establish database connection")
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+def get_pool_stats():
+    """Get connection pool metrics (checkouts, waits, handshake time, ...)."""
+    return get_connection_pool().stats()
+
+def close_connection_pool():
+    """Close all pooled connections, e.g. on application shutdown."""
+    global _connection_pool
+    with _connection_pool_lock:
+        if _connection_pool is not None:
+            _connection_pool.close()
+            _connection_pool = None
+
 def check_login(username, password):
-    """Check user login credentials."""
-    connection = None
-    cursor = None
+    """
+    Check user login credentials.
+
+    The row is looked up by username and the password verified against
+    its hash (see passwords.py). Legacy SHA-256 hashes, or hashes made
+    with older cost settings, are replaced on a successful login.
+
+    No pooled connection is held while scrypt runs: verification can wait
+    for the password workers, and holding a connection meanwhile would let
+    a burst of logins starve bookings and the seat feed of connections.
+
+    Returns:
+        dict: user_id, name and role, or None if the login failed
+
+    Raises:
+        passwords.PasswordBusyError: If the password workers are overloaded;
+            the credentials were not checked and the user should try again
+    """
     try:
-        connection = get_db_connection()
-        if not connection:
-            raise Exception("Failed to establish database connection")
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        
-        cursor.execute("""
-        SELECT user_id, name, role 
-        FROM nm_users 
-        WHERE username = %s AND password = %s
-        """, (username, hashed_password))
-        
-        user = cursor.fetchone()
-        if not user:
-            print(f"[INFO] Login failed for username: {username}")
-        return user
-    
-    except mysql.Error as err:
-        error_message = f"[ERROR] MySQL error during login: {err}"
-        if err.errno == mysql.errorcode.ER_NO_SUCH_TABLE:
+        with pooled_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute("""
+                SELECT user_id, name, role, password 
+                FROM nm_users 
+                WHERE username = %s
+                """, (username,))
+                user = cursor.fetchone()
+            finally:
+                cursor.close()
+    
+    except DatabaseError as err:
+        error_message = f"[ERROR] Database error during login: {err}"
+        if get_backend().is_missing_table(err):
             error_message = "[ERROR] Users table does not exist. Database might need initialization."
         print(error_message)
         return None
     except Exception as e:
         print(f"[ERROR] Unexpected error during login: {e}")
         return None
-    finally:
-        if cursor:
+    
+    stored = user.pop('password') if user else None
+    if not user or not passwords.check_password(password, stored):
+        print(f"[INFO] Login failed for username: {username}")
+        return None
+    
+    if passwords.needs_rehash(stored):
+        _upgrade_password_hash(user['user_id'], username, password, stored)
+    return user
+
+def _upgrade_password_hash(user_id, username, password, stored):
+    """Replace a verified password's outdated hash; failures only get logged."""
+    try:
+        new_hash = passwords.make_password_hash(password)
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
             try:
+                # Only if nobody changed the password meanwhile
+                cursor.execute("""
+                UPDATE nm_users SET password = %s
+                WHERE user_id = %s AND password = %s
+                """, (new_hash, user_id, stored))
+                connection.commit()
+            finally:
                 cursor.close()
-            except Exception as e:
-                print(f"[ERROR] Failed to close cursor: {e}")
-        if connection:
-            try:
-                connection.close()
-            except Exception as e:
-                print(f"[ERROR] Failed to close connection: {e}")
+        print(f"[+] Password hash upgraded for username: {username}")
+    except Exception as e:
+        # The login stands; the hash is upgraded on a later login
+        print(f"[ERROR] Could not upgrade password hash for {username}: {e}")
 
 def register_user(name, username, password, phone_number):
     """Register a new user."""
+    hashed_password = passwords.make_password_hash(password)
+    
     connection = get_db_connection()
     cursor = connection.cursor()
     
-    hashed_password = hashlib.sha256(password.encode()).hexdigest()
-    
     try:
         cursor.execute("""
         INSERT INTO nm_users (name, username, password, phone_number)
@@ -157,7 +267,7 @@ def register_user(name, username, password, phone_number):
         connection.commit()
         return True
     
-    except mysql.Error as err:
+    except DatabaseError as err:
         print(f"Error: {err}")
         connection.rollback()
         return False
@@ -166,6 +276,120 @@ def register_user(name, username, password, phone_number):
         cursor.close()
         connection.close()
 
+def search_users(username_prefix=None, role=None, created_from=None, created_to=None,
+                 after=None, limit=None):
+    """
+    Get one page of users matching the admin panel filters.
+
+    Pages are keyset-paginated: pass the last row of a page as `after` to
+    get the next one, so every page costs one index range scan however
+    deep the admin has scrolled. With a username prefix the page walks the
+    unique username index in username order; otherwise it walks
+    idx_user_role_created / idx_user_created, newest accounts first.
+
+    Args:
+        username_prefix (str): Only usernames starting with this
+        role (str): 'admin' or 'customer'
+        created_from (date): Only accounts created on or after this day
+        created_to (date): Only accounts created on or before this day
+        after (dict): Last row of the previous page (None for the first page)
+        limit (int): Rows per page (default USER_PAGE_SIZE)
+
+    Returns:
+        list: User dicts without the password hash; fewer than `limit`
+            rows means this was the last page
+    """
+    conditions = []
+    params = []
+    if username_prefix:
+        # A range instead of LIKE, so it is an index range scan on both
+        # backends and needs no escaping of '%' or '_'
+        upper = username_prefix[:-1] + chr(ord(username_prefix[-1]) + 1)
+        conditions.append("username >= %s AND username < %s")
+        params += [username_prefix, upper]
+    if role:
+        conditions.append("role = %s")
+        params.append(role)
+    if created_from:
+        conditions.append("created_at >= %s")
+        params.append(datetime.combine(created_from, datetime.min.time()))
+    if created_to:
+        conditions.append("created_at < %s")
+        params.append(datetime.combine(created_to + timedelta(days=1), datetime.min.time()))
+
+    if username_prefix:
+        if after:
+            conditions.append("username > %s")
+            params.append(after['username'])
+        order = "username"
+    else:
+        if after:
+            conditions.append("(created_at < %s OR (created_at = %s AND user_id < %s))")
+            params += [after['created_at'], after['created_at'], after['user_id']]
+        order = "created_at DESC, user_id DESC"
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit or USER_PAGE_SIZE)
+
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"""
+            SELECT user_id, name, username, phone_number, role, created_at
+            FROM nm_users
+            {where}
+            ORDER BY {order}
+            LIMIT %s
+        """, params)
+        return cursor.fetchall()
+
+    finally:
+        cursor.close()
+        connection.close()
+
+def delete_users(user_ids):
+    """
+    Delete users together with their bookings, seats and holds.
+
+    Seats they hold for today are freed through ON DELETE CASCADE, so
+    a 'cleared' event is logged for each of them in the same transaction.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    freed = []
+    
+    try:
+        connection.start_transaction()
+        for user_id in user_ids:
+            cursor.execute("""
+                SELECT movie_id, seat_number, booking_id 
+                FROM nm_seats 
+                WHERE user_id = %s 
+                AND booking_date = CURDATE()
+            """, (user_id,))
+            seats = cursor.fetchall()
+            for movie_id, seat_number, booking_id in seats:
+                _log_seat_events(cursor, movie_id, [seat_number], 'cleared', booking_id)
+            cursor.execute("DELETE FROM nm_users WHERE user_id = %s", (user_id,))
+            freed.extend(seats)
+        connection.commit()
+        
+    except Exception:
+        connection.rollback()
+        raise
+        
+    finally:
+        cursor.close()
+        connection.close()
+    
+    if freed:
+        _notify_seat_events()
+    for movie_id, seat_number, _ in freed:
+        _update_seat_bitmap(movie_id, cleared=[seat_number])
+
 def create_database():
     """Create the database and required tables."""
     connection = None
@@ -178,81 +402,37 @@ def create_database():
             print("Failed to connect to MySQL server")
             return False
             
+        backend = get_backend()
         cursor = connection.cursor()
         
-        cursor.execute("SHOW DATABASES LIKE 'nova_movie'")
-        exists = cursor.fetchone()
-        
-        if not exists:
-            cursor.execute("CREATE DATABASE nova_movie")
-            print("[+] Database 'nova_movie' created successfully!")
+        if backend.create_database(cursor):
+            print(f"[+] Database 'nova_movie' created successfully! ({backend.name})")
         else:
-            print("[+] Database 'nova_movie' already exists")
-
-        cursor.execute("USE nova_movie")
+            print(f"[+] Database 'nova_movie' already exists ({backend.name})")
         
-        cursor.execute("SHOW TABLES LIKE 'nm_users'")
-        if not cursor.fetchone():
-            cursor.execute("""
-            CREATE TABLE nm_users (
-                user_id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(100) NOT NULL,
-                username VARCHAR(50) UNIQUE NOT NULL,
-                password VARCHAR(255) NOT NULL,
-                phone_number VARCHAR(15),
-                role ENUM('admin', 'customer') DEFAULT 'customer',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-            print("[+] Table 'nm_users' created successfully!")
-        else:
-            print("[+] Table 'nm_users' already exists")
+        for table in TABLES:
+            if not backend.table_exists(cursor, table):
+                backend.create_table(cursor, table)
+                print(f"[+] Table '{table}' created successfully!")
+            else:
+                print(f"[+] Table '{table}' already exists")
 
-        cursor.execute("SHOW TABLES LIKE 'nm_movies'")
-        if not cursor.fetchone():
-            cursor.execute("""
-            CREATE TABLE nm_movies (
-                movie_id INT AUTO_INCREMENT PRIMARY KEY,
-                title VARCHAR(100) NOT NULL,
-                genre VARCHAR(50),
-                price DECIMAL(10,2) NOT NULL,
-                show_date DATE,
-                show_time TIME,
-                status ENUM('active', 'inactive') DEFAULT 'inactive',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-            print("[+] Table 'nm_movies' created successfully!")
-        else:
-            print("[+] Table 'nm_movies' already exists")
+        for table, column in ADDED_COLUMNS:
+            if not backend.column_exists(cursor, table, column):
+                backend.add_column(cursor, table, column)
+                print(f"[+] Column '{table}.{column}' added")
 
-        cursor.execute("SHOW TABLES LIKE 'nm_seats'")
-        if not cursor.fetchone():
-            cursor.execute("""
-            CREATE TABLE nm_seats (
-                seat_id INT AUTO_INCREMENT PRIMARY KEY,
-                movie_id INT,
-                user_id INT,
-                seat_number VARCHAR(3) NOT NULL,
-                booking_date DATE NOT NULL,
-                CONSTRAINT fk_movie 
-                    FOREIGN KEY (movie_id) 
-                    REFERENCES nm_movies(movie_id)
-                    ON DELETE CASCADE,
-                CONSTRAINT fk_user
-                    FOREIGN KEY (user_id) 
-                    REFERENCES nm_users(user_id)
-                    ON DELETE CASCADE,
-                UNIQUE KEY unique_seat (movie_id, seat_number, booking_date)
-            ) ENGINE=InnoDB
-            """)
-            print("[+] Table 'nm_seats' created successfully!")
-        else:
-            print("[+] Table 'nm_seats' already exists")
+        for table, index in ADDED_INDEXES:
+            if not backend.index_exists(cursor, table, index):
+                backend.add_index(cursor, table, index)
+                print(f"[+] Index '{table}.{index}' added")
+
+        if _ensure_default_screen(cursor):
+            print(f"[+] Screen '{DEFAULT_SCREEN_NAME}' created")
 
         cursor.execute("SELECT * FROM nm_users WHERE username = 'kingsman' AND role = 'admin'")
         if not cursor.fetchone():
-            admin_password = hashlib.sha256("iamyash".encode()).hexdigest()
+            admin_password = passwords.hash_password("iamyash")
             cursor.execute("""
             INSERT INTO nm_users (name, username, password, phone_number, role)
             VALUES ('Admin', 'kingsman', %s, '1234567890', 'admin')
@@ -271,12 +451,8 @@ def create_database():
         print("[+] System ready to use")
         return True
         
-    except mysql.Error as err:
-        print(f"\n❌ MySQL Error: {err}")
-        if err.errno == mysql.errorcode.CR_CONN_HOST_ERROR:
-            print("Could not connect to MySQL server. Please check if MySQL is running.")
-        elif err.errno == mysql.errorcode.ER_ACCESS_DENIED_ERROR:
-            print("Access denied. Please check your username and password.")
+    except DatabaseError as err:
+        print(f"\n❌ Database Error: {err}")
         if connection:
             connection.rollback()
         return False
@@ -291,250 +467,1410 @@ def create_database():
         if connection:
             connection.close()
 
-def get_active_movies_for_date(show_date):
-    """Get active movies for a specific date."""
+def _ensure_default_screen(cursor):
+    """Create the default screen if there is none and give it screenless shows."""
+    cursor.execute("SELECT COUNT(*) FROM nm_screens")
+    created = cursor.fetchone()[0] == 0
+    if created:
+        cursor.execute("""
+            INSERT INTO nm_screens (name, layout) 
+            VALUES (%s, %s)
+        """, (DEFAULT_SCREEN_NAME, DEFAULT_SCREEN_LAYOUT))
+    cursor.execute("""
+        UPDATE nm_movies 
+        SET screen_id = (SELECT MIN(screen_id) FROM nm_screens)
+        WHERE screen_id IS NULL
+    """)
+    return created
+
+def get_screens():
+    """Get all screens, in creation order."""
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
+    try:
+        cursor.execute("""
+            SELECT screen_id, name, layout 
+            FROM nm_screens 
+            ORDER BY screen_id
+        """)
+        return cursor.fetchall()
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def add_screen(name, layout=DEFAULT_SCREEN_LAYOUT):
+    """
+    Add a screen.
+
+    Args:
+        name (str): Screen name shown to customers
+        layout (str): Seat map name (a file in seat_map.SEAT_MAP_DIR)
+
+    Returns:
+        int: New screen_id, or None if the name is taken or the layout
+        does not exist
+    """
+    try:
+        load_seat_map(layout)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return None
+
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("""
+            INSERT INTO nm_screens (name, layout) 
+            VALUES (%s, %s)
+        """, (name, layout))
+        connection.commit()
+        return cursor.lastrowid
+        
+    except DatabaseError as err:
+        connection.rollback()
+        if get_backend().is_duplicate_key(err):
+            print(f"[ERROR] Screen '{name}' already exists")
+            return None
+        raise
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def get_active_movies_for_date(show_date):
+    """
+    Get the active shows on a date (default: today), all screens.
+
+    One idx_movie_schedule range scan, ordered by show time. Each row also
+    carries screen_name and screen_layout. Returns [] on database errors.
+    """
+    try:
+        return _load_active_shows(show_date)
+    except Exception as e:
+        print(f"Database error in get_active_movies_for_date: {e}")
+        return []
+
+def _load_active_shows(show_date):
+    """Query for get_active_movies_for_date; database errors propagate."""
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
+    try:
+        query = """
+            SELECT m.*, s.name AS screen_name, s.layout AS screen_layout 
+            FROM nm_movies m
+            LEFT JOIN nm_screens s ON s.screen_id = m.screen_id
+            WHERE m.status = 'active' 
+            AND m.show_date = %s
+            ORDER BY m.show_time, s.name
+        """
+        cursor.execute(query, (show_date or _today(),))
+        movies = cursor.fetchall()
+        _remember_show_layouts(movies)
+        return movies
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def get_catalog(refresh=False):
+    """
+    Get today's active shows, cached and indexed for the booking flow.
+
+    One get_active_movies_for_date query fills the cache; it is reloaded
+    after invalidate_catalog(), when the date changes, or after
+    CATALOG_TTL seconds. Database errors are raised rather than cached
+    as an empty catalog. The rows are shared between callers and must
+    not be modified.
+
+    Args:
+        refresh (bool): Reload from the database even if cached
+
+    Returns:
+        dict: date, shows (ordered by show time), by_id
+        {movie_id: show} and by_title {title: [shows by time]}
+    """
+    global _catalog
+    catalog = _catalog
+    if (not refresh and catalog is not None and catalog['date'] == _today()
+            and time.monotonic() - catalog['loaded_at'] < CATALOG_TTL):
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is not catalog and _catalog is not None and not refresh:
+            return _catalog  # Another thread reloaded it meanwhile
+        today = _today()
+        shows = _load_active_shows(today)
+        by_title = {}
+        for show in shows:
+            by_title.setdefault(show['title'], []).append(show)
+        _catalog = {
+            'date': today,
+            'loaded_at': time.monotonic(),
+            'shows': shows,
+            'by_id': {show['movie_id']: show for show in shows},
+            'by_title': by_title,
+        }
+        return _catalog
+
+def invalidate_catalog():
+    """Drop the cached catalog after shows were added, edited, (de)activated or deleted."""
+    global _catalog
+    _catalog = None
+
+def get_show(movie_id):
+    """Get one show (nm_movies row) with its screen_name and screen_layout."""
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
+    try:
+        cursor.execute("""
+            SELECT m.*, s.name AS screen_name, s.layout AS screen_layout 
+            FROM nm_movies m
+            LEFT JOIN nm_screens s ON s.screen_id = m.screen_id
+            WHERE m.movie_id = %s
+        """, (movie_id,))
+        show = cursor.fetchone()
+        if show:
+            _remember_show_layouts([show])
+        return show
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def search_movies(title_prefix=None, genre=None, status=None, after=None, limit=None):
+    """
+    Get one page of shows (nm_movies rows) for the admin Movies tab.
+
+    Keyset-paginated like search_users: pass the last row of a page as
+    `after` for the next one. Without a title the page is ordered by show
+    date and time, latest first, and its ids are read from
+    idx_movie_schedule (with a status) or idx_movie_date alone; the full
+    rows are then fetched by primary key for just that page. With a title
+    prefix the page walks idx_movie_title in title order.
+
+    Args:
+        title_prefix (str): Only titles starting with this
+        genre (str): Only this genre
+        status (str): 'active' or 'inactive'
+        after (dict): Last row of the previous page (None for the first page)
+        limit (int): Rows per page (default MOVIE_PAGE_SIZE)
+
+    Returns:
+        list: Show dicts with screen_name; fewer than `limit` rows means
+            this was the last page
+    """
+    conditions = []
+    params = []
+    if title_prefix:
+        upper = title_prefix[:-1] + chr(ord(title_prefix[-1]) + 1)
+        conditions.append("title >= %s AND title < %s")
+        params += [title_prefix, upper]
+    if genre:
+        conditions.append("genre = %s")
+        params.append(genre)
+    if status:
+        conditions.append("status = %s")
+        params.append(status)
+
+    if title_prefix:
+        order = [('title', False), ('movie_id', False)]
+    else:
+        order = [('show_date', True), ('show_time', True), ('movie_id', True)]
+    if after:
+        condition, after_params = _keyset_after(order, after)
+        conditions.append(condition)
+        params += after_params
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    order_by = ", ".join(f"{{0}}{column}{' DESC' if descending else ''}"
+                         for column, descending in order)
+    params.append(limit or MOVIE_PAGE_SIZE)
+
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        # The inner query only touches index columns (InnoDB and SQLite
+        # indexes carry the primary key), the outer one reads one page
+        cursor.execute(f"""
+            SELECT m.*, s.name AS screen_name
+            FROM (
+                SELECT movie_id FROM nm_movies
+                {where}
+                ORDER BY {order_by.format('')}
+                LIMIT %s
+            ) page
+            JOIN nm_movies m ON m.movie_id = page.movie_id
+            LEFT JOIN nm_screens s ON s.screen_id = m.screen_id
+            ORDER BY {order_by.format('m.')}
+        """, params)
+        return cursor.fetchall()
+
+    finally:
+        cursor.close()
+        connection.close()
+
+def _keyset_after(order, row):
+    """
+    Build the WHERE condition for rows after `row` in ORDER BY `order`.
+
+    Args:
+        order (list): (column, descending) pairs; the last column must be
+            unique and never NULL
+        row (dict): Last row of the previous page
+
+    Returns:
+        tuple: (SQL condition, params). NULLs sort first ascending and
+            last descending, as on both backends.
+    """
+    (column, descending), rest = order[0], order[1:]
+    value = row[column]
+    if not rest:
+        return f"{column} {'<' if descending else '>'} %s", [value]
+    condition, params = _keyset_after(rest, row)
+    if value is None:
+        if descending:
+            return f"({column} IS NULL AND {condition})", params
+        return f"({column} IS NOT NULL OR ({column} IS NULL AND {condition}))", params
+    if descending:
+        return (f"({column} < %s OR {column} IS NULL OR ({column} = %s AND {condition}))",
+                [value, value] + params)
+    return f"({column} > %s OR ({column} = %s AND {condition}))", [value, value] + params
+
+def get_screen_schedule(screen_id, show_date=None):
+    """Get (show_time, title, movie_id) of a screen's active shows on a date."""
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT show_time, title, movie_id 
+            FROM nm_movies 
+            WHERE screen_id = %s 
+            AND show_date = %s
+            AND status = 'active'
+            ORDER BY show_time
+        """, (screen_id, show_date or _today()))
+        return cursor.fetchall()
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def check_time_slot_available(show_time, movie_id=None, screen_id=None, show_date=None):
+    """
+    Check if a screen is free for a show starting at show_time.
+
+    A show occupies its screen for SHOW_SLOT_MINUTES. This is a pre-check
+    for forms; set_movie_active_status and save_show check again inside
+    their transaction.
+
+    Args:
+        show_time (str): 'HH:MM:SS'
+        movie_id (int): Show being scheduled, ignored in the check
+        screen_id (int): Screen (default: the show's screen, else the first)
+        show_date: Date (default: today)
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        return _overlapping_show(cursor, show_time, movie_id, screen_id, show_date) is None
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def _overlapping_show(cursor, show_time, movie_id, screen_id, show_date, lock=False):
+    """
+    Find an active show on the screen within SHOW_SLOT_MINUTES of show_time.
+
+    With lock=True the screen's schedule for the date is read FOR UPDATE
+    (an idx_screen_schedule range lock), so inside a transaction two
+    admins cannot both claim overlapping slots.
+
+    Returns:
+        The start time of the overlapping show, or None if the slot is free
+    """
+    if screen_id is None:
+        cursor.execute("""
+            SELECT COALESCE(
+                (SELECT screen_id FROM nm_movies WHERE movie_id = %s),
+                (SELECT MIN(screen_id) FROM nm_screens)
+            )
+        """, (movie_id,))
+        screen_id = cursor.fetchone()[0]
+    cursor.execute(f"""
+        SELECT show_time, status, movie_id FROM nm_movies 
+        WHERE screen_id = %s 
+        AND show_date = %s
+        {'FOR UPDATE' if lock else ''}
+    """, (screen_id, show_date or _today()))
+    start = _minutes_of_day(show_time)
+    for other_time, status, other_id in cursor.fetchall():
+        if (status == 'active' and other_id != movie_id and other_time is not None
+                and abs(_minutes_of_day(other_time) - start) < SHOW_SLOT_MINUTES):
+            return other_time
+    return None
+
+def _minutes_of_day(value):
+    """Minutes since midnight of a TIME value (timedelta, time or 'HH:MM:SS')."""
+    if isinstance(value, timedelta):
+        return int(value.total_seconds()) // 60
+    if hasattr(value, 'hour'):
+        return value.hour * 60 + value.minute
+    hours, minutes = str(value).split(':')[:2]
+    return int(hours) * 60 + int(minutes)
+
+def _slot_taken_message(other_time):
+    return (f"The screen already has a show at {str(other_time)[:5]}; shows on one "
+            f"screen must start at least {SHOW_SLOT_MINUTES} minutes apart")
+
+def set_movie_active_status(movie_id, status, show_time=None, screen_id=None):
+    """
+    Set a show's active status and optionally move it to another time/screen.
+
+    Any number of shows can be active; active shows on one screen must
+    start at least SHOW_SLOT_MINUTES apart. Activating a show dated in the past moves it
+    to today.
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        if status == 'active':
+            connection.start_transaction()
+            cursor.execute("""
+                SELECT show_date, show_time, screen_id 
+                FROM nm_movies 
+                WHERE movie_id = %s
+                FOR UPDATE
+            """, (movie_id,))
+            current = cursor.fetchone()
+            if not current:
+                raise Exception("Movie not found")
+            
+            show_date = current[0] if current[0] and current[0] >= _today() else _today()
+            show_time = show_time or current[1]
+            screen_id = screen_id or current[2]
+            if not show_time:
+                raise Exception("Please choose a show time")
+            
+            other_time = _overlapping_show(cursor, show_time, movie_id, screen_id, show_date,
+                                           lock=True)
+            if other_time is not None:
+                raise Exception(_slot_taken_message(other_time))
+            # Clear any existing seats for this movie when activating
+            _log_seat_events(cursor, movie_id, [None], 'cleared')
+            cursor.execute("""
+                DELETE FROM nm_seats 
+                WHERE movie_id = %s 
+                AND booking_date = CURDATE()
+            """, (movie_id,))
+            cursor.execute("""
+                DELETE FROM nm_bookings 
+                WHERE movie_id = %s 
+                AND booking_date = CURDATE()
+            """, (movie_id,))
+            
+            cursor.execute("""
+                UPDATE nm_movies 
+                SET status = %s,
+                    show_time = %s,
+                    show_date = %s,
+                    screen_id = COALESCE(%s, screen_id)
+                WHERE movie_id = %s
+            """, (status, show_time, show_date, screen_id, movie_id))
+                
+        else:  # When deactivating
+            connection.start_transaction()
+            # Update the show row first: its lock makes a booking in flight
+            # (book_seats reads the row FOR SHARE) finish before the seats
+            # are cleared, and later bookings see the show inactive
+            cursor.execute("""
+                UPDATE nm_movies 
+                SET status = %s
+                WHERE movie_id = %s
+            """, (status, movie_id))
+            # Clear all seats for this movie
+            _log_seat_events(cursor, movie_id, [None], 'cleared')
+            cursor.execute("""
+                DELETE FROM nm_seats 
+                WHERE movie_id = %s 
+                AND booking_date = CURDATE()
+            """, (movie_id,))
+            cursor.execute("""
+                DELETE FROM nm_bookings 
+                WHERE movie_id = %s 
+                AND booking_date = CURDATE()
+            """, (movie_id,))
+            
+        connection.commit()
+        _notify_seat_events()
+        invalidate_seat_bitmaps(movie_id)
+        invalidate_show_seat_maps(movie_id)
+        invalidate_catalog()
+        return True
+        
+    except Exception as e:
+        print(f"Error setting movie status: {e}")
+        connection.rollback()
+        raise
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def save_show(movie_id, show):
+    """
+    Insert a show, or update show `movie_id`.
+
+    Args:
+        movie_id (int): Show to update, or None to add one
+        show (tuple): (title, genre, price, show_date, show_time,
+            screen_id, status)
+
+    Returns:
+        int: The show's movie_id, or None if it is active and its screen
+            has another active show within SHOW_SLOT_MINUTES
+
+    Raises:
+        Exception: If the show moves to another screen while seats of it
+            are booked or held; their seat numbers belong to the old layout
+    """
+    title, genre, price, show_date, show_time, screen_id, status = show
+    screen_changed = False
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        connection.start_transaction()
+        if movie_id:
+            # Waits for bookings and holds in flight (they read the show FOR SHARE)
+            cursor.execute("SELECT screen_id FROM nm_movies WHERE movie_id = %s FOR UPDATE",
+                           (movie_id,))
+            current = cursor.fetchone()
+            if not current:
+                raise Exception("Movie not found")
+            screen_changed = current[0] != screen_id
+            if screen_changed:
+                _check_no_seats_taken(cursor, movie_id)
+        if status == 'active' and _overlapping_show(
+                cursor, show_time, movie_id, screen_id, show_date, lock=True) is not None:
+            connection.rollback()
+            return None
+        
+        if movie_id:
+            if screen_changed:
+                # Other kiosks, admin cards and the gate reload the show's seat map
+                _log_seat_events(cursor, movie_id, [None], 'cleared')
+            cursor.execute("""
+                UPDATE nm_movies 
+                SET title = %s, genre = %s, price = %s,
+                    show_date = %s, show_time = %s, 
+                    screen_id = %s, status = %s
+                WHERE movie_id = %s
+            """, show + (movie_id,))
+            saved_id = movie_id
+        else:
+            cursor.execute("""
+                INSERT INTO nm_movies 
+                (title, genre, price, show_date, show_time, screen_id, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, show)
+            saved_id = cursor.lastrowid
+        
+        connection.commit()
+        if screen_changed:
+            _notify_seat_events()
+            invalidate_seat_bitmaps(movie_id)
+            invalidate_show_seat_maps(movie_id)
+        invalidate_catalog()
+        return saved_id
+        
+    except Exception:
+        connection.rollback()
+        raise
+    
+    finally:
+        cursor.close()
+        connection.close()
+
+def _check_no_seats_taken(cursor, movie_id):
+    """Raise if a show has booked seats today or later, or live seat holds."""
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM nm_seats 
+             WHERE movie_id = %s AND booking_date >= CURDATE())
+          + (SELECT COUNT(*) FROM nm_seat_holds 
+             WHERE movie_id = %s AND expires_at >= NOW())
+    """, (movie_id, movie_id))
+    if cursor.fetchone()[0]:
+        raise Exception("Seats of this show are booked or held. Deactivate the show "
+                        "(which clears its seats) before moving it to another screen.")
+
+def delete_movies(movie_ids):
+    """
+    Delete shows together with their seats, bookings and holds.
+
+    The rows go through ON DELETE CASCADE, so a 'cleared' event is logged
+    for each show in the same transaction; open seat grids and the gate
+    index then stop treating its seats as booked.
+    """
+    movie_ids = list(movie_ids)
+    if not movie_ids:
+        return
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        connection.start_transaction()
+        for movie_id in movie_ids:
+            _log_seat_events(cursor, movie_id, [None], 'cleared')
+            cursor.execute("DELETE FROM nm_movies WHERE movie_id = %s", (movie_id,))
+        connection.commit()
+        
+    except Exception:
+        connection.rollback()
+        raise
+        
+    finally:
+        cursor.close()
+        connection.close()
+    
+    _notify_seat_events()
+    for movie_id in movie_ids:
+        _clear_seat_bitmaps(movie_id)
+        invalidate_show_seat_maps(movie_id)
+    invalidate_catalog()
+
+def update_movie_dates():
+    """
+    Move active shows dated in the past to the current date.
+
+    Shows scheduled for today or later keep their date; only stale rows
+    (shows that run every day) roll forward, found by an
+    idx_movie_schedule range scan.
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("""
+            UPDATE nm_movies 
+            SET show_date = CURDATE()
+            WHERE status = 'active'
+            AND show_date < CURDATE()
+        """)
+        
+        connection.commit()
+        if cursor.rowcount:
+            invalidate_catalog()
+        return True
+        
+    except Exception as e:
+        print(f"Error updating movie dates: {e}")
+        connection.rollback()
+        return False
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def get_occupied_seats(movie_id):
+    """Get occupied seats for a movie on current date."""
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT seat_number 
+            FROM nm_seats 
+            WHERE movie_id = %s 
+            AND booking_date = CURDATE()
+        """, (movie_id,))
+        
+        seats = [row[0] for row in cursor.fetchall()]
+        _store_seat_bitmap(movie_id, _today(),
+                           seats_to_bitmap(seats, get_show_seat_map(movie_id)))
+        return seats
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def get_todays_booked_seats():
+    """
+    Get (movie_id, seat_number, booking_id) for every seat booked today.
+
+    booking_id is None for seats booked before nm_bookings existed.
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT movie_id, seat_number, booking_id 
+            FROM nm_seats 
+            WHERE booking_date = CURDATE()
+        """)
+        return cursor.fetchall()
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def seat_index(seat_number, seat_map=None):
+    """Return the bit position of a seat like 'C5' (default: standard layout)."""
+    return (seat_map or STANDARD_SEAT_MAP).index(seat_number)
+
+def seats_to_bitmap(seat_numbers, seat_map=None):
+    """Pack a list of seat numbers into an occupancy bitmap."""
+    return (seat_map or STANDARD_SEAT_MAP).to_bitmap(seat_numbers)
+
+def bitmap_to_seats(bitmap, seat_map=None):
+    """Unpack an occupancy bitmap into a list of seat numbers."""
+    return (seat_map or STANDARD_SEAT_MAP).to_seats(bitmap)
+
+def is_seat_booked(bitmap, seat_number, seat_map=None):
+    """Check a seat against an occupancy bitmap in O(1)."""
+    return bool(bitmap >> seat_index(seat_number, seat_map) & 1)
+
+def get_show_seat_map(movie_id):
+    """
+    Get the seat map of a show's screen.
+
+    The layout name is cached per show, and each layout is parsed once,
+    so this is a dict lookup after the first call. Shows without a
+    screen, or whose screen names a missing layout, use the standard map.
+
+    Returns:
+        SeatMap: Shared, read-only seat map (see seat_map.py)
+    """
+    layout = _show_layouts.get(movie_id)
+    if layout is None:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT s.layout 
+                FROM nm_movies m
+                LEFT JOIN nm_screens s ON s.screen_id = m.screen_id
+                WHERE m.movie_id = %s
+            """, (movie_id,))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+            connection.close()
+        if not row:
+            return STANDARD_SEAT_MAP  # Unknown show; not cached
+        layout = _show_layouts[movie_id] = row[0] or DEFAULT_SCREEN_LAYOUT
+    try:
+        return load_seat_map(layout)
+    except ValueError as e:
+        print(f"[ERROR] {e}; using the {DEFAULT_SCREEN_LAYOUT} layout")
+        _show_layouts[movie_id] = DEFAULT_SCREEN_LAYOUT
+        return STANDARD_SEAT_MAP
+
+def invalidate_show_seat_maps(movie_id=None):
+    """Forget the cached layout of one show (e.g. after a screen change), or of every show."""
+    if movie_id is None:
+        _show_layouts.clear()
+    else:
+        _show_layouts.pop(movie_id, None)
+
+def _remember_show_layouts(shows):
+    """Cache the layout of shows fetched with a screen_layout column."""
+    for show in shows:
+        _show_layouts[show['movie_id']] = show.get('screen_layout') or DEFAULT_SCREEN_LAYOUT
+
+def get_seat_snapshot(movie_id, refresh=False):
+    """
+    Get a versioned occupancy snapshot for a movie's show today.
+
+    The bitmap is served from memory; the database is only queried on a
+    cache miss or when refresh=True. The version changes every time the
+    bitmap changes, so UIs can cheaply tell whether to redraw.
+
+    Returns:
+        dict: movie_id, booking_date, bitmap, version and booked_count
+    """
+    key = (movie_id, _today())
+    if not refresh:
+        with _seat_bitmap_lock:
+            entry = _seat_bitmaps.get(key)
+            if entry:
+                return _make_snapshot(key, entry)
+    get_occupied_seats(movie_id)
+    with _seat_bitmap_lock:
+        return _make_snapshot(key, _seat_bitmaps[key])
+
+def is_seat_available(movie_id, seat_number):
+    """Check whether a seat is free for today's show (cached, no round-trip)."""
+    return not is_seat_booked(get_seat_snapshot(movie_id)['bitmap'], seat_number)
+
+def invalidate_seat_bitmaps(movie_id=None):
+    """Drop cached bitmaps for one movie, or for every movie."""
+    with _seat_bitmap_lock:
+        for key in list(_seat_bitmaps):
+            if movie_id is None or key[0] == movie_id:
+                del _seat_bitmaps[key]
+
+def _today():
+    return datetime.now().date()
+
+def _make_snapshot(key, entry):
+    bitmap, version = entry
+    return {
+        'movie_id': key[0],
+        'booking_date': key[1],
+        'bitmap': bitmap,
+        'version': version,
+        'booked_count': bin(bitmap).count("1"),
+    }
+
+def _store_seat_bitmap(movie_id, booking_date, bitmap):
+    """Replace a cached bitmap, bumping its version only if it changed."""
+    global _seat_bitmap_version
+    key = (movie_id, booking_date)
+    with _seat_bitmap_lock:
+        entry = _seat_bitmaps.get(key)
+        if entry and entry[0] == bitmap:
+            return entry[1]
+        _seat_bitmap_version += 1
+        _seat_bitmaps[key] = (bitmap, _seat_bitmap_version)
+        return _seat_bitmap_version
+
+def _clear_seat_bitmaps(movie_id=None):
+    """Mark today's cached shows as empty after their seats were cleared."""
+    today = _today()
+    with _seat_bitmap_lock:
+        keys = [key for key in _seat_bitmaps
+                if key[1] == today and (movie_id is None or key[0] == movie_id)]
+    for key in keys:
+        _store_seat_bitmap(key[0], key[1], 0)
+
+def _drop_old_seat_bitmaps():
+    """Forget cached bitmaps of previous days."""
+    today = _today()
+    with _seat_bitmap_lock:
+        for key in [key for key in _seat_bitmaps if key[1] < today]:
+            del _seat_bitmaps[key]
+
+def _update_seat_bitmap(movie_id, booked=(), cleared=()):
+    """Apply a booking or clearing to a cached bitmap (if it is cached)."""
+    global _seat_bitmap_version
+    key = (movie_id, _today())
+    if key not in _seat_bitmaps:
+        return  # Not cached; the next snapshot loads it from the database
+    seat_map = get_show_seat_map(movie_id)
+    with _seat_bitmap_lock:
+        entry = _seat_bitmaps.get(key)
+        if not entry:
+            return
+        bitmap = entry[0] | seats_to_bitmap(booked, seat_map)
+        bitmap &= ~seats_to_bitmap(cleared, seat_map)
+        if bitmap != entry[0]:
+            _seat_bitmap_version += 1
+            _seat_bitmaps[key] = (bitmap, _seat_bitmap_version)
+
+def book_seats(movie_id, seat_numbers, user_id, holder=None):
+    """
+    Atomically book seats for a movie on the current date.
+
+    One transaction inserts the nm_bookings row and claims all seats with
+    a single multi-row INSERT. The unique_seat index rejects the whole
+    statement if any seat is already taken, so concurrent kiosks can never
+    double-book and the number of round-trips does not grow with the
+    number of seats. Seats held by someone else (see hold_seats) count as
+    taken; the caller's own holds are converted into the booking.
+
+    The show row is read with a shared lock in the same transaction, so
+    the booking is refused if the show is no longer active today, and the
+    amount stored is its current price times the seats - whatever a
+    cached catalog says. A concurrent deactivation either waits for the
+    booking (and then clears it) or makes it fail.
+
+    Args:
+        movie_id (int): Show to book
+        seat_numbers (list): Seats like ['C4', 'C5']
+        user_id (int): Customer making the booking
+        holder (str): Hold owner whose holds on these seats are used up
+
+    Returns:
+        tuple: (booking_id, conflicts) - booking_id is the new ULID, or
+        None if nothing was booked; conflicts lists the requested seats
+        that were already booked (empty on success or other errors)
+
+    Raises:
+        ShowUnavailableError: If the show is not active today
+    """
+    seats = list(dict.fromkeys(seat_numbers))
+    if not seats:
+        return None, []
+
+    connection = None
+    cursor = None
+    try:
+        seat_map = get_show_seat_map(movie_id)
+        invalid = [seat for seat in seats if seat not in seat_map]
+        if invalid:
+            print(f"[ERROR] Seat(s) not in the {seat_map.name} layout: {', '.join(invalid)}")
+            return None, []
+
+        connection = get_db_connection()
+        if not connection:
+            raise Exception("Failed to establish database connection")
+
+        cursor = connection.cursor()
+        booking_id = new_booking_id()
+        values = ", ".join(["(%s, %s, %s, %s, CURDATE())"] * len(seats))
+        params = []
+        for seat in seats:
+            params.extend((movie_id, user_id, booking_id, seat))
+
+        connection.start_transaction()
+        cursor.execute("""
+            SELECT price 
+            FROM nm_movies 
+            WHERE movie_id = %s 
+            AND status = 'active' 
+            AND show_date = CURDATE()
+            FOR SHARE
+        """, (movie_id,))
+        show = cursor.fetchone()
+        if not show:
+            connection.rollback()
+            raise ShowUnavailableError("This show is no longer running. Please pick another show.")
+        total_amount = show[0] * len(seats) if show[0] is not None else None
+        held_by_others = _find_held_seats(cursor, movie_id, seats, holder)
+        if held_by_others:
+            connection.rollback()
+            print(f"[ERROR] Seat(s) held by another customer: {', '.join(held_by_others)}")
+            return None, held_by_others
+        cursor.execute("""
+            INSERT INTO nm_bookings (booking_id, user_id, movie_id, booking_date, total_amount)
+            VALUES (%s, %s, %s, CURDATE(), %s)
+        """, (booking_id, user_id, movie_id, total_amount))
+        cursor.execute(f"""
+            INSERT INTO nm_seats (movie_id, user_id, booking_id, seat_number, booking_date)
+            VALUES {values}
+        """, params)
+        _delete_seat_holds(cursor, movie_id, seats)
+        _log_seat_events(cursor, movie_id, seats, 'booked', booking_id)
+        connection.commit()
+        _notify_seat_events()
+        _update_seat_bitmap(movie_id, booked=seats)
+        print(f"[SUCCESS] Booking {booking_id}: seats {', '.join(seats)}")
+        return booking_id, []
+
+    except ShowUnavailableError as e:
+        print(f"[ERROR] Show {movie_id} not bookable: {e}")
+        invalidate_catalog()
+        raise
+    except DatabaseError as err:
+        if connection:
+            connection.rollback()
+        if get_backend().is_duplicate_key(err):
+            try:
+                conflicts = _find_booked_seats(cursor, movie_id, seats)
+            except DatabaseError as lookup_err:
+                print(f"[ERROR] Could not determine conflicting seats: {lookup_err}")
+                conflicts = seats
+            _update_seat_bitmap(movie_id, booked=conflicts)
+            print(f"[ERROR] Seat(s) already booked: {', '.join(conflicts)}")
+            return None, conflicts
+        error_message = f"[ERROR] Database error while booking seats: {err}"
+        if get_backend().is_foreign_key_error(err):
+            error_message = "[ERROR] Invalid movie_id or user_id provided."
+        print(error_message)
+        return None, []
+    except Exception as e:
+        print(f"[ERROR] Unexpected error while booking seats: {e}")
+        if connection:
+            connection.rollback()
+        return None, []
+    finally:
+        if cursor:
+            try:
+                cursor.close()
+            except Exception as e:
+                print(f"[ERROR] Failed to close cursor: {e}")
+        if connection:
+            try:
+                connection.close()
+            except Exception as e:
+                print(f"[ERROR] Failed to close connection: {e}")
+
+def _find_booked_seats(cursor, movie_id, seat_numbers):
+    """Return which of the given seats are already booked (one query)."""
+    placeholders = ", ".join(["%s"] * len(seat_numbers))
+    cursor.execute(f"""
+        SELECT seat_number 
+        FROM nm_seats 
+        WHERE movie_id = %s 
+        AND booking_date = CURDATE()
+        AND seat_number IN ({placeholders})
+    """, (movie_id, *seat_numbers))
+    booked = {row[0] for row in cursor.fetchall()}
+    return [seat for seat in seat_numbers if seat in booked]
+
+def hold_seats(movie_id, seat_numbers, holder, user_id=None, ttl=None):
+    """
+    Reserve seats in today's show for a customer who is still choosing.
+
+    Holds are all-or-nothing: if any seat is booked or held by someone
+    else, nothing changes and those seats are reported. Holding seats the
+    holder already holds renews them. Holds expire after `ttl` seconds
+    (measured on the database clock, so kiosk clocks do not matter);
+    book_seats turns them into a booking.
+
+    Args:
+        movie_id (int): Show
+        seat_numbers (list): Seats like ['C4', 'C5']
+        holder (str): Hold owner, e.g. one id per seat window
+        user_id (int): Customer, for the admin view
+        ttl (int): Seconds until the holds expire (default SEAT_HOLD_TTL)
+
+    Returns:
+        tuple: (held, conflicts) - held is True if every seat is now held
+        by `holder`; conflicts lists seats booked or held by others
+    """
+    seats = list(dict.fromkeys(seat_numbers))
+    if not seats:
+        return True, []
+
+    connection = None
+    cursor = None
+    try:
+        seat_map = get_show_seat_map(movie_id)
+        invalid = [seat for seat in seats if seat not in seat_map]
+        if invalid:
+            print(f"[ERROR] Seat(s) not in the {seat_map.name} layout: {', '.join(invalid)}")
+            return False, []
+
+        connection = get_db_connection()
+        if not connection:
+            raise Exception("Failed to establish database connection")
+
+        cursor = connection.cursor()
+        placeholders = ", ".join(["%s"] * len(seats))
+        values = ", ".join(["(%s, CURDATE(), %s, %s, %s, NOW() + INTERVAL %s SECOND)"] * len(seats))
+        params = []
+        for seat in seats:
+            params.extend((movie_id, seat, holder, user_id, ttl or SEAT_HOLD_TTL))
+
+        connection.start_transaction()
+        # Waits for a screen change in flight (save_show locks the show FOR UPDATE)
+        cursor.execute("SELECT movie_id FROM nm_movies WHERE movie_id = %s FOR SHARE",
+                       (movie_id,))
+        _sweep_expired_holds(cursor)
+        # Own holds are re-inserted below with a fresh expiry
+        cursor.execute(f"""
+            DELETE FROM nm_seat_holds 
+            WHERE movie_id = %s 
+            AND booking_date = CURDATE()
+            AND seat_number IN ({placeholders})
+            AND (holder = %s OR expires_at < NOW())
+        """, (movie_id, *seats, holder))
+        conflicts = set(_find_booked_seats(cursor, movie_id, seats))
+        conflicts.update(_find_held_seats(cursor, movie_id, seats, holder))
+        if conflicts:
+            connection.rollback()
+            return False, [seat for seat in seats if seat in conflicts]
+
+        cursor.execute(f"""
+            INSERT INTO nm_seat_holds 
+                (movie_id, booking_date, seat_number, holder, user_id, expires_at)
+            VALUES {values}
+        """, params)
+        connection.commit()
+        return True, []
+
+    except DatabaseError as err:
+        if connection:
+            connection.rollback()
+        if get_backend().is_duplicate_key(err):
+            # Another kiosk held one of the seats between our check and insert
+            return False, seats
+        print(f"[ERROR] Database error while holding seats: {err}")
+        return False, []
+    except Exception as e:
+        print(f"[ERROR] Unexpected error while holding seats: {e}")
+        if connection:
+            connection.rollback()
+        return False, []
+    finally:
+        if cursor:
+            cursor.close()
+        if connection:
+            connection.close()
+
+def release_seat_holds(movie_id, holder, seat_numbers=None):
+    """Release a holder's holds on some seats, or on all its seats in the show."""
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        if seat_numbers:
+            placeholders = ", ".join(["%s"] * len(seat_numbers))
+            cursor.execute(f"""
+                DELETE FROM nm_seat_holds 
+                WHERE movie_id = %s 
+                AND booking_date = CURDATE()
+                AND seat_number IN ({placeholders})
+                AND holder = %s
+            """, (movie_id, *seat_numbers, holder))
+        else:
+            cursor.execute("""
+                DELETE FROM nm_seat_holds 
+                WHERE movie_id = %s 
+                AND booking_date = CURDATE()
+                AND holder = %s
+            """, (movie_id, holder))
+        connection.commit()
+        return True
+        
+    except Exception as e:
+        print(f"Error releasing seat holds: {e}")
+        connection.rollback()
+        return False
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def get_held_seats(movie_id, exclude_holder=None):
+    """
+    Get a bitmap of the seats currently held in today's show.
+
+    Args:
+        movie_id (int): Show
+        exclude_holder (str): Leave out this holder's own holds
+
+    Returns:
+        int: Bitmap in the show's seat map layout
+    """
     connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
+    cursor = connection.cursor()
     
     try:
-        query = """
-            SELECT * FROM nm_movies 
-            WHERE status = 'active' 
-            AND show_date = CURDATE()
-            ORDER BY show_time
-        """
-        cursor.execute(query)
-        return cursor.fetchall()
-        
-    except Exception as e:
-        print(f"Database error in get_active_movies_for_date: {e}")
-        return []
+        cursor.execute("""
+            SELECT seat_number 
+            FROM nm_seat_holds 
+            WHERE movie_id = %s 
+            AND booking_date = CURDATE()
+            AND expires_at >= NOW()
+            AND holder <> %s
+        """, (movie_id, exclude_holder or ""))
+        return seats_to_bitmap((row[0] for row in cursor.fetchall()),
+                               get_show_seat_map(movie_id))
         
     finally:
         cursor.close()
         connection.close()
 
-def check_time_slot_available(show_time, movie_id=None):
-    """Check if a time slot is available."""
+def get_seat_holds():
+    """Get {movie_id: bitmap} of the seats currently held, for every show today."""
     connection = get_db_connection()
     cursor = connection.cursor()
     
     try:
-        if movie_id:
-            cursor.execute("""
-                SELECT COUNT(*) FROM nm_movies 
-                WHERE show_time = %s 
-                AND status = 'active'
-                AND movie_id != %s
-                AND show_date = CURDATE()
-            """, (show_time, movie_id))
-        else:
-            cursor.execute("""
-                SELECT COUNT(*) FROM nm_movies 
-                WHERE show_time = %s 
-                AND status = 'active'
-                AND show_date = CURDATE()
-            """, (show_time,))
-            
-        count = cursor.fetchone()[0]
-        return count == 0
+        cursor.execute("""
+            SELECT movie_id, seat_number 
+            FROM nm_seat_holds 
+            WHERE expires_at >= NOW()
+            AND booking_date = CURDATE()
+        """)
+        rows = cursor.fetchall()
+        holds = {}
+        for movie_id, seat_number in rows:
+            seat_map = get_show_seat_map(movie_id)
+            holds[movie_id] = holds.get(movie_id, 0) | 1 << seat_index(seat_number, seat_map)
+        return holds
         
     finally:
         cursor.close()
         connection.close()
 
-def set_movie_active_status(movie_id, status, show_time=None):
-    """Set a movie's active status and optionally update its show time."""
+def sweep_expired_holds():
+    """Delete every expired seat hold in one statement. Returns the row count."""
     connection = get_db_connection()
     cursor = connection.cursor()
     
     try:
-        if status == 'active':
-            active_count = get_active_movie_count()
-            
-            cursor.execute("SELECT status FROM nm_movies WHERE movie_id = %s", (movie_id,))
-            current_status = cursor.fetchone()[0]
-            
-            if current_status != 'active' and active_count >= 3:
-                raise Exception("Maximum limit of 3 active movies reached. Please deactivate another movie first.")
-            
-            if show_time:
-                if not check_time_slot_available(show_time, movie_id):
-                    raise Exception(f"Time slot {show_time[:5]} is already taken by another movie")
-                
-                # Clear any existing seats for this movie when activating
-                cursor.execute("""
-                    DELETE FROM nm_seats 
-                    WHERE movie_id = %s 
-                    AND booking_date = CURDATE()
-                """, (movie_id,))
-                
-                cursor.execute("""
-                    UPDATE nm_movies 
-                    SET status = %s,
-                        show_time = %s,
-                        show_date = CURDATE()
-                    WHERE movie_id = %s
-                """, (status, show_time, movie_id))
-                
-        else:  # When deactivating
-            # Clear all seats for this movie
-            cursor.execute("""
-                DELETE FROM nm_seats 
-                WHERE movie_id = %s 
-                AND booking_date = CURDATE()
-            """, (movie_id,))
-            
-            cursor.execute("""
-                UPDATE nm_movies 
-                SET status = %s,
-                    show_date = CURDATE()
-                WHERE movie_id = %s
-            """, (status, movie_id))
-            
-        connection.commit()
-        return True
+        return _sweep_expired_holds(cursor, force=True)
         
     except Exception as e:
-        print(f"Error setting movie status: {e}")
-        connection.rollback()
-        raise
+        print(f"Error sweeping seat holds: {e}")
+        return 0
         
     finally:
         cursor.close()
         connection.close()
 
-def update_movie_dates():
-    """Update active movies to current date."""
+def _sweep_expired_holds(cursor, force=False):
+    """Bulk-delete expired holds, at most once per HOLD_SWEEP_INTERVAL."""
+    global _last_hold_sweep
+    now = time.monotonic()
+    if not force and now - _last_hold_sweep < HOLD_SWEEP_INTERVAL:
+        return 0
+    _last_hold_sweep = now
+    cursor.execute("DELETE FROM nm_seat_holds WHERE expires_at < NOW()")
+    return cursor.rowcount
+
+def _find_held_seats(cursor, movie_id, seat_numbers, holder=None):
+    """Return which of the given seats are held by someone other than holder."""
+    placeholders = ", ".join(["%s"] * len(seat_numbers))
+    cursor.execute(f"""
+        SELECT seat_number 
+        FROM nm_seat_holds 
+        WHERE movie_id = %s 
+        AND booking_date = CURDATE()
+        AND seat_number IN ({placeholders})
+        AND holder <> %s
+        AND expires_at >= NOW()
+    """, (movie_id, *seat_numbers, holder or ""))
+    held = {row[0] for row in cursor.fetchall()}
+    return [seat for seat in seat_numbers if seat in held]
+
+def _delete_seat_holds(cursor, movie_id, seat_numbers):
+    """Remove all holds on the given seats (they have just been booked)."""
+    placeholders = ", ".join(["%s"] * len(seat_numbers))
+    cursor.execute(f"""
+        DELETE FROM nm_seat_holds 
+        WHERE movie_id = %s 
+        AND booking_date = CURDATE()
+        AND seat_number IN ({placeholders})
+    """, (movie_id, *seat_numbers))
+
+def mark_seats_as_occupied(movie_id, seat_numbers, user_id):
+    """Mark seats as occupied for a movie."""
+    try:
+        booking_id, conflicts = book_seats(movie_id, seat_numbers, user_id)
+    except ShowUnavailableError:
+        return False
+    if conflicts:
+        print(
+            f"[ERROR] Seats {', '.join(conflicts)} are already booked. "
+            "Please refresh and try again."
+        )
+    return booking_id is not None
+
+def get_booking(booking_id):
+    """
+    Get a booking with its show, customer and seats.
+
+    One primary-key lookup on nm_bookings (joined to its movie and user)
+    plus one idx_seat_booking range scan for the seats.
+
+    Returns:
+        dict: booking_id, user_id, movie_id, booking_date, total_amount,
+        created_at, title, show_time, name, username, phone_number and
+        seat_numbers - or None if the booking does not exist
+    """
     connection = get_db_connection()
-    cursor = connection.cursor()
+    cursor = connection.cursor(dictionary=True)
     
     try:
         cursor.execute("""
-            UPDATE nm_movies 
-            SET show_date = CURDATE()
-            WHERE status = 'active'
-        """)
+            SELECT b.booking_id, b.user_id, b.movie_id, b.booking_date, 
+                   b.total_amount, b.created_at, m.title, m.show_time, 
+                   u.name, u.username, u.phone_number
+            FROM nm_bookings b
+            JOIN nm_movies m ON m.movie_id = b.movie_id
+            JOIN nm_users u ON u.user_id = b.user_id
+            WHERE b.booking_id = %s
+        """, (booking_id,))
+        booking = cursor.fetchone()
+        if booking:
+            cursor.execute("""
+                SELECT seat_number 
+                FROM nm_seats 
+                WHERE booking_id = %s
+            """, (booking_id,))
+            seat_map = get_show_seat_map(booking['movie_id'])
+            booking['seat_numbers'] = sorted(
+                (row['seat_number'] for row in cursor.fetchall()), key=seat_map.index
+            )
+        return booking
         
-        connection.commit()
-        return True
+    finally:
+        cursor.close()
+        connection.close()
+
+def get_seat_booking(movie_id, seat_number):
+    """
+    Get the booking that holds a seat in today's show.
+
+    Looks the seat up through the unique_seat index, then loads its
+    booking with get_booking. Seats booked before nm_bookings existed
+    have no booking row; for those the seat's own user is returned with
+    booking_id None and seat_numbers [seat_number].
+
+    Returns:
+        dict: Same fields as get_booking, or None if the seat is free
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
+    try:
+        cursor.execute("""
+            SELECT s.booking_id, s.user_id, s.movie_id, s.booking_date, 
+                   m.title, m.show_time, u.name, u.username, u.phone_number
+            FROM nm_seats s
+            JOIN nm_movies m ON m.movie_id = s.movie_id
+            JOIN nm_users u ON u.user_id = s.user_id
+            WHERE s.movie_id = %s 
+            AND s.seat_number = %s 
+            AND s.booking_date = CURDATE()
+        """, (movie_id, seat_number))
+        seat = cursor.fetchone()
         
-    except Exception as e:
-        print(f"Error updating movie dates: {e}")
-        connection.rollback()
-        return False
+    finally:
+        cursor.close()
+        connection.close()
+
+    if not seat:
+        return None
+    if seat['booking_id']:
+        return get_booking(seat['booking_id'])
+    seat.update({'total_amount': None, 'created_at': None, 'seat_numbers': [seat_number]})
+    return seat
+
+def get_user_bookings(user_id, limit=50):
+    """Get a user's most recent bookings, newest first (idx_booking_user)."""
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
+    try:
+        cursor.execute("""
+            SELECT b.booking_id, b.movie_id, b.booking_date, b.total_amount, 
+                   b.created_at, m.title, m.show_time
+            FROM nm_bookings b
+            JOIN nm_movies m ON m.movie_id = b.movie_id
+            WHERE b.user_id = %s
+            ORDER BY b.created_at DESC
+            LIMIT %s
+        """, (user_id, limit))
+        return cursor.fetchall()
         
     finally:
         cursor.close()
         connection.close()
 
-def get_occupied_seats(movie_id):
-    """Get occupied seats for a movie on current date."""
+def get_show_bookings(movie_id, booking_date=None):
+    """
+    Get every booking for one show, with customer and seats.
+
+    Uses idx_booking_show for the bookings and idx_seat_booking for the
+    seats; handy for re-issuing all tickets of a show.
+
+    Args:
+        movie_id (int): Show to list
+        booking_date: datetime.date (default: today)
+
+    Returns:
+        list: Booking dicts like get_booking, oldest first
+    """
     connection = get_db_connection()
-    cursor = connection.cursor()
+    cursor = connection.cursor(dictionary=True)
     
     try:
         cursor.execute("""
-            SELECT seat_number 
+            SELECT b.booking_id, b.user_id, b.movie_id, b.booking_date, 
+                   b.total_amount, b.created_at, m.title, m.show_time, 
+                   u.name, u.username, u.phone_number
+            FROM nm_bookings b
+            JOIN nm_movies m ON m.movie_id = b.movie_id
+            JOIN nm_users u ON u.user_id = b.user_id
+            WHERE b.movie_id = %s 
+            AND b.booking_date = %s
+            ORDER BY b.booking_id
+        """, (movie_id, booking_date or _today()))
+        bookings = cursor.fetchall()
+        if not bookings:
+            return []
+
+        by_id = {booking['booking_id']: booking for booking in bookings}
+        for booking in bookings:
+            booking['seat_numbers'] = []
+        placeholders = ", ".join(["%s"] * len(by_id))
+        cursor.execute(f"""
+            SELECT booking_id, seat_number 
             FROM nm_seats 
-            WHERE movie_id = %s 
-            AND booking_date = CURDATE()
-        """, (movie_id,))
-        
-        return [row[0] for row in cursor.fetchall()]
+            WHERE booking_id IN ({placeholders})
+        """, list(by_id))
+        for row in cursor.fetchall():
+            by_id[row['booking_id']]['seat_numbers'].append(row['seat_number'])
+        seat_map = get_show_seat_map(movie_id)
+        for booking in bookings:
+            booking['seat_numbers'].sort(key=seat_map.index)
+        return bookings
         
     finally:
         cursor.close()
         connection.close()
 
-def mark_seats_as_occupied(movie_id, seat_numbers, user_id):
-    """Mark seats as occupied for a movie."""
-    connection = None
-    cursor = None
+def get_user_contact(user_id):
+    """Get name and phone number for a user."""
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
     try:
-        connection = get_db_connection()
-        if not connection:
-            raise Exception("Failed to establish database connection")
-            
-        cursor = connection.cursor()
-        
-        # First check if seats are still available
-        occupied_seats = []
-        for seat in seat_numbers:
-            cursor.execute("""
-                SELECT seat_number 
-                FROM nm_seats 
-                WHERE movie_id = %s 
-                AND seat_number = %s 
-                AND booking_date = CURDATE()
-            """, (movie_id, seat))
-            if cursor.fetchone():
-                occupied_seats.append(seat)
-        
-        if occupied_seats:
-            raise Exception(
-                f"Seats {', '.join(occupied_seats)} are already booked. "
-                "Please refresh and try again."
-            )
-        
-        # If all seats are available, proceed with booking
-        for seat in seat_numbers:
-            cursor.execute("""
-                INSERT INTO nm_seats (movie_id, user_id, seat_number, booking_date)
-                VALUES (%s, %s, %s, CURDATE())
-            """, (movie_id, user_id, seat))
-            
-        connection.commit()
-        print(f"[SUCCESS] Successfully booked seats: {', '.join(seat_numbers)}")
-        return True
+        cursor.execute("""
+            SELECT name, phone_number 
+            FROM nm_users 
+            WHERE user_id = %s
+        """, (user_id,))
+        return cursor.fetchone()
         
-    except mysql.Error as err:
-        error_message = f"[ERROR] MySQL error while booking seats: {err}"
-        if err.errno == mysql.errorcode.ER_DUP_ENTRY:
-            error_message = "[ERROR] Seat(s) already booked. Please refresh and try again."
-        elif err.errno == mysql.errorcode.ER_NO_REFERENCED_ROW_2:
-            error_message = "[ERROR] Invalid movie_id or user_id provided."
-        print(error_message)
-        if connection:
-            connection.rollback()
-        return False
-    except Exception as e:
-        print(f"[ERROR] Unexpected error while booking seats: {e}")
-        if connection:
-            connection.rollback()
-        return False
     finally:
-        if cursor:
-            try:
-                cursor.close()
-            except Exception as e:
-                print(f"[ERROR] Failed to close cursor: {e}")
-        if connection:
-            try:
-                connection.close()
-            except Exception as e:
-                print(f"[ERROR] Failed to close connection: {e}")
+        cursor.close()
+        connection.close()
 
 def clear_old_seat_data():
-    """Clear seat data only from previous days, not current day."""
+    """
+    Clear seat data from previous days, never the current day.
+
+    Seat holds and change-feed events only matter for today's shows and
+    are always removed. Booked seats and bookings are the booking history
+    (a booking's seat numbers live in nm_seats), so they are only removed
+    once older than BOOKING_RETENTION_DAYS; with 0 they are kept forever.
+    """
     connection = get_db_connection()
     cursor = connection.cursor()
     
     try:
         cursor.execute("""
-            SELECT COUNT(*) 
-            FROM nm_seats 
+            DELETE FROM nm_seat_holds 
             WHERE booking_date < CURDATE()
         """)
-        old_records = cursor.fetchone()[0]
-        
-        if old_records > 0:
+        cursor.execute("""
+            DELETE FROM nm_seat_events 
+            WHERE booking_date < CURDATE()
+        """)
+        old_records = 0
+        if BOOKING_RETENTION_DAYS > 0:
+            cutoff = _today() - timedelta(days=BOOKING_RETENTION_DAYS)
             cursor.execute("""
                 DELETE FROM nm_seats 
-                WHERE booking_date < CURDATE()
-            """)
-            connection.commit()
-            print("[+] Old seat data cleared successfully")
+                WHERE booking_date < %s
+            """, (cutoff,))
+            old_records = cursor.rowcount
+            cursor.execute("""
+                DELETE FROM nm_bookings 
+                WHERE booking_date < %s
+            """, (cutoff,))
+        connection.commit()
+        _drop_old_seat_bitmaps()
+        
+        if old_records > 0:
+            print(f"[+] Cleared {old_records} booked seats older than {BOOKING_RETENTION_DAYS} days")
         else:
             print("[+] No old seat data to clear")
             
@@ -550,67 +1886,94 @@ def clear_old_seat_data():
         connection.close()
 
 def get_movie_seat_status(movie_id=None):
-    """Get seat status for all active movies or a specific movie."""
+    """
+    Get seat status for all active movies or a specific movie.
+
+    Each row also carries seat_bitmap and seat_version, and refreshes the
+    in-memory bitmap cache.
+    """
     connection = get_db_connection()
     cursor = connection.cursor(dictionary=True)
     
     try:
         if movie_id:
             cursor.execute("""
-                SELECT m.movie_id, m.title, m.show_time, 
+                SELECT m.movie_id, m.title, m.show_time, sc.name AS screen_name, 
+                       sc.layout AS screen_layout, 
                        GROUP_CONCAT(s.seat_number) as booked_seats
                 FROM nm_movies m
+                LEFT JOIN nm_screens sc ON sc.screen_id = m.screen_id
                 LEFT JOIN nm_seats s ON m.movie_id = s.movie_id 
                     AND s.booking_date = CURDATE()
                 WHERE m.movie_id = %s
                 AND m.status = 'active'
-                GROUP BY m.movie_id
+                GROUP BY m.movie_id, sc.name, sc.layout
             """, (movie_id,))
         else:
             cursor.execute("""
-                SELECT m.movie_id, m.title, m.show_time, 
+                SELECT m.movie_id, m.title, m.show_time, sc.name AS screen_name, 
+                       sc.layout AS screen_layout, 
                        GROUP_CONCAT(s.seat_number) as booked_seats
                 FROM nm_movies m
+                LEFT JOIN nm_screens sc ON sc.screen_id = m.screen_id
                 LEFT JOIN nm_seats s ON m.movie_id = s.movie_id 
                     AND s.booking_date = CURDATE()
                 WHERE m.status = 'active'
-                GROUP BY m.movie_id
+                AND m.show_date = CURDATE()
+                GROUP BY m.movie_id, sc.name, sc.layout
+                ORDER BY m.show_time, sc.name
             """)
         
-        return cursor.fetchall()
+        movies = cursor.fetchall()
+        _remember_show_layouts(movies)
+        today = _today()
+        for movie in movies:
+            booked = movie['booked_seats'].split(',') if movie['booked_seats'] else []
+            movie['seat_bitmap'] = seats_to_bitmap(booked, get_show_seat_map(movie['movie_id']))
+            movie['seat_version'] = _store_seat_bitmap(movie['movie_id'], today, movie['seat_bitmap'])
+        return movies
         
     finally:
         cursor.close()
         connection.close()
 
 def ensure_seats_table_exists():
-    """Ensure seats table exists without clearing data."""
+    """Ensure screens, bookings, seats, seat events and seat holds tables exist without clearing data."""
     connection = get_db_connection()
     cursor = connection.cursor()
     
     try:
-        cursor.execute("SHOW TABLES LIKE 'nm_seats'")
-        if not cursor.fetchone():
-            cursor.execute("""
-            CREATE TABLE nm_seats (
-                seat_id INT AUTO_INCREMENT PRIMARY KEY,
-                movie_id INT,
-                user_id INT,
-                seat_number VARCHAR(3) NOT NULL,
-                booking_date DATE NOT NULL,
-                CONSTRAINT fk_movie 
-                    FOREIGN KEY (movie_id) 
-                    REFERENCES nm_movies(movie_id)
-                    ON DELETE CASCADE,
-                CONSTRAINT fk_user
-                    FOREIGN KEY (user_id) 
-                    REFERENCES nm_users(user_id)
-                    ON DELETE CASCADE,
-                UNIQUE KEY unique_seat (movie_id, seat_number, booking_date)
-            ) ENGINE=InnoDB
-            """)
+        backend = get_backend()
+        if not backend.table_exists(cursor, 'nm_screens'):
+            backend.create_table(cursor, 'nm_screens')
+            print("✓ Screens table created successfully")
+        
+        if not backend.table_exists(cursor, 'nm_bookings'):
+            backend.create_table(cursor, 'nm_bookings')
+            print("✓ Bookings table created successfully")
+        
+        if not backend.table_exists(cursor, 'nm_seats'):
+            backend.create_table(cursor, 'nm_seats')
             print("✓ Seats table created successfully")
-            connection.commit()
+        
+        if not backend.table_exists(cursor, 'nm_seat_events'):
+            backend.create_table(cursor, 'nm_seat_events')
+            print("✓ Seat events table created successfully")
+        
+        if not backend.table_exists(cursor, 'nm_seat_holds'):
+            backend.create_table(cursor, 'nm_seat_holds')
+            print("✓ Seat holds table created successfully")
+        
+        for table, column in ADDED_COLUMNS:
+            if not backend.column_exists(cursor, table, column):
+                backend.add_column(cursor, table, column)
+                print(f"✓ Column {table}.{column} added")
+        for table, index in ADDED_INDEXES:
+            if not backend.index_exists(cursor, table, index):
+                backend.add_index(cursor, table, index)
+                print(f"✓ Index {table}.{index} added")
+        _ensure_default_screen(cursor)
+        connection.commit()
         return True
         
     except Exception as e:
@@ -646,21 +2009,34 @@ def clear_seats_for_movie(movie_id=None):
     cursor = connection.cursor()
     
     try:
+        connection.start_transaction()
+        _log_seat_events(cursor, movie_id, [None], 'cleared')
         if movie_id:
             cursor.execute("""
                 DELETE FROM nm_seats 
                 WHERE movie_id = %s 
                 AND booking_date = CURDATE()
             """, (movie_id,))
+            cursor.execute("""
+                DELETE FROM nm_bookings 
+                WHERE movie_id = %s 
+                AND booking_date = CURDATE()
+            """, (movie_id,))
             message = "Seats cleared for selected movie"
         else:
             cursor.execute("""
                 DELETE FROM nm_seats 
                 WHERE booking_date = CURDATE()
             """)
+            cursor.execute("""
+                DELETE FROM nm_bookings 
+                WHERE booking_date = CURDATE()
+            """)
             message = "Seats cleared for all movies"
             
         connection.commit()
+        _notify_seat_events()
+        _clear_seat_bitmaps(movie_id)
         return True, message
         
     except Exception as e:
@@ -678,14 +2054,34 @@ def clear_single_seat(movie_id, seat_number):
     cursor = connection.cursor()
     
     try:
+        connection.start_transaction()
+        cursor.execute("""
+            SELECT booking_id 
+            FROM nm_seats 
+            WHERE movie_id = %s 
+            AND seat_number = %s 
+            AND booking_date = CURDATE()
+        """, (movie_id, seat_number))
+        row = cursor.fetchone()
+        booking_id = row[0] if row else None
         cursor.execute("""
             DELETE FROM nm_seats 
             WHERE movie_id = %s 
             AND seat_number = %s 
             AND booking_date = CURDATE()
         """, (movie_id, seat_number))
+        if booking_id:
+            # Drop the booking once its last seat is gone
+            cursor.execute("""
+                DELETE FROM nm_bookings 
+                WHERE booking_id = %s 
+                AND NOT EXISTS (SELECT 1 FROM nm_seats WHERE booking_id = %s)
+            """, (booking_id, booking_id))
+        _log_seat_events(cursor, movie_id, [seat_number], 'cleared', booking_id)
             
         connection.commit()
+        _notify_seat_events()
+        _update_seat_bitmap(movie_id, cleared=[seat_number])
         return True, "Seat booking cleared successfully"
         
     except Exception as e:
@@ -697,6 +2093,190 @@ def clear_single_seat(movie_id, seat_number):
         cursor.close()
         connection.close()
 
+def _log_seat_events(cursor, movie_id, seat_numbers, action, booking_id=None):
+    """Append seat change events in the caller's transaction (one statement)."""
+    values = ", ".join(["(%s, %s, CURDATE(), %s, %s)"] * len(seat_numbers))
+    params = []
+    for seat in seat_numbers:
+        params.extend((movie_id, seat, action, booking_id))
+    cursor.execute(f"""
+        INSERT INTO nm_seat_events (movie_id, seat_number, booking_date, action, booking_id)
+        VALUES {values}
+    """, params)
+
+def get_latest_seat_event_id():
+    """Get the id of the newest seat event (0 if there are none)."""
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("SELECT COALESCE(MAX(event_id), 0) FROM nm_seat_events")
+        return cursor.fetchone()[0]
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+def get_seat_events_since(last_event_id, limit=500, missing_ids=()):
+    """
+    Get seat events newer than last_event_id, oldest first.
+
+    Args:
+        last_event_id (int): Newest event id already read
+        limit (int): Maximum number of events
+        missing_ids (iterable): Older ids to look for again (see SeatEventCursor)
+    """
+    missing_ids = list(missing_ids)
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
+    try:
+        query = """
+            SELECT event_id, movie_id, seat_number, booking_date, action, booking_id
+            FROM nm_seat_events 
+            WHERE event_id > %s
+        """
+        if missing_ids:
+            query += f" OR event_id IN ({', '.join(['%s'] * len(missing_ids))})"
+        cursor.execute(query + " ORDER BY event_id LIMIT %s",
+                       (last_event_id, *missing_ids, limit))
+        return cursor.fetchall()
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+class SeatEventCursor:
+    """
+    Read position in the nm_seat_events change feed.
+
+    Event ids come from AUTO_INCREMENT when the event is inserted, not when
+    its transaction commits, so two bookings can commit in the opposite
+    order of their ids. Reading only "event_id > last seen" would then skip
+    the one that commits last. The cursor remembers every id it has skipped
+    over and asks for those again on each fetch until they show up or
+    SEAT_EVENT_GAP_GRACE seconds pass (ids of rolled-back transactions
+    never appear).
+
+    Args:
+        last_event_id (int): Start after this id (default: the newest event)
+        gap_grace (float): Seconds a missing id is looked for
+    """
+
+    def __init__(self, last_event_id=None, gap_grace=None):
+        self.gap_grace = SEAT_EVENT_GAP_GRACE if gap_grace is None else gap_grace
+        self._gaps = {}  # missing event id -> monotonic time it was first missed
+        if last_event_id is None:
+            last_event_id = get_latest_seat_event_id()
+            # Transactions still open at start may own ids below the newest
+            self._add_gaps(self._recent_ids(last_event_id), max(0, last_event_id - 100))
+        self.last_event_id = last_event_id
+
+    def fetch(self, limit=500):
+        """
+        Read events committed since the last fetch, oldest id first.
+
+        Returns:
+            list: Event dicts
+        """
+        now = time.monotonic()
+        for event_id in [i for i, since in self._gaps.items() if now - since > self.gap_grace]:
+            del self._gaps[event_id]
+        events = get_seat_events_since(self.last_event_id, limit, sorted(self._gaps))
+        new_ids = []
+        for event in events:
+            if self._gaps.pop(event['event_id'], None) is None:
+                new_ids.append(event['event_id'])
+        if new_ids:
+            self._add_gaps(new_ids, self.last_event_id)
+            self.last_event_id = max(self.last_event_id, new_ids[-1])
+        return events
+
+    def retry(self, events):
+        """Return fetched events to the cursor, so the next fetch reads them again."""
+        now = time.monotonic()
+        for event in events:
+            self._gaps[event['event_id']] = now
+
+    def _add_gaps(self, ids, after):
+        # Every id between `after` and the newest of `ids` that is not in `ids`
+        now = time.monotonic()
+        expected = after + 1
+        for event_id in ids:
+            for missing in range(expected, event_id):
+                self._gaps.setdefault(missing, now)
+            expected = event_id + 1
+        while len(self._gaps) > SEAT_EVENT_MAX_GAPS:
+            del self._gaps[next(iter(self._gaps))]
+
+    @staticmethod
+    def _recent_ids(last_event_id):
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT event_id FROM nm_seat_events
+                WHERE event_id > %s AND event_id <= %s
+                ORDER BY event_id
+            """, (max(0, last_event_id - 100), last_event_id))
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            connection.close()
+
+def _notify_seat_events():
+    """Wake this process's feed waiters after committing seat events."""
+    global _seat_event_serial
+    with _seat_event_signal:
+        _seat_event_serial += 1
+        _seat_event_signal.notify_all()
+
+def wait_for_seat_events(cursor, timeout=25):
+    """
+    Wait for new seat events on a SeatEventCursor.
+
+    Blocks until at least one event arrives or `timeout` seconds pass.
+    Seat changes committed by this process wake the wait at once; changes
+    from other kiosks are found by polling, every SEAT_FEED_MIN_INTERVAL
+    seconds at first and backing off to SEAT_FEED_MAX_INTERVAL while the
+    feed stays idle. Each probe is a primary-key range scan. New events
+    are also applied to the in-memory seat bitmaps.
+
+    Returns:
+        list: Event dicts (empty on timeout)
+    """
+    deadline = time.monotonic() + timeout
+    interval = SEAT_FEED_MIN_INTERVAL
+    while True:
+        with _seat_event_signal:
+            serial = _seat_event_serial
+        events = cursor.fetch()
+        if events:
+            apply_seat_events(events)
+            return events
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return []
+        with _seat_event_signal:
+            if _seat_event_serial == serial:
+                _seat_event_signal.wait(min(interval, remaining))
+        interval = min(interval * 2, SEAT_FEED_MAX_INTERVAL)
+
+def apply_seat_events(events):
+    """Update cached seat bitmaps from change-feed events."""
+    today = _today()
+    for event in events:
+        if event['booking_date'] != today:
+            continue
+        if event['seat_number'] is None:
+            # Whole show cleared; it may also have moved to another screen
+            _clear_seat_bitmaps(event['movie_id'])
+            invalidate_show_seat_maps(event['movie_id'])
+        elif event['action'] == 'booked':
+            _update_seat_bitmap(event['movie_id'], booked=[event['seat_number']])
+        else:
+            _update_seat_bitmap(event['movie_id'], cleared=[event['seat_number']])
+
 def check_active_movies_for_date(show_date, exclude_movie_id=None):
     """Check number of active movies for a specific date."""
     connection = get_db_connection()
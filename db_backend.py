@@ -0,0 +1,661 @@
+import os
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+try:
+    import mysql.connector as mysql
+except ImportError:  # Only needed for the MySQL backend
+    mysql = None
+
+# Catch-all for driver errors from whichever backend is configured
+DatabaseError = (sqlite3.Error,) + ((mysql.Error,) if mysql is not None else ())
+
+# Tables in creation order (foreign keys point at earlier tables)
+TABLES = ('nm_users', 'nm_screens', 'nm_movies', 'nm_bookings', 'nm_seats',
+          'nm_seat_events', 'nm_seat_holds')
+
+MYSQL_SCHEMA = {
+    'nm_users': """
+    CREATE TABLE nm_users (
+        user_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        password VARCHAR(255) NOT NULL,
+        phone_number VARCHAR(15),
+        role ENUM('admin', 'customer') DEFAULT 'customer',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_user_created (created_at),
+        INDEX idx_user_role_created (role, created_at)
+    )
+    """,
+    # Auditoriums; layout names the seat map used by the screen's shows
+    'nm_screens': """
+    CREATE TABLE nm_screens (
+        screen_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(50) UNIQUE NOT NULL,
+        layout VARCHAR(50) NOT NULL DEFAULT 'standard',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB
+    """,
+    # One row per show: a title playing on one screen at one date and time
+    'nm_movies': """
+    CREATE TABLE nm_movies (
+        movie_id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(100) NOT NULL,
+        genre VARCHAR(50),
+        price DECIMAL(10,2) NOT NULL,
+        show_date DATE,
+        show_time TIME,
+        status ENUM('active', 'inactive') DEFAULT 'inactive',
+        screen_id INT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT fk_movie_screen
+            FOREIGN KEY (screen_id)
+            REFERENCES nm_screens(screen_id),
+        INDEX idx_movie_schedule (status, show_date, show_time),
+        INDEX idx_screen_schedule (screen_id, show_date, show_time),
+        INDEX idx_movie_date (show_date, show_time),
+        INDEX idx_movie_title (title),
+        INDEX idx_movie_genre (genre, show_date, show_time)
+    ) ENGINE=InnoDB
+    """,
+    # One row per booking (a ticket); booking_id is a ULID (booking_ids.py)
+    'nm_bookings': """
+    CREATE TABLE nm_bookings (
+        booking_id CHAR(26) PRIMARY KEY,
+        user_id INT NOT NULL,
+        movie_id INT NOT NULL,
+        booking_date DATE NOT NULL,
+        total_amount DECIMAL(10,2),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT fk_booking_user
+            FOREIGN KEY (user_id)
+            REFERENCES nm_users(user_id)
+            ON DELETE CASCADE,
+        CONSTRAINT fk_booking_movie
+            FOREIGN KEY (movie_id)
+            REFERENCES nm_movies(movie_id)
+            ON DELETE CASCADE,
+        INDEX idx_booking_user (user_id, created_at),
+        INDEX idx_booking_show (movie_id, booking_date)
+    ) ENGINE=InnoDB
+    """,
+    'nm_seats': """
+    CREATE TABLE nm_seats (
+        seat_id INT AUTO_INCREMENT PRIMARY KEY,
+        movie_id INT,
+        user_id INT,
+        booking_id CHAR(26) NULL,
+        seat_number VARCHAR(3) NOT NULL,
+        booking_date DATE NOT NULL,
+        CONSTRAINT fk_movie
+            FOREIGN KEY (movie_id)
+            REFERENCES nm_movies(movie_id)
+            ON DELETE CASCADE,
+        CONSTRAINT fk_user
+            FOREIGN KEY (user_id)
+            REFERENCES nm_users(user_id)
+            ON DELETE CASCADE,
+        CONSTRAINT fk_seat_booking
+            FOREIGN KEY (booking_id)
+            REFERENCES nm_bookings(booking_id)
+            ON DELETE CASCADE,
+        UNIQUE KEY unique_seat (movie_id, seat_number, booking_date),
+        INDEX idx_seat_booking (booking_id)
+    ) ENGINE=InnoDB
+    """,
+    # Change feed: every booking or clearing appends a row to nm_seat_events.
+    # movie_id NULL means "all movies", seat_number NULL means "whole show".
+    'nm_seat_events': """
+    CREATE TABLE nm_seat_events (
+        event_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        movie_id INT NULL,
+        seat_number VARCHAR(3) NULL,
+        booking_date DATE NOT NULL,
+        action ENUM('booked', 'cleared') NOT NULL,
+        booking_id CHAR(26) NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_event_date (booking_date)
+    ) ENGINE=InnoDB
+    """,
+    # Short-lived seat reservations while a customer is choosing seats.
+    # Rows past expires_at are ignored and swept in bulk.
+    'nm_seat_holds': """
+    CREATE TABLE nm_seat_holds (
+        movie_id INT NOT NULL,
+        booking_date DATE NOT NULL,
+        seat_number VARCHAR(3) NOT NULL,
+        holder VARCHAR(32) NOT NULL,
+        user_id INT NULL,
+        expires_at DATETIME NOT NULL,
+        PRIMARY KEY (movie_id, booking_date, seat_number),
+        CONSTRAINT fk_hold_movie
+            FOREIGN KEY (movie_id)
+            REFERENCES nm_movies(movie_id)
+            ON DELETE CASCADE,
+        CONSTRAINT fk_hold_user
+            FOREIGN KEY (user_id)
+            REFERENCES nm_users(user_id)
+            ON DELETE CASCADE,
+        INDEX idx_hold_expiry (expires_at)
+    ) ENGINE=InnoDB
+    """,
+}
+
+# Same tables for SQLite: ENUMs become CHECK constraints, secondary
+# indexes are separate statements (run in order after the table)
+SQLITE_SCHEMA = {
+    'nm_users': ["""
+    CREATE TABLE nm_users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(100) NOT NULL,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        password VARCHAR(255) NOT NULL,
+        phone_number VARCHAR(15),
+        role TEXT DEFAULT 'customer' CHECK (role IN ('admin', 'customer')),
+        created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+    )
+    """, """
+    CREATE INDEX idx_user_created ON nm_users (created_at)
+    """, """
+    CREATE INDEX idx_user_role_created ON nm_users (role, created_at)
+    """],
+    'nm_screens': ["""
+    CREATE TABLE nm_screens (
+        screen_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(50) UNIQUE NOT NULL,
+        layout VARCHAR(50) NOT NULL DEFAULT 'standard',
+        created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+    )
+    """],
+    'nm_movies': ["""
+    CREATE TABLE nm_movies (
+        movie_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title VARCHAR(100) NOT NULL,
+        genre VARCHAR(50),
+        price DECIMAL(10,2) NOT NULL,
+        show_date DATE,
+        show_time TIME,
+        status TEXT DEFAULT 'inactive' CHECK (status IN ('active', 'inactive')),
+        screen_id INTEGER NULL REFERENCES nm_screens(screen_id),
+        created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+    )
+    """, """
+    CREATE INDEX idx_movie_schedule ON nm_movies (status, show_date, show_time)
+    """, """
+    CREATE INDEX idx_screen_schedule ON nm_movies (screen_id, show_date, show_time)
+    """, """
+    CREATE INDEX idx_movie_date ON nm_movies (show_date, show_time)
+    """, """
+    CREATE INDEX idx_movie_title ON nm_movies (title)
+    """, """
+    CREATE INDEX idx_movie_genre ON nm_movies (genre, show_date, show_time)
+    """],
+    'nm_bookings': ["""
+    CREATE TABLE nm_bookings (
+        booking_id CHAR(26) PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES nm_users(user_id) ON DELETE CASCADE,
+        movie_id INTEGER NOT NULL REFERENCES nm_movies(movie_id) ON DELETE CASCADE,
+        booking_date DATE NOT NULL,
+        total_amount DECIMAL(10,2),
+        created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+    )
+    """, """
+    CREATE INDEX idx_booking_user ON nm_bookings (user_id, created_at)
+    """, """
+    CREATE INDEX idx_booking_show ON nm_bookings (movie_id, booking_date)
+    """],
+    'nm_seats': ["""
+    CREATE TABLE nm_seats (
+        seat_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        movie_id INTEGER REFERENCES nm_movies(movie_id) ON DELETE CASCADE,
+        user_id INTEGER REFERENCES nm_users(user_id) ON DELETE CASCADE,
+        booking_id CHAR(26) NULL REFERENCES nm_bookings(booking_id) ON DELETE CASCADE,
+        seat_number VARCHAR(3) NOT NULL,
+        booking_date DATE NOT NULL,
+        CONSTRAINT unique_seat UNIQUE (movie_id, seat_number, booking_date)
+    )
+    """, """
+    CREATE INDEX idx_seat_booking ON nm_seats (booking_id)
+    """],
+    'nm_seat_events': ["""
+    CREATE TABLE nm_seat_events (
+        event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        movie_id INTEGER NULL,
+        seat_number VARCHAR(3) NULL,
+        booking_date DATE NOT NULL,
+        action TEXT NOT NULL CHECK (action IN ('booked', 'cleared')),
+        booking_id CHAR(26) NULL,
+        created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+    )
+    """, """
+    CREATE INDEX idx_event_date ON nm_seat_events (booking_date)
+    """],
+    'nm_seat_holds': ["""
+    CREATE TABLE nm_seat_holds (
+        movie_id INTEGER NOT NULL REFERENCES nm_movies(movie_id) ON DELETE CASCADE,
+        booking_date DATE NOT NULL,
+        seat_number VARCHAR(3) NOT NULL,
+        holder VARCHAR(32) NOT NULL,
+        user_id INTEGER NULL REFERENCES nm_users(user_id) ON DELETE CASCADE,
+        expires_at DATETIME NOT NULL,
+        PRIMARY KEY (movie_id, booking_date, seat_number)
+    )
+    """, """
+    CREATE INDEX idx_hold_expiry ON nm_seat_holds (expires_at)
+    """],
+}
+
+# Columns added after the first release, with the statements that add them
+# to an existing table (run by database.create_database on upgrade)
+MYSQL_ADDED_COLUMNS = {
+    ('nm_movies', 'screen_id'): ["""
+    ALTER TABLE nm_movies
+        ADD COLUMN screen_id INT NULL AFTER status,
+        ADD INDEX idx_movie_schedule (status, show_date, show_time),
+        ADD INDEX idx_screen_schedule (screen_id, show_date, show_time),
+        ADD CONSTRAINT fk_movie_screen
+            FOREIGN KEY (screen_id)
+            REFERENCES nm_screens(screen_id)
+    """],
+    ('nm_seats', 'booking_id'): ["""
+    ALTER TABLE nm_seats
+        ADD COLUMN booking_id CHAR(26) NULL AFTER user_id,
+        ADD INDEX idx_seat_booking (booking_id),
+        ADD CONSTRAINT fk_seat_booking
+            FOREIGN KEY (booking_id)
+            REFERENCES nm_bookings(booking_id)
+            ON DELETE CASCADE
+    """],
+    ('nm_seat_events', 'booking_id'): ["""
+    ALTER TABLE nm_seat_events ADD COLUMN booking_id CHAR(26) NULL
+    """],
+}
+
+SQLITE_ADDED_COLUMNS = {
+    ('nm_movies', 'screen_id'): ["""
+    ALTER TABLE nm_movies ADD COLUMN
+        screen_id INTEGER NULL REFERENCES nm_screens(screen_id)
+    """, """
+    CREATE INDEX idx_movie_schedule ON nm_movies (status, show_date, show_time)
+    """, """
+    CREATE INDEX idx_screen_schedule ON nm_movies (screen_id, show_date, show_time)
+    """],
+    ('nm_seats', 'booking_id'): ["""
+    ALTER TABLE nm_seats ADD COLUMN
+        booking_id CHAR(26) NULL REFERENCES nm_bookings(booking_id) ON DELETE CASCADE
+    """, """
+    CREATE INDEX idx_seat_booking ON nm_seats (booking_id)
+    """],
+    ('nm_seat_events', 'booking_id'): ["""
+    ALTER TABLE nm_seat_events ADD COLUMN booking_id CHAR(26) NULL
+    """],
+}
+
+# (table, column) pairs in upgrade order
+ADDED_COLUMNS = tuple(MYSQL_ADDED_COLUMNS)
+
+# Indexes added to existing tables after the first release
+MYSQL_ADDED_INDEXES = {
+    ('nm_users', 'idx_user_created'):
+        "CREATE INDEX idx_user_created ON nm_users (created_at)",
+    ('nm_users', 'idx_user_role_created'):
+        "CREATE INDEX idx_user_role_created ON nm_users (role, created_at)",
+    ('nm_movies', 'idx_movie_date'):
+        "CREATE INDEX idx_movie_date ON nm_movies (show_date, show_time)",
+    ('nm_movies', 'idx_movie_title'):
+        "CREATE INDEX idx_movie_title ON nm_movies (title)",
+    ('nm_movies', 'idx_movie_genre'):
+        "CREATE INDEX idx_movie_genre ON nm_movies (genre, show_date, show_time)",
+}
+
+SQLITE_ADDED_INDEXES = dict(MYSQL_ADDED_INDEXES)
+
+# (table, index) pairs in upgrade order
+ADDED_INDEXES = tuple(MYSQL_ADDED_INDEXES)
+
+
+def create_backend():
+    """
+    Create the storage backend selected by the environment.
+
+    DB_BACKEND picks the engine: 'mysql' (default) or 'sqlite'.
+
+    MySQL settings: DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
+    SQLite settings: DB_SQLITE_PATH (database file, default nova_movie.db)
+    """
+    name = os.getenv("DB_BACKEND", "mysql").strip().lower()
+    if name == "mysql":
+        return MySQLBackend(
+            host=os.getenv("DB_HOST", "localhost"),
+            port=int(os.getenv("DB_PORT", "3306")),
+            user=os.getenv("DB_USER", "root"),
+            password=os.getenv("DB_PASSWORD", "bhagyesh123"),
+            database=os.getenv("DB_NAME", "nova_movie")
+        )
+    if name == "sqlite":
+        return SQLiteBackend(os.getenv("DB_SQLITE_PATH", "nova_movie.db"))
+    raise ValueError(f"Unknown DB_BACKEND '{name}' (expected 'mysql' or 'sqlite')")
+
+
+class MySQLBackend:
+    """
+    MySQL / MariaDB storage through mysql-connector.
+
+    Connections are plain mysql-connector connections in autocommit mode;
+    callers use connection.start_transaction() for multi-statement writes.
+    """
+
+    name = "mysql"
+
+    def __init__(self, host="localhost", port=3306, user="root", password="",
+                 database="nova_movie"):
+        if mysql is None:
+            raise ImportError("mysql-connector-python is required for DB_BACKEND=mysql")
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.database = database
+        self.Error = mysql.Error
+
+    def connect(self):
+        """Open a connection to the application database."""
+        return self._connect(database=self.database)
+
+    def connect_server(self):
+        """Open a connection to the server without selecting a database."""
+        return self._connect()
+
+    def create_database(self, cursor):
+        """Create the application database if needed and switch to it."""
+        cursor.execute("SHOW DATABASES LIKE %s", (self.database,))
+        created = not cursor.fetchone()
+        if created:
+            cursor.execute(f"CREATE DATABASE `{self.database}`")
+        cursor.execute(f"USE `{self.database}`")
+        return created
+
+    def table_exists(self, cursor, table):
+        cursor.execute("SHOW TABLES LIKE %s", (table,))
+        return cursor.fetchone() is not None
+
+    def create_table(self, cursor, table):
+        cursor.execute(MYSQL_SCHEMA[table])
+
+    def column_exists(self, cursor, table, column):
+        cursor.execute(f"SHOW COLUMNS FROM `{table}` LIKE %s", (column,))
+        return cursor.fetchone() is not None
+
+    def add_column(self, cursor, table, column):
+        for statement in MYSQL_ADDED_COLUMNS[(table, column)]:
+            cursor.execute(statement)
+
+    def index_exists(self, cursor, table, index):
+        cursor.execute(f"SHOW INDEX FROM `{table}` WHERE Key_name = %s", (index,))
+        return bool(cursor.fetchall())
+
+    def add_index(self, cursor, table, index):
+        cursor.execute(MYSQL_ADDED_INDEXES[(table, index)])
+
+    def is_duplicate_key(self, err):
+        return getattr(err, 'errno', None) == mysql.errorcode.ER_DUP_ENTRY
+
+    def is_missing_database(self, err):
+        return getattr(err, 'errno', None) == mysql.errorcode.ER_BAD_DB_ERROR
+
+    def is_missing_table(self, err):
+        return getattr(err, 'errno', None) == mysql.errorcode.ER_NO_SUCH_TABLE
+
+    def is_foreign_key_error(self, err):
+        return getattr(err, 'errno', None) == mysql.errorcode.ER_NO_REFERENCED_ROW_2
+
+    def describe_connect_error(self, err):
+        """Turn a connection error into a troubleshooting message."""
+        if err.errno == mysql.errorcode.CR_CONN_HOST_ERROR or err.errno == 2003:
+            return (
+                "\n[ERROR] Could not connect to MySQL server:"
+                "\n1. Check if MySQL service is running"
+                "\n2. Verify MySQL is installed correctly"
+                f"\n3. Check if port {self.port} is not blocked"
+                f"\nError details: {err}"
+            )
+        if err.errno == mysql.errorcode.ER_ACCESS_DENIED_ERROR:
+            return (
+                "\n[ERROR] Access denied:"
+                f"\n1. Username '{self.user}' might be incorrect"
+                "\n2. Password might be wrong (set DB_PASSWORD)"
+                "\n3. User might not have required permissions"
+                f"\nError details: {err}"
+            )
+        return f"\n[ERROR] Unexpected MySQL error: {err}"
+
+    def _connect(self, **kwargs):
+        return mysql.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            autocommit=True,
+            connect_timeout=5,
+            use_pure=True,
+            **kwargs
+        )
+
+
+class SQLiteBackend:
+    """
+    Embedded SQLite storage for kiosks, local development and tests.
+
+    The database file is opened in WAL mode so readers (seat grids, the
+    change feed) never block the writer, with foreign keys enforced like
+    InnoDB does. Connections are wrapped in SQLiteConnection, which accepts
+    the same SQL and call style as mysql-connector, so database.py and the
+    UI code run unchanged on either engine.
+
+    Args:
+        path (str): Database file (':memory:' is not shared between
+            pooled connections; use a file, e.g. in a temp dir, for tests)
+        busy_timeout (float): Seconds a writer waits for the write lock
+    """
+
+    name = "sqlite"
+    Error = sqlite3.Error
+
+    def __init__(self, path="nova_movie.db", busy_timeout=5):
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+    def connect(self):
+        """Open a connection to the database file (created if missing)."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        raw = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,       # autocommit, like the MySQL connections
+            check_same_thread=False     # pooled connections move between threads
+        )
+        raw.execute("PRAGMA journal_mode=WAL")
+        raw.execute("PRAGMA synchronous=NORMAL")
+        raw.execute("PRAGMA foreign_keys=ON")
+        return SQLiteConnection(raw)
+
+    def connect_server(self):
+        # There is no server; the "database" is the file itself
+        return self.connect()
+
+    def create_database(self, cursor):
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master")
+        return cursor.fetchone()[0] == 0
+
+    def table_exists(self, cursor, table):
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s",
+            (table,)
+        )
+        return cursor.fetchone() is not None
+
+    def create_table(self, cursor, table):
+        for statement in SQLITE_SCHEMA[table]:
+            cursor.execute(statement)
+
+    def column_exists(self, cursor, table, column):
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in cursor.fetchall())
+
+    def add_column(self, cursor, table, column):
+        for statement in SQLITE_ADDED_COLUMNS[(table, column)]:
+            cursor.execute(statement)
+
+    def index_exists(self, cursor, table, index):
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s",
+            (table, index)
+        )
+        return cursor.fetchone() is not None
+
+    def add_index(self, cursor, table, index):
+        cursor.execute(SQLITE_ADDED_INDEXES[(table, index)])
+
+    def is_duplicate_key(self, err):
+        return isinstance(err, sqlite3.IntegrityError) and "UNIQUE" in str(err)
+
+    def is_missing_database(self, err):
+        return False
+
+    def is_missing_table(self, err):
+        return isinstance(err, sqlite3.OperationalError) and "no such table" in str(err)
+
+    def is_foreign_key_error(self, err):
+        return isinstance(err, sqlite3.IntegrityError) and "FOREIGN KEY" in str(err)
+
+    def describe_connect_error(self, err):
+        return (
+            f"\n[ERROR] Could not open SQLite database '{self.path}':"
+            "\n1. Check that the folder exists and is writable"
+            "\n2. Check that no other program holds an exclusive lock"
+            f"\nError details: {err}"
+        )
+
+
+# MySQL-only SQL used by database.py and the UI, rewritten for SQLite
+_SQLITE_REWRITES = [
+    (re.compile(r"\bNOW\(\)\s*\+\s*INTERVAL\s+%s\s+SECOND\b", re.IGNORECASE),
+     "datetime('now', 'localtime', '+' || %s || ' seconds')"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bCURDATE\(\)", re.IGNORECASE), "date('now', 'localtime')"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+    # Row locks: BEGIN IMMEDIATE already holds the database write lock
+    (re.compile(r"\s+FOR\s+(UPDATE|SHARE)\b", re.IGNORECASE), ""),
+]
+_translated = {}
+
+
+def translate_sql(sql):
+    """Rewrite a MySQL-style statement for SQLite (cached per statement)."""
+    translated = _translated.get(sql)
+    if translated is None:
+        translated = sql
+        for pattern, replacement in _SQLITE_REWRITES:
+            translated = pattern.sub(replacement, translated)
+        _translated[sql] = translated
+    return translated
+
+
+class SQLiteCursor:
+    """sqlite3 cursor with mysql-connector call conventions."""
+
+    def __init__(self, raw_cursor, dictionary=False):
+        self._cursor = raw_cursor
+        if dictionary:
+            raw_cursor.row_factory = _dict_row
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(translate_sql(sql), tuple(params or ()))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate_sql(sql), [tuple(p) for p in seq_of_params])
+        return self
+
+    def __getattr__(self, name):
+        # fetchone, fetchall, fetchmany, rowcount, lastrowid, description
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """sqlite3 connection with the subset of the mysql-connector API the app uses."""
+
+    def __init__(self, raw_connection):
+        self._conn = raw_connection
+        self._closed = False
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self._conn.cursor(), dictionary=dictionary)
+
+    def start_transaction(self):
+        # IMMEDIATE takes the write lock up front, so two kiosks booking at
+        # once queue on busy_timeout instead of failing mid-transaction
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def is_connected(self):
+        if self._closed:
+            return False
+        try:
+            self._conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        self._closed = True
+        self._conn.close()
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _convert_time(value):
+    # MySQL returns TIME columns as timedelta; do the same for SQLite
+    parts = value.decode().split(':')
+    hours, minutes = int(parts[0]), int(parts[1])
+    seconds = float(parts[2]) if len(parts) > 2 else 0
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def _adapt_timedelta(value):
+    total = int(value.total_seconds())
+    return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(timedelta, _adapt_timedelta)
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter("TIME", _convert_time)
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+# The schema only uses DECIMAL(10,2) (prices), returned like MySQL does
+sqlite3.register_converter("DECIMAL", lambda value: Decimal(value.decode()).quantize(Decimal("0.01")))
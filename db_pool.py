@@ -0,0 +1,292 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection becomes free before the checkout timeout."""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a driver connection checked out from a ConnectionPool.
+
+    Everything except close() is forwarded to the real connection, so existing
+    code that does `connection = get_db_connection() ... connection.close()`
+    keeps working: close() simply hands the connection back to the pool.
+    """
+
+    def __init__(self, pool, raw_connection):
+        self._pool = pool
+        self._raw = raw_connection
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise AttributeError(f"Connection already returned to pool (accessing '{name}')")
+        return getattr(self._raw, name)
+
+    def close(self):
+        """Return the connection to the pool instead of closing it."""
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+
+    def discard(self):
+        """Really close the connection, e.g. after a fatal driver error."""
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw, discard=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """
+    Bounded pool of reusable database connections.
+
+    Args:
+        connect: Callable returning a new driver connection (or None on failure)
+        size (int): Maximum number of open connections
+        min_idle (int): Idle connections kept warm even when unused
+        checkout_timeout (float): Seconds to wait for a free connection
+        idle_timeout (float): Idle connections older than this are closed
+        health_check_interval (float): Connections idle longer than this are
+            pinged before being handed out
+        ping: Callable(connection) -> bool used for health checks
+
+    Features:
+    - LIFO reuse so the warmest connection is handed out first
+    - Health check before reuse of long-idle connections
+    - Idle eviction down to min_idle
+    - Rollback of unfinished transactions on release
+    - Metrics for checkouts, waits and handshake time (see stats())
+    """
+
+    def __init__(self, connect, size=5, min_idle=1, checkout_timeout=10,
+                 idle_timeout=300, health_check_interval=30, ping=None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._connect = connect
+        self._ping = ping or _default_ping
+        self.size = size
+        self.min_idle = min(min_idle, size)
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = []          # list of (connection, last_used) - used as a stack
+        self._open_count = 0
+        self._closed = False
+        self._metrics = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'timeouts': 0,
+            'connects': 0,
+            'connect_failures': 0,
+            'handshake_time_total': 0.0,
+            'handshake_time_max': 0.0,
+            'health_checks': 0,
+            'health_check_failures': 0,
+            'evictions': 0,
+            'discards': 0,
+        }
+
+    def acquire(self, timeout=None):
+        """
+        Check out a connection.
+
+        Returns:
+            PooledConnection: Proxy whose close() returns it to the pool
+            None: If a new connection was needed and could not be opened
+
+        Raises:
+            PoolExhaustedError: If the pool stayed full for `timeout` seconds
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        wait_started = None
+
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                expired = self._evict_idle_locked()
+
+                if self._idle:
+                    raw, last_used = self._idle.pop()
+                elif self._open_count < self.size:
+                    self._open_count += 1
+                    raw, last_used = None, None
+                else:
+                    if not waited:
+                        waited = True
+                        wait_started = time.monotonic()
+                        self._metrics['waits'] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics['timeouts'] += 1
+                        self._metrics['wait_time_total'] += time.monotonic() - wait_started
+                        raise PoolExhaustedError(
+                            f"No database connection available after {timeout}s "
+                            f"(pool size {self.size})"
+                        )
+                    # Nothing was evicted on this pass (eviction frees a slot)
+                    self._available.wait(remaining)
+                    continue
+
+                if waited:
+                    self._metrics['wait_time_total'] += time.monotonic() - wait_started
+
+            for stale in expired:
+                self._close_raw(stale)
+
+            if raw is None:
+                # Slot reserved above; open the connection outside the lock
+                raw = self._open_connection()
+                if raw is None:
+                    return None
+            elif time.monotonic() - last_used > self.health_check_interval:
+                if not self._check_health(raw):
+                    self._close_raw(raw)
+                    with self._lock:
+                        self._open_count -= 1
+                        self._metrics['discards'] += 1
+                        self._available.notify()
+                    continue
+
+            with self._lock:
+                self._metrics['checkouts'] += 1
+            return PooledConnection(self, raw)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager checkout: `with pool.connection() as conn: ...`"""
+        conn = self.acquire(timeout)
+        if conn is None:
+            raise ConnectionError("Failed to establish database connection")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def release(self, raw, discard=False):
+        """Return a raw connection to the pool (called by PooledConnection)."""
+        if not discard and getattr(raw, 'in_transaction', False):
+            try:
+                raw.rollback()
+            except Exception:
+                discard = True
+
+        with self._lock:
+            if discard or self._closed:
+                self._open_count -= 1
+                self._metrics['discards'] += 1
+                self._available.notify()
+            else:
+                self._idle.append((raw, time.monotonic()))
+                self._available.notify()
+                raw = None
+
+        if raw is not None:
+            self._close_raw(raw)
+
+    def stats(self):
+        """Return a snapshot of pool metrics."""
+        with self._lock:
+            stats = dict(self._metrics)
+            stats['size'] = self.size
+            stats['open'] = self._open_count
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._open_count - len(self._idle)
+        connects = stats['connects'] or 1
+        stats['handshake_time_avg'] = stats['handshake_time_total'] / connects
+        return stats
+
+    def close(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open_count -= len(idle)
+            self._available.notify_all()
+        for raw, _ in idle:
+            self._close_raw(raw)
+
+    def _open_connection(self):
+        started = time.monotonic()
+        try:
+            raw = self._connect()
+        except Exception:
+            raw = None
+        elapsed = time.monotonic() - started
+
+        with self._lock:
+            if raw is None:
+                self._open_count -= 1
+                self._metrics['connect_failures'] += 1
+                self._available.notify()
+            else:
+                self._metrics['connects'] += 1
+                self._metrics['handshake_time_total'] += elapsed
+                self._metrics['handshake_time_max'] = max(
+                    self._metrics['handshake_time_max'], elapsed)
+        return raw
+
+    def _check_health(self, raw):
+        with self._lock:
+            self._metrics['health_checks'] += 1
+        try:
+            healthy = self._ping(raw)
+        except Exception:
+            healthy = False
+        if not healthy:
+            with self._lock:
+                self._metrics['health_check_failures'] += 1
+        return healthy
+
+    def _evict_idle_locked(self):
+        """
+        Detach connections idle for longer than idle_timeout (lock held).
+
+        Returns the detached connections so the caller can close them
+        after releasing the lock.
+        """
+        if len(self._idle) <= self.min_idle:
+            return []
+        now = time.monotonic()
+        # Oldest connections sit at the bottom of the stack
+        keep_from = 0
+        excess = len(self._idle) - self.min_idle
+        while keep_from < excess and now - self._idle[keep_from][1] > self.idle_timeout:
+            keep_from += 1
+        if keep_from:
+            expired = self._idle[:keep_from]
+            del self._idle[:keep_from]
+            self._open_count -= len(expired)
+            self._metrics['evictions'] += len(expired)
+            return [raw for raw, _ in expired]
+        return []
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+def _default_ping(raw):
+    """Ask the driver whether the server connection is still alive."""
+    is_connected = getattr(raw, 'is_connected', None)
+    if is_connected is None:
+        return True
+    return is_connected()
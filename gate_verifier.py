@@ -0,0 +1,394 @@
+"""
+Offline ticket verification for the cinema doors.
+
+Loads today's bookings into memory once, then verifies scanned ticket QR
+codes without touching the database: the signature is checked locally
+(see ticket_qr), the booking is looked up in an in-memory index and the
+entry is recorded so a ticket cannot be used twice. A background thread
+follows the nm_seat_events change feed to pick up new bookings and
+cleared seats.
+
+Usage:
+    python gate_verifier.py serve --port 8765     # local HTTP service
+    python gate_verifier.py scan                  # read codes from stdin
+
+HTTP API (JSON responses):
+    POST /verify            body = scanned text; marks entry if valid
+    GET  /verify?code=...   same, for simple scanner integrations
+    GET  /verify?code=...&dry_run=1   check without marking entry
+    GET  /stats             index size, scan counters, last sync
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import database
+from ticket_qr import InvalidTicketError, SigningKeyError, get_signing_key, verify_ticket_payload
+
+VALID = 'valid'
+INVALID = 'invalid'
+ALREADY_USED = 'already_used'
+WRONG_DATE = 'wrong_date'
+NOT_BOOKED = 'not_booked'
+
+
+class TicketVerifier:
+    """
+    In-memory index of today's bookings for gate scanning.
+
+    The index maps each booking id to its show and a bitmap of the seats
+    it still holds (in the show's seat map layout, as in the QR payload), so
+    checking a ticket is one dict lookup and one AND. Seats booked before
+    nm_bookings existed have no booking id; they are kept in a per-movie
+    bitmap instead. Entries are tracked as a second bitmap per movie plus
+    the set of used booking ids.
+
+    Args:
+        sync_interval (float): Seconds between change-feed polls
+        journal_path (str): Optional file where entries are appended, so a
+            restarted verifier still rejects tickets already used today
+    """
+
+    def __init__(self, sync_interval=2.0, journal_path=None):
+        self.sync_interval = sync_interval
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._date = None
+        self._bookings = {}        # booking_id -> [movie_id, bitmap of its seats]
+        self._legacy = {}          # movie_id -> bitmap of seats without a booking id
+        self._entered = {}         # movie_id -> bitmap of seats already admitted
+        self._used_booking_ids = set()
+        self._seat_maps = {}       # movie_id -> SeatMap of the show's screen
+        self._event_cursor = None
+        self._last_sync = None
+        self._counters = {status: 0 for status in
+                          (VALID, INVALID, ALREADY_USED, WRONG_DATE, NOT_BOOKED)}
+
+    def load(self):
+        """(Re)load today's bookings from the database and the entry journal."""
+        # Read the feed position first: events that arrive during the load
+        # are replayed by the next sync, and replaying them is harmless
+        event_cursor = database.SeatEventCursor()
+        rows = database.get_todays_booked_seats()
+        # Seat maps are resolved now, so scans never need the database
+        show_ids = {show['movie_id'] for show in database.get_active_movies_for_date(None)}
+        show_ids.update(movie_id for movie_id, _, _ in rows)
+        seat_maps = {movie_id: database.get_show_seat_map(movie_id) for movie_id in show_ids}
+
+        bookings = {}
+        legacy = {}
+        for movie_id, seat_number, booking_id in rows:
+            try:
+                bit = 1 << seat_maps[movie_id].index(seat_number)
+            except ValueError as e:
+                # As in sync(): one bad row must not stop the verifier starting
+                print(f"[ERROR] Skipping booked seat {seat_number} of show {movie_id}: {e}")
+                continue
+            if booking_id:
+                bookings.setdefault(booking_id, [movie_id, 0])[1] |= bit
+            else:
+                legacy[movie_id] = legacy.get(movie_id, 0) | bit
+
+        with self._lock:
+            self._date = datetime.date.today()
+            self._bookings = bookings
+            self._legacy = legacy
+            self._entered = {}
+            self._used_booking_ids = set()
+            self._seat_maps = seat_maps
+            self._event_cursor = event_cursor
+            self._last_sync = time.time()
+            self._load_journal_locked()
+        print(f"[+] Gate index loaded: {len(rows)} booked seats in {len(bookings)} bookings")
+
+    def start(self):
+        """Load the index and start following the change feed."""
+        self.load()
+        self._thread = threading.Thread(target=self._run, name="gate-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def verify(self, payload, mark_entry=True):
+        """
+        Verify a scanned QR payload.
+
+        Args:
+            payload (str): Text read from the ticket QR code
+            mark_entry (bool): Record the entry if the ticket is valid
+
+        Returns:
+            dict: status (valid, invalid, already_used, wrong_date,
+            not_booked), message, and the ticket fields when the code
+            itself could be read
+        """
+        try:
+            ticket = verify_ticket_payload(payload.strip(), seat_maps=self._seat_maps)
+        except InvalidTicketError as e:
+            with self._lock:
+                self._counters[INVALID] += 1
+            return _result(INVALID, str(e))
+
+        with self._lock:
+            status, message = self._check_locked(ticket, mark_entry)
+            self._counters[status] += 1
+        return _result(status, message, ticket)
+
+    def sync(self):
+        """Apply new change-feed events to the index (called by the sync thread)."""
+        if datetime.date.today() != self._date:
+            self.load()  # New day: start from a fresh index
+            return
+
+        events = self._event_cursor.fetch()
+        # Shows activated after the last load, and cleared shows (which may
+        # have moved to another screen); resolved before taking the lock
+        cleared_shows = {event['movie_id'] for event in events
+                         if event['seat_number'] is None and event['movie_id'] is not None}
+        new_shows = {event['movie_id'] for event in events
+                     if event['seat_number'] is not None and event['movie_id'] not in self._seat_maps}
+        new_shows |= cleared_shows
+        for movie_id in cleared_shows:
+            database.invalidate_show_seat_maps(movie_id)
+        try:
+            seat_maps = {movie_id: database.get_show_seat_map(movie_id) for movie_id in new_shows}
+        except Exception:
+            self._event_cursor.retry(events)  # Read them again on the next sync
+            raise
+        with self._lock:
+            self._seat_maps.update(seat_maps)
+            for event in events:
+                try:
+                    self._apply_event_locked(event)
+                except ValueError as e:
+                    # e.g. a seat the show's seat map does not have; one bad
+                    # event must not stop the index from following the feed
+                    print(f"[ERROR] Skipping seat event {event['event_id']}: {e}")
+            self._last_sync = time.time()
+
+    def stats(self):
+        with self._lock:
+            shows = {movie_id for movie_id, _ in self._bookings.values()}
+            shows.update(movie_id for movie_id, bitmap in self._legacy.items() if bitmap)
+            return {
+                'date': str(self._date),
+                'shows': len(shows),
+                'bookings': len(self._bookings),
+                'booked_seats': sum(bin(b).count("1") for _, b in self._bookings.values())
+                                + sum(bin(b).count("1") for b in self._legacy.values()),
+                'admitted_seats': sum(bin(b).count("1") for b in self._entered.values()),
+                'last_event_id': self._event_cursor.last_event_id if self._event_cursor else 0,
+                'last_sync': self._last_sync,
+                'scans': dict(self._counters),
+            }
+
+    def _check_locked(self, ticket, mark_entry):
+        """Check a decoded ticket against the index (lock held)."""
+        movie_id = ticket['movie_id']
+        seats = ticket['seat_bitmap']
+        if ticket['show_date'] != self._date:
+            return WRONG_DATE, f"Ticket is for {ticket['show_date']}"
+        booking = self._bookings.get(ticket['booking_id'])
+        if booking and booking[0] == movie_id:
+            held = booking[1]
+        elif booking:
+            return NOT_BOOKED, "Ticket does not match its booking"
+        else:
+            held = self._legacy.get(movie_id, 0)
+        missing = seats & ~held
+        if missing:
+            missing_seats = ', '.join(database.bitmap_to_seats(missing, self._seat_maps.get(movie_id)))
+            return NOT_BOOKED, f"Seat(s) {missing_seats} not booked for this show"
+        if (ticket['booking_id'] in self._used_booking_ids
+                or seats & self._entered.get(movie_id, 0)):
+            return ALREADY_USED, "Ticket already used"
+        if mark_entry:
+            self._entered[movie_id] = self._entered.get(movie_id, 0) | seats
+            self._used_booking_ids.add(ticket['booking_id'])
+            self._append_journal_locked(ticket)
+        return VALID, "Welcome"
+
+    def _apply_event_locked(self, event):
+        if event['booking_date'] != self._date:
+            return
+        movie_id = event['movie_id']
+        booking_id = event.get('booking_id')
+        if event['seat_number'] is None:
+            # Whole show (or every show) cleared
+            for key, booking in list(self._bookings.items()):
+                if movie_id is None or booking[0] == movie_id:
+                    del self._bookings[key]
+            for key in set(self._legacy) | set(self._entered):
+                if movie_id is None or key == movie_id:
+                    self._legacy.pop(key, None)
+                    self._entered.pop(key, None)
+            return
+        bit = 1 << self._seat_maps[movie_id].index(event['seat_number'])
+        if event['action'] == 'booked':
+            if booking_id:
+                self._bookings.setdefault(booking_id, [movie_id, 0])[1] |= bit
+            else:
+                self._legacy[movie_id] = self._legacy.get(movie_id, 0) | bit
+            return
+        # A cleared seat can be sold again, so forget its entry too
+        booking = self._bookings.get(booking_id)
+        if booking:
+            booking[1] &= ~bit
+            if not booking[1]:
+                del self._bookings[booking_id]
+        self._legacy[movie_id] = self._legacy.get(movie_id, 0) & ~bit
+        self._entered[movie_id] = self._entered.get(movie_id, 0) & ~bit
+
+    def _run(self):
+        while not self._stop.wait(self.sync_interval):
+            try:
+                self.sync()
+            except Exception as e:
+                # Keep verifying from the last good index while offline
+                print(f"[ERROR] Gate sync failed: {e}")
+
+    def _append_journal_locked(self, ticket):
+        if not self.journal_path:
+            return
+        record = {
+            'date': str(self._date),
+            'booking_id': ticket['booking_id'],
+            'movie_id': ticket['movie_id'],
+            'seat_bitmap': ticket['seat_bitmap'],
+            'at': time.time(),
+        }
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"[ERROR] Could not write gate journal: {e}")
+
+    def _load_journal_locked(self):
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return
+        today = str(self._date)
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Partial line from a crash
+                if record.get('date') != today:
+                    continue
+                movie_id = record['movie_id']
+                self._entered[movie_id] = self._entered.get(movie_id, 0) | record['seat_bitmap']
+                self._used_booking_ids.add(record['booking_id'])
+
+
+def _result(status, message, ticket=None):
+    result = {'status': status, 'valid': status == VALID, 'message': message}
+    if ticket:
+        result.update({
+            'booking_id': ticket['booking_id'],
+            'movie_id': ticket['movie_id'],
+            'show_date': str(ticket['show_date']),
+            'seats': ticket['seat_numbers'],
+        })
+    return result
+
+
+def make_handler(verifier):
+    """Build an HTTP request handler class bound to a verifier."""
+
+    class GateRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            query = urllib.parse.parse_qs(url.query)
+            if url.path == '/stats':
+                self._send(200, verifier.stats())
+            elif url.path == '/verify' and 'code' in query:
+                dry_run = query.get('dry_run', ['0'])[0] in ('1', 'true')
+                self._send(200, verifier.verify(query['code'][0], mark_entry=not dry_run))
+            else:
+                self._send(404, {'error': 'Use POST /verify, GET /verify?code=... or GET /stats'})
+
+        def do_POST(self):
+            if urllib.parse.urlparse(self.path).path != '/verify':
+                self._send(404, {'error': 'Unknown endpoint'})
+                return
+            length = int(self.headers.get('Content-Length', 0))
+            payload = self.rfile.read(length).decode('utf-8', errors='replace')
+            self._send(200, verifier.verify(payload))
+
+        def _send(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # One line per scan would drown the console
+
+    return GateRequestHandler
+
+
+def serve(verifier, host="127.0.0.1", port=8765):
+    server = ThreadingHTTPServer((host, port), make_handler(verifier))
+    print(f"[+] Gate verifier listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def scan_loop(verifier):
+    """Verify one code per input line (USB scanners type the code + Enter)."""
+    print("[+] Ready to scan (Ctrl+D to quit)")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        result = verifier.verify(line)
+        seats = ', '.join(result.get('seats', []))
+        marker = "OK  " if result['valid'] else "DENY"
+        print(f"{marker} {result['message']} {result.get('booking_id', '')} {seats}".rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nova Movies gate ticket verifier")
+    parser.add_argument('mode', choices=('serve', 'scan'))
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sync-interval', type=float, default=2.0,
+                        help="Seconds between database delta syncs")
+    parser.add_argument('--journal', default="gate_entries.jsonl",
+                        help="Entry journal file, so restarts keep today's entries")
+    args = parser.parse_args()
+
+    try:
+        get_signing_key()
+    except SigningKeyError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    verifier = TicketVerifier(sync_interval=args.sync_interval, journal_path=args.journal)
+    verifier.start()
+    try:
+        if args.mode == 'serve':
+            serve(verifier, args.host, args.port)
+        else:
+            scan_loop(verifier)
+    finally:
+        verifier.stop()
+        database.close_connection_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import database
+import passwords
+import sessions
 from admin_panel import create_admin_panel
+from task_runner import run_in_background
 
 def create_login_window(parent=None):
     """Create login window with working input fields."""
@@ -50,12 +53,24 @@ def create_login_window(parent=None):
             messagebox.showerror("Error", "Please fill in all fields")
             return
             
-        user = database.check_login(username, password)
-        if user:
-            login_window.logged_in_user = user
-            login_window.destroy()
-        else:
-            messagebox.showerror("Error", "Invalid username or password")
+        def finish_login(result):
+            token, user = result
+            if user:
+                login_window.logged_in_user = user
+                login_window.session_token = token
+                login_window.destroy()
+            else:
+                messagebox.showerror("Error", "Invalid username or password")
+
+        def login_failed(error):
+            if isinstance(error, (sessions.LoginThrottledError, passwords.PasswordBusyError)):
+                messagebox.showwarning("Please Wait", str(error))
+            else:
+                messagebox.showerror("Error", f"Login failed: {error}")
+
+        run_in_background(sessions.login, username, password,
+                          on_done=finish_login, on_error=login_failed,
+                          busy=(login_btn,), key='login')
 
     def handle_register():
         name = entries['register']['name'].get().strip()
@@ -77,12 +92,16 @@ def create_login_window(parent=None):
             messagebox.showerror("Error", "Please enter a valid 10-digit phone number")
             return
         
+        def finish_register(registered):
+            if registered:
+                messagebox.showinfo("Success", "Registration successful! Please login.")
+                show_login_form()
+            else:
+                messagebox.showerror("Error", "Username already exists")
+
         # Try to register
-        if database.register_user(name, username, password, phone):
-            messagebox.showinfo("Success", "Registration successful! Please login.")
-            show_login_form()
-        else:
-            messagebox.showerror("Error", "Username already exists")
+        run_in_background(database.register_user, name, username, password, phone,
+                          on_done=finish_register, busy=(register_btn,), key='register')
 
     # Create login form
     tk.Label(login_frame, text="LOGIN", font="Helvetica 24 bold", 
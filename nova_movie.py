@@ -1,23 +1,52 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, font as tkfont
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
-import urllib.parse
-import qrcode
-import datetime
+from PIL import ImageTk
 import database
-from PIL import Image, ImageDraw, ImageFont
+import passwords
 import random
+import sessions
 import os
+import time
+import uuid
 from login import create_login_window
 from admin_panel import create_admin_panel
+from poster_loader import PosterLoader
+from poster_cache import PosterCache
+from ticket_renderer import TicketRenderer, TICKET_SIZE
+from tk_dispatch import TkDispatcher
+from task_runner import run_in_background, start_task_runner, stop_task_runner
+from seat_canvas import SeatCanvas, fit_cell_size
+import seat_feed
 
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 MOVIE_API = os.getenv("MOVIE_API")
+POSTER_CACHE_DIR = os.getenv(
+    "POSTER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "poster_cache")
+)
+POSTER_CACHE_MAX_MB = int(os.getenv("POSTER_CACHE_MAX_MB", "50"))
+POSTER_CACHE_TTL_DAYS = float(os.getenv("POSTER_CACHE_TTL_DAYS", "7"))
+# How often an open seat window re-reads other customers' seat holds
+HOLD_REFRESH_MS = 2000
+# Worker threads for database calls made from the windows (see task_runner);
+# keep below DB_POOL_SIZE, the seat feed holds a pooled connection too
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", "3"))
+
+# Seat grid: colors per seat state (fill, text) and the space it may use
+SEAT_STYLES = {
+    'available': ('#202020', 'white'),
+    'selected': ('#ff3b3b', 'white'),
+    'held': ('#4a3b12', '#9c7f3c'),
+    'booked': ('#333333', '#666666'),
+}
+SEAT_AREA_SIZE = (480, 400)
+
+# Movie strip: cards visible before the strip scrolls, and its widest size
+CARDS_PER_VIEW = 3
+MOVIE_STRIP_MAX_WIDTH = 900
 
 
 
@@ -28,14 +57,18 @@ def initialize_globals():
     
     Sets up:
     - TICKET_SAVE_PATH: Directory path for saving generated tickets
-    - seat_buttons: List to store references to seat button widgets
+    - seat_canvas: Seat grid (SeatCanvas) of the open seat window
     - selected_seats: List to track currently selected seats
-    - selected_movie: Currently selected movie
+    - selected_movie: Title of the currently selected movie
+    - selected_show_id: movie_id of the selected show (title, screen, time)
+    - movie_cards: Card widgets by title, for highlighting the selection
     - movie_posters: Dictionary to cache movie poster images
+    - placeholder_poster: Blank image shown while a poster downloads
     
     Also creates a 'tickets' subdirectory if it doesn't exist.
     """
-    global TICKET_SAVE_PATH, seat_buttons, selected_seats, selected_movie, movie_posters
+    global TICKET_SAVE_PATH, seat_canvas, selected_seats, selected_movie, movie_posters
+    global placeholder_poster, selected_show_id, movie_cards
     
     TICKET_SAVE_PATH = "D:\\version 16-02-25\\tickets"
     # Create tickets directory if it doesn't exist
@@ -43,57 +76,97 @@ def initialize_globals():
     if not os.path.exists(tickets_dir):
         os.makedirs(tickets_dir)
         
-    seat_buttons = []
+    seat_canvas = None
     selected_seats = []
     selected_movie = None
+    selected_show_id = None
+    movie_cards = {}
     movie_posters = {}
+    placeholder_poster = None
 
-def fetch_movie_poster(movie_title):
+def fetch_movie_poster(movie_title, on_ready=None):
     """
-    Fetch and cache movie poster from OMDB API.
+    Get a movie poster, downloading it from OMDB in the background if needed.
     
     Args:
         movie_title (str): Title of the movie to fetch poster for
+        on_ready (callable): Called on the Tk thread as on_ready(poster) once
+            a background download finishes (poster is None if it failed)
         
     Returns:
-        ImageTk.PhotoImage: Processed poster image ready for display
-        None: If poster fetch fails
+        ImageTk.PhotoImage: Cached poster image ready for display
+        None: If the poster is not available yet (or the movie has none)
         
     Process:
-    1. Checks if poster is already cached
-    2. Makes API request to OMDB
-    3. Downloads and processes poster image
-    4. Resizes to 130x195 pixels
-    5. Caches for future use
+    1. Returns the in-memory poster immediately if available
+    2. Loads it from the on-disk poster cache (no network I/O)
+    3. Otherwise queues a download on the poster loader thread pool
+    4. Converts the resized 130x195 image to a PhotoImage on the Tk thread
+    5. Caches it and notifies on_ready
     """
-    try:
-        if (movie_title in movie_posters):
-            return movie_posters[movie_title]
+    if movie_title in movie_posters:
+        return movie_posters[movie_title]
+    
+    hit, image = poster_loader.load_cached(movie_title)
+    if hit:
+        if image is None:
+            return None  # Known to have no poster
+        movie_posters[movie_title] = ImageTk.PhotoImage(image)
+        return movie_posters[movie_title]
+    
+    def handle_poster(title, image):
+        if image is not None and title not in movie_posters:
+            movie_posters[title] = ImageTk.PhotoImage(image)
+        if on_ready:
+            on_ready(movie_posters.get(title))
+    
+    poster_loader.request(movie_title, handle_poster)
+    return None
 
+def create_poster_label(parent, movie_title, bg):
+    """
+    Create a label showing the movie poster, or a placeholder until it loads.
+    
+    Args:
+        parent: Parent widget
+        movie_title (str): Title of the movie
+        bg (str): Background color
         
-        url = f"http://www.omdbapi.com/?t={urllib.parse.quote(movie_title)}&apikey={MOVIE_API}"
-        
-        response = requests.get(url)
-        movie_data = response.json()
-        
-        if movie_data.get('Poster') and movie_data['Poster'] != 'N/A':
-            poster_response = requests.get(movie_data['Poster'])
-            image = Image.open(BytesIO(poster_response.content))
-            image = image.resize((130, 195), Image.Resampling.LANCZOS)
-            movie_posters[movie_title] = ImageTk.PhotoImage(image)
-            return movie_posters[movie_title]
-        return None
-    except Exception as e:
-        print(f"Error fetching poster for {movie_title}: {e}")
-        return None
+    Returns:
+        tk.Label: Label (not yet packed) that swaps in the poster on arrival
+    """
+    global placeholder_poster
+    if placeholder_poster is None:
+        placeholder_poster = tk.PhotoImage(width=130, height=195)
+    
+    poster_label = tk.Label(parent, bg=bg, fg='#444444',
+                            font=("Helvetica", 9), compound='center')
+    
+    def show_poster(poster):
+        if not poster_label.winfo_exists():
+            return  # Card was destroyed while the poster downloaded
+        if poster:
+            poster_label.config(image=poster, text='')
+        else:
+            poster_label.config(text="No Poster")
+    
+    poster = fetch_movie_poster(movie_title, on_ready=show_poster)
+    if poster:
+        poster_label.config(image=poster)
+    elif poster_loader.is_pending(movie_title):
+        poster_label.config(image=placeholder_poster, text="Loading...")
+    else:
+        poster_label.config(image=placeholder_poster, text="No Poster")
+    return poster_label
 
-def create_movie_card(parent, movie_data, idx):
+def create_movie_card(parent, shows, idx):
     """
     Create a visual card display for a movie with hover effects.
     
     Args:
         parent: Parent widget to contain the card
-        movie_data (dict): Movie information (title, genre, price, etc.)
+        shows (list): Today's shows of one title (rows from
+            database.get_active_movies_for_date), ordered by time
         idx (int): Index for positioning the card
         
     Features:
@@ -101,9 +174,11 @@ def create_movie_card(parent, movie_data, idx):
     - Movie poster display
     - Title button with hover effect
     - Price display in red
-    - Genre and show time information
+    - Genre information
+    - One button per show (time and screen) to pick the showing
     - Click handlers for selection
     """
+    movie_data = shows[0]
     try:
         # Create main frame with hover effect
         movie_frame = tk.Frame(parent, bg='#151515', padx=20, pady=15)
@@ -123,18 +198,19 @@ def create_movie_card(parent, movie_data, idx):
         movie_frame.bind('<Leave>', on_leave)
         
         def select_this_movie(event=None):
-            select_movie(movie_data['title'])
+            # Picking the card keeps the chosen show, else takes the earliest
+            if selected_movie != movie_data['title']:
+                select_show(movie_data)
         
         movie_frame.bind('<Button-1>', select_this_movie)
         
-        poster = fetch_movie_poster(movie_data['title'])
-        if poster:
-            poster_label = tk.Label(movie_frame, image=poster, bg='#151515')
-            poster_label.pack(pady=(0, 10))
-            poster_label.bind('<Button-1>', select_this_movie)
-            # Make poster label update its bg color with frame
-            poster_label.bind('<Enter>', on_enter)
-            poster_label.bind('<Leave>', on_leave)
+        # Placeholder is drawn now; the poster is swapped in when it arrives
+        poster_label = create_poster_label(movie_frame, movie_data['title'], '#151515')
+        poster_label.pack(pady=(0, 10))
+        poster_label.bind('<Button-1>', select_this_movie)
+        # Make poster label update its bg color with frame
+        poster_label.bind('<Enter>', on_enter)
+        poster_label.bind('<Leave>', on_leave)
         
         title_btn = tk.Button(movie_frame, 
                        text=movie_data['title'], 
@@ -153,8 +229,12 @@ def create_movie_card(parent, movie_data, idx):
                 widget.bind('<Enter>', on_enter)
                 widget.bind('<Leave>', on_leave)
         
+        prices = sorted({float(show['price']) for show in shows})
+        price_text = f"₹{prices[0]:.2f}"
+        if len(prices) > 1:
+            price_text += f" - ₹{prices[-1]:.2f}"
         price_label = tk.Label(movie_frame, 
-                             text=f"₹{float(movie_data['price']):.2f}",
+                             text=price_text,
                              font="Helvetica 10 bold", 
                              bg='#151515', fg='#ff3b3b')
         price_label.pack(pady=(5, 0))
@@ -165,14 +245,25 @@ def create_movie_card(parent, movie_data, idx):
                              bg='#151515', fg='#888888')
         genre_label.pack(pady=(5, 0))
         
-        time_str = movie_data['show_time']
-        if isinstance(time_str, str) and len(time_str) > 8:
-            time_str = time_str[:8]
-        time_label = tk.Label(movie_frame, 
-                            text=f"Show Time: {time_str}",
-                            font="Helvetica 10", 
-                            bg='#151515', fg='#888888')
-        time_label.pack(pady=(5, 0))
+        # One button per showing, two to a row
+        shows_frame = tk.Frame(movie_frame, bg='#151515')
+        shows_frame.pack(pady=(8, 0))
+        show_buttons = {}
+        for i, show in enumerate(shows):
+            show_btn = tk.Button(shows_frame,
+                                 text=f"{str(show['show_time'])[:5]} · {show['screen_name'] or ''}",
+                                 font="Helvetica 9",
+                                 bg='#202020', fg='white',
+                                 relief='flat', cursor="hand2",
+                                 command=lambda s=show: select_show(s))
+            show_btn.grid(row=i // 2, column=i % 2, padx=2, pady=2)
+            show_buttons[show['movie_id']] = show_btn
+        
+        movie_cards[movie_data['title']] = {
+            'frame': movie_frame,
+            'title_btn': title_btn,
+            'show_buttons': show_buttons,
+        }
             
     except Exception as e:
         print(f"Error creating movie card: {e}")
@@ -207,59 +298,45 @@ def create_premium_button(parent, text, command):
     btn.bind("<Leave>", on_leave)
     return btn
 
-def select_movie(movie):
+def select_show(show):
     """
-    Handle movie selection and update UI accordingly.
+    Handle show selection and update UI accordingly.
     
     Args:
-        movie (str): Title of selected movie
+        show (dict): Selected show (a row from get_active_movies_for_date)
         
     Process:
-    1. Updates global selected_movie
-    2. Finds movie container frame
-    3. Resets all movie cards to default state
-    4. Highlights selected movie card
-    5. Updates button colors
+    1. Updates global selected_movie and selected_show_id
+    2. Resets all movie cards to default state
+    3. Highlights the selected movie card and show button
+    """
+    global selected_movie, selected_show_id
+    selected_movie = show['title']
+    selected_show_id = show['movie_id']
+    
+    for title, card in movie_cards.items():
+        is_selected = title == selected_movie
+        card['frame'].config(bg='#202020' if is_selected else '#151515')
+        card['title_btn'].config(bg='#ff3b3b' if is_selected else '#202020')
+        for show_id, show_btn in card['show_buttons'].items():
+            show_btn.config(bg='#ff3b3b' if show_id == selected_show_id else '#202020')
+
+def load_show(show_id):
     """
-    global selected_movie
-    selected_movie = movie
-    print(f"Selected movie: {movie}")  # Debug print
+    Look up a show in today's catalog (worker thread: it may reload it).
     
-    # Find the movies container frame
-    movies_container = None
-    for widget in movies_frame.winfo_children():
-        if isinstance(widget, tk.Frame):
-            movies_container = widget
-            break
-    
-    if movies_container:
-        # Reset all movie frames and buttons to default color
-        for movie_frame in movies_container.winfo_children():
-            if isinstance(movie_frame, tk.Frame):
-                # Reset button color
-                for child in movie_frame.winfo_children():
-                    if isinstance(child, tk.Button):
-                        child.config(bg='#202020')
-                # Reset frame background
-                movie_frame.config(bg='#151515')
-        
-        # Find and highlight the selected movie
-        for movie_frame in movies_container.winfo_children():
-            if isinstance(movie_frame, tk.Frame):
-                for child in movie_frame.winfo_children():
-                    if isinstance(child, tk.Button) and child['text'] == movie:
-                        # Highlight button
-                        child.config(bg='#ff3b3b')
-                        # Highlight frame
-                        movie_frame.config(bg='#202020')
-                        break
-
-def create_seat_layout(parent):
+    Returns:
+        dict: Show details, or None if the show is no longer running today
+    """
+    return database.get_catalog()['by_id'].get(show_id)
+
+def create_seat_layout(parent, selected_movie_data):
     """
     Create interactive seat selection interface.
     
     Args:
         parent: Parent widget
+        selected_movie_data (dict): The show (see load_show)
         
     Features:
     1. Left Panel:
@@ -269,26 +346,56 @@ def create_seat_layout(parent):
         
     2. Right Panel:
         - Screen visualization
-        - Interactive seat grid (A1-G7)
+        - Interactive seat grid drawn from the screen's seat map
         - Color coding for seats
         - Aisle spacing
         
     3. Legend section for seat status
     4. Real-time total calculation
+    5. Seat holds: selecting a seat reserves it for a short time
+       (database.SEAT_HOLD_TTL) so other kiosks cannot take it while
+       the customer decides; other customers' holds show as "Held"
     """
-    global selected_seats, seat_buttons
-    selected_seats = []
-    seat_buttons = []
+    # Holds placed from this window are tagged with its own holder id
+    holder = uuid.uuid4().hex
     
-    # Get movie data
-    active_movies = database.get_active_movies_for_date(None)
-    selected_movie_data = next((m for m in active_movies if m['title'] == selected_movie), None)
+    loading_label = tk.Label(parent, text="Loading seats...",
+                             font=("Helvetica", 12),
+                             bg='#080808', fg='#888888')
+    loading_label.pack(expand=True)
     
-    if not selected_movie_data:
-        messagebox.showerror("Error", "Movie data not found!")
-        return
-        
-    occupied_seats = database.get_occupied_seats(selected_movie_data['movie_id'])
+    def show_seats(seat_state):
+        loading_label.destroy()
+        build_seat_layout(parent, selected_movie_data, holder, *seat_state)
+    
+    def show_load_error(e):
+        print(f"[ERROR] Could not load seats: {e}")
+        loading_label.config(text="Could not load seats. Please go back and try again.")
+    
+    run_in_background(load_seat_state, selected_movie_data['movie_id'], holder,
+                      on_done=show_seats, on_error=show_load_error, owner=parent)
+
+def load_seat_state(movie_id, holder):
+    """
+    Read what the seat window needs (worker thread).
+
+    Returns:
+        tuple: (seat map, occupancy bitmap, bitmap of other windows' holds)
+    """
+    seat_map = database.get_show_seat_map(movie_id)
+    # One query loads the show's occupancy bitmap; seat checks are then O(1)
+    occupied_bitmap = database.get_seat_snapshot(movie_id, refresh=True)['bitmap']
+    held_bitmap = database.get_held_seats(movie_id, exclude_holder=holder)
+    return seat_map, occupied_bitmap, held_bitmap
+
+def build_seat_layout(parent, selected_movie_data, holder, seat_map, occupied_bitmap, held_bitmap):
+    """Create the seat selection widgets once the seat state is loaded."""
+    global selected_seats, seat_canvas
+    selected_seats = []
+    
+    movie_id = selected_movie_data['movie_id']
+    user = sessions.get_session_user(getattr(root, 'session_token', None))
+    user_id = user['user_id'] if user else None
     
     # Create main container with gradient effect
     seat_frame = tk.Frame(parent, bg='#080808')
@@ -307,7 +414,7 @@ def create_seat_layout(parent):
     title_frame = tk.Frame(info_frame, bg='#101010')
     title_frame.pack(fill='x')
     
-    tk.Label(title_frame, text=selected_movie,
+    tk.Label(title_frame, text=selected_movie_data['title'],
             font=("Helvetica", 16, "bold"),
             bg='#101010', fg='#ff3b3b',
             wraplength=180).pack()
@@ -321,7 +428,7 @@ def create_seat_layout(parent):
             bg='#101010', fg='#888888').pack(side='left', padx=5)
             
     tk.Label(time_frame, 
-            text=f"{str(selected_movie_data['show_time'])[:5]}",
+            text=f"{str(selected_movie_data['show_time'])[:5]} · {selected_movie_data['screen_name'] or ''}",
             font=("Helvetica", 12),
             bg='#101010', fg='white').pack(side='left')
 
@@ -369,55 +476,15 @@ def create_seat_layout(parent):
     grid_frame = tk.Frame(right_panel, bg='#080808')
     grid_frame.pack()
     
-    rows = "ABCDEFG"
-    for row_idx, row in enumerate(rows):
-        # Row label
-        tk.Label(grid_frame, text=row,
-                font=("Helvetica", 10, "bold"),
-                bg='#080808', fg='#666666',
-                width=2).grid(row=row_idx, column=0, padx=(0, 10))
-        
-        seat_row = []
-        for col in range(7):
-            seat_num = f"{row}{col+1}"
-            
-            # Create seat button with rounded corners effect
-            seat_frame = tk.Frame(grid_frame, bg='#080808')
-            seat_frame.grid(row=row_idx, column=col+1, padx=2, pady=2)
-            
-            btn = tk.Button(seat_frame, text=seat_num,
-                          width=3, height=1,
-                          font=("Helvetica", 8),
-                          cursor="hand2",
-                          relief="flat")
-            btn.pack(padx=1, pady=1)
-            
-            if seat_num in occupied_seats:
-                btn.config(bg='#333333', fg='#666666', state='disabled')
-            else:
-                btn.config(bg='#202020', fg='white')
-                # Use lambda with default argument to capture correct seat_num
-                btn.config(command=lambda s=seat_num: toggle_seat(s))
-                
-                def on_enter(e, button=btn):
-                    if button['bg'] not in ['#ff3b3b', '#333333']:  # Don't highlight if selected or occupied
-                        button.config(bg='#303030')
-                        
-                def on_leave(e, button=btn):
-                    if button['bg'] not in ['#ff3b3b', '#333333']:  # Don't unhighlight if selected or occupied
-                        button.config(bg='#202020')
-                        
-                btn.bind('<Enter>', on_enter)
-                btn.bind('<Leave>', on_leave)
-            
-            seat_row.append(btn)
-            
-            # Add aisle
-            if col == 3:
-                spacer = tk.Frame(grid_frame, width=15, bg='#080808')
-                spacer.grid(row=row_idx, column=col+2)
-                
-        seat_buttons.append(seat_row)
+    # The whole hall is one canvas; seats sit at their seat-map cells
+    seat_canvas = SeatCanvas(grid_frame, seat_map, SEAT_STYLES,
+                             cell=fit_cell_size(seat_map, *SEAT_AREA_SIZE),
+                             on_click=lambda seat_num: toggle_seat(seat_num),
+                             clickable=('available', 'selected'),
+                             hover={'available': '#303030'})
+    seat_canvas.pack()
+    seat_canvas.paint(occupied_bitmap, 'booked')
+    seat_canvas.paint(held_bitmap & ~occupied_bitmap, 'held')
 
     # Legend section
     legend_frame = tk.Frame(right_panel, bg='#080808')
@@ -426,6 +493,7 @@ def create_seat_layout(parent):
     legend_items = [
         ("Available", '#202020'),
         ("Selected", '#ff3b3b'),
+        ("Held", '#4a3b12'),
         ("Booked", '#333333')
     ]
     
@@ -447,24 +515,147 @@ def create_seat_layout(parent):
         total = len(selected_seats) * price
         total_label.config(text=f"₹{total:.2f}")
 
+    def paint_seat(seat_num):
+        """Color one seat from the booked/held/selected state."""
+        idx = seat_map.index(seat_num)
+        if occupied_bitmap >> idx & 1:
+            seat_canvas.set_state(idx, 'booked')
+        elif held_bitmap >> idx & 1:
+            seat_canvas.set_state(idx, 'held')
+        elif seat_num in selected_seats:
+            seat_canvas.set_state(idx, 'selected')
+        else:
+            seat_canvas.set_state(idx, 'available')
+
+    # Seats whose hold request is still on its way to the database
+    pending_seats = set()
+
     def toggle_seat(seat_num):
-        """Handle seat selection/deselection."""
-        row = ord(seat_num[0]) - ord('A')
-        col = int(seat_num[1]) - 1
-        button = seat_buttons[row][col]
-        
-        if seat_num in occupied_seats:
-            return  # Don't allow toggling occupied seats
+        """Handle seat selection/deselection, holding or releasing the seat."""
+        if (database.is_seat_booked(occupied_bitmap, seat_num, seat_map)
+                or database.is_seat_booked(held_bitmap, seat_num, seat_map)
+                or seat_num in pending_seats):
+            return  # Don't allow toggling occupied, held or pending seats
             
         if seat_num in selected_seats:  # If seat is already selected
-            button.config(bg='#202020')  # Change back to available color
             selected_seats.remove(seat_num)
-        else:  # If seat is available
-            button.config(bg='#ff3b3b')  # Change to selected color
+            run_in_background(database.release_seat_holds, movie_id, holder, [seat_num],
+                              on_error=lambda e: print(f"[ERROR] Could not release seat {seat_num}: {e}"))
+            paint_seat(seat_num)
+            update_total()
+            return
+
+        # If seat is available, reserve it before showing it as selected
+        def finish_hold(result):
+            pending_seats.discard(seat_num)
+            held, conflicts = result
+            if conflicts:
+                reload_seat_state()  # Someone else got there first
+                return
+            if not held:
+                messagebox.showerror("Error", "Could not reserve the seat. Please try again.")
+                return
             selected_seats.append(seat_num)
-            
+            paint_seat(seat_num)
+            update_total()
+
+        def hold_failed(e):
+            pending_seats.discard(seat_num)
+            print(f"[ERROR] Could not hold seat {seat_num}: {e}")
+            messagebox.showerror("Error", "Could not reserve the seat. Please try again.")
+
+        pending_seats.add(seat_num)
+        run_in_background(database.hold_seats, movie_id, [seat_num], holder, user_id,
+                          on_done=finish_hold, on_error=hold_failed, owner=grid_frame)
+
+    def apply_seat_changes(events):
+        """Apply live seat changes from the change feed to the grid."""
+        nonlocal occupied_bitmap
+        if not grid_frame.winfo_exists():
+            return
+        new_bitmap = database.get_seat_snapshot(movie_id)['bitmap']
+        changed = occupied_bitmap ^ new_bitmap
+        occupied_bitmap = new_bitmap
+        for seat_num in database.bitmap_to_seats(changed, seat_map):
+            if database.is_seat_booked(new_bitmap, seat_num, seat_map) and seat_num in selected_seats:
+                selected_seats.remove(seat_num)
+            paint_seat(seat_num)
         update_total()
 
+    # Follow bookings made at other kiosks while this window is open
+    feed = seat_feed.get_seat_feed()
+    if feed:
+        unsubscribe = feed.subscribe(apply_seat_changes, movie_id)
+        grid_frame.bind('<Destroy>', lambda e: unsubscribe(), add='+')
+
+    def reload_seat_state():
+        """Re-read bookings and holds, e.g. after a seat turned out to be taken."""
+        run_in_background(load_seat_state, movie_id, holder,
+                          on_done=apply_seat_state, owner=grid_frame,
+                          key=('seat_state', holder))
+
+    def apply_seat_state(seat_state):
+        nonlocal occupied_bitmap, held_bitmap
+        _, new_occupied, new_held = seat_state
+        changed = (occupied_bitmap ^ new_occupied) | (held_bitmap ^ new_held)
+        occupied_bitmap, held_bitmap = new_occupied, new_held
+        unavailable = occupied_bitmap | held_bitmap
+        for seat_num in list(selected_seats):
+            if database.is_seat_booked(unavailable, seat_num, seat_map):
+                selected_seats.remove(seat_num)
+                changed |= database.seats_to_bitmap([seat_num], seat_map)
+        for seat_num in database.bitmap_to_seats(changed, seat_map):
+            paint_seat(seat_num)
+        update_total()
+
+    hold_state = {'job': None, 'renewed': time.monotonic()}
+
+    def refresh_holds():
+        """Show other customers' holds and keep this window's holds alive."""
+        hold_state['job'] = None
+        if not grid_frame.winfo_exists():
+            return
+        renew = None
+        if (selected_seats and time.monotonic() - hold_state['renewed']
+                > database.SEAT_HOLD_TTL / 3):
+            renew = list(selected_seats)
+            hold_state['renewed'] = time.monotonic()
+        run_in_background(renew_holds, renew, on_done=apply_holds,
+                          on_error=holds_failed, owner=grid_frame)
+
+    def renew_holds(seats):
+        # Worker thread
+        conflicts = []
+        if seats:
+            held, conflicts = database.hold_seats(movie_id, seats, holder, user_id)
+        return conflicts, database.get_held_seats(movie_id, exclude_holder=holder)
+
+    def apply_holds(result):
+        nonlocal held_bitmap
+        conflicts, new_held = result
+        if conflicts:
+            reload_seat_state()  # A hold lapsed and the seat was taken
+        changed = held_bitmap ^ new_held
+        held_bitmap = new_held
+        for seat_num in database.bitmap_to_seats(changed, seat_map):
+            paint_seat(seat_num)
+        hold_state['job'] = grid_frame.after(HOLD_REFRESH_MS, refresh_holds)
+
+    def holds_failed(e):
+        print(f"[ERROR] Could not refresh seat holds: {e}")
+        hold_state['job'] = grid_frame.after(HOLD_REFRESH_MS, refresh_holds)
+
+    def release_holds(event):
+        if hold_state['job'] is not None:
+            grid_frame.after_cancel(hold_state['job'])
+            hold_state['job'] = None
+        # Seats not booked go straight back on sale instead of waiting for expiry
+        run_in_background(database.release_seat_holds, movie_id, holder,
+                          on_error=lambda e: print(f"[ERROR] Could not release seat holds: {e}"))
+
+    grid_frame.bind('<Destroy>', release_holds, add='+')
+    hold_state['job'] = grid_frame.after(HOLD_REFRESH_MS, refresh_holds)
+
     # Confirm booking button
     confirm_button = tk.Button(left_panel,
                              text="CONFIRM BOOKING",
@@ -473,7 +664,11 @@ def create_seat_layout(parent):
                              fg='white',
                              relief='flat',
                              cursor='hand2',
-                             command=confirm_booking)
+                             command=lambda: confirm_booking(
+                                 selected_movie_data,
+                                 on_conflict=lambda seats: reload_seat_state(),
+                                 holder=holder,
+                                 busy=(confirm_button,)))
     confirm_button.pack(side='bottom', pady=20, padx=20, fill='x')
     
     def on_confirm_enter(e):
@@ -485,136 +680,36 @@ def create_seat_layout(parent):
     confirm_button.bind('<Enter>', on_confirm_enter)
     confirm_button.bind('<Leave>', on_confirm_leave)
 
-def generate_ticket_qr(booking_data):
-    """Generate QR code with booking details."""
-    qr_content = (
-        f"NOVA MOVIES BOOKING\n"
-        f"------------------\n"
-        f"Booking ID: {booking_data['booking_id']}\n"
-        f"Movie: {booking_data['movie_title']}\n"
-        f"Show Time: {booking_data['show_time']}\n"
-        f"Seats: {', '.join(booking_data['seat_numbers'])}\n"
-        f"Customer: {booking_data['user_name']}\n"
-        f"Phone: {booking_data['phone_number']}\n"
-        f"Amount: ₹{booking_data['price']:.2f}\n"
-        f"------------------\n"
-        f"Scan to verify"
-    )
-    
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=10,
-        border=4
-    )
-    qr.add_data(qr_content)
-    qr.make(fit=True)
-    
-    return qr.make_image(fill_color="black", back_color="white")
+def get_ticket_poster(movie_title):
+    """
+    Get a PIL poster for a ticket (must run on the Tk thread).
 
-def create_ticket_image(booking_data, qr_image):
-    """Create ticket image with movie poster and QR code."""
-    # Create ticket background with fixed size
-    width = 1000
-    height = 500
-    ticket = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(ticket)
-    
-    try:
-        # Try to load Arial font
-        try:
-            title_font = ImageFont.truetype("arial.ttf", 48)
-            heading_font = ImageFont.truetype("arial.ttf", 24)
-            detail_font = ImageFont.truetype("arial.ttf", 20)
-        except:
-            title_font = ImageFont.load_default()
-            heading_font = ImageFont.load_default()
-            detail_font = ImageFont.load_default()
-        
-        # Add decorative elements
-        draw.rectangle([0, 0, width, 80], fill='#ff3b3b')  # Header
-        draw.rectangle([0, height-60, width, height], fill='#ff3b3b')  # Footer
-        
-        # Add title
-        draw.text((40, 20), "NOVA MOVIES", font=title_font, fill='white')
-        
-        # Get movie poster
-        poster = None
-        if booking_data['movie_title'] in movie_posters:
-            poster_photo = movie_posters[booking_data['movie_title']]
-            poster = ImageTk.getimage(poster_photo)  # Convert PhotoImage back to PIL Image
-            
-        if poster:
-            # Resize poster to fit ticket
-            poster_height = 300
-            poster_width = int((poster_height/poster.height) * poster.width)
-            poster = poster.resize((poster_width, poster_height), Image.Resampling.LANCZOS)
-            
-            # Paste poster on left side
-            poster_x = 40
-            poster_y = 100
-            ticket.paste(poster, (poster_x, poster_y))
-            
-            # Start details after poster
-            details_x = poster_x + poster_width + 40
-        else:
-            details_x = 40
-        
-        # Add booking details
-        y_pos = 120
-        details = [
-            ("Booking ID:", booking_data['booking_id']),
-            ("Movie:", booking_data['movie_title']),
-            ("Show Time:", booking_data['show_time']),
-            ("Seats:", ', '.join(booking_data['seat_numbers'])),
-            ("Customer:", booking_data['user_name']),
-            ("Phone:", booking_data['phone_number']),
-            ("Amount:", f"₹{booking_data['price']:.2f}")
-        ]
-        
-        # Add details with proper spacing
-        for label, value in details:
-            draw.text((details_x, y_pos), label, font=heading_font, fill='#333333')
-            draw.text((details_x + 160, y_pos), str(value), font=detail_font, fill='#000000')
-            y_pos += 45
-        
-        # Resize QR code
-        qr_size = 200
-        qr_image = qr_image.resize((qr_size, qr_size))
-        
-        # Place QR code on right side
-        qr_x = width - qr_size - 50
-        qr_y = (height - qr_size) // 2
-        ticket.paste(qr_image, (qr_x, qr_y))
-        
-        # Add verification text under QR
-        verify_text = "Scan to verify"
-        verify_width = draw.textlength(verify_text, font=detail_font)
-        verify_x = qr_x + (qr_size - verify_width) // 2
-        
-        draw.text((verify_x, qr_y + qr_size + 10), verify_text, 
-                 font=detail_font, fill='#666666')
-        
-        return ticket
-        
-    except Exception as e:
-        print(f"Error creating ticket image: {e}")
-        # Create simple fallback ticket
-        draw.text((20, 20), "NOVA MOVIES TICKET", font=ImageFont.load_default(), fill='black')
-        draw.text((20, 50), f"Booking ID: {booking_data['booking_id']}", 
-                 font=ImageFont.load_default(), fill='black')
-        ticket.paste(qr_image, (width-qr_image.size[0]-20, 20))
-        return ticket
-
-def show_ticket_popup(ticket_path, booking_data):
-    """Show ticket in a popup window after booking."""
+    Prefers the ticket-resolution variant from the disk cache and falls
+    back to the poster already shown on the movie card.
+    """
+    poster = poster_loader.cache.get(movie_title, 'ticket')
+    if poster is None and movie_title in movie_posters:
+        poster_photo = movie_posters[movie_title]
+        poster = ImageTk.getimage(poster_photo)  # Convert PhotoImage back to PIL Image
+    return poster
+
+def show_ticket_popup(booking_data):
+    """
+    Show the booking confirmation popup right away.
+
+    The ticket itself is rendered in the background; a placeholder is
+    shown until it arrives.
+
+    Returns:
+        callable: show_ticket(image) - call on the Tk thread with the
+        rendered ticket (or None if rendering failed)
+    """
     popup = tk.Toplevel()
     popup.title("Your Ticket")
     popup.configure(bg='#080808')
     
-    # Calculate window size based on ticket image size
-    ticket_image = Image.open(ticket_path)
-    width, height = ticket_image.size
+    # Tickets have a fixed size, so the window can be laid out before rendering
+    width, height = TICKET_SIZE
     
     # Add some padding
     window_width = width + 40
@@ -623,9 +718,6 @@ def show_ticket_popup(ticket_path, booking_data):
     # Center the window
     center_window(popup, window_width, window_height)
     
-    # Convert ticket image for tkinter
-    ticket_photo = ImageTk.PhotoImage(ticket_image)
-    
     # Create main container
     container = tk.Frame(popup, bg='#080808', padx=20, pady=20)
     container.pack(expand=True, fill='both')
@@ -648,13 +740,14 @@ def show_ticket_popup(ticket_path, booking_data):
         bg='#080808'
     ).pack(pady=(0, 20))
     
-    # Show ticket image
+    # Ticket placeholder until the renderer delivers the image
     ticket_label = tk.Label(
         container,
-        image=ticket_photo,
+        text="Preparing your ticket...",
+        font=("Helvetica", 12),
+        fg='#888888',
         bg='#080808'
     )
-    ticket_label.image = ticket_photo  # Keep reference
     ticket_label.pack()
     
     # Add close button
@@ -680,83 +773,132 @@ def show_ticket_popup(ticket_path, booking_data):
     
     close_btn.bind('<Enter>', on_enter)
     close_btn.bind('<Leave>', on_leave)
+    
+    def show_ticket(ticket_image):
+        if not ticket_label.winfo_exists():
+            return  # Popup closed before the ticket was ready
+        if ticket_image is None:
+            ticket_label.config(text="Ticket image could not be created.\n"
+                                     "Your booking is confirmed.")
+            return
+        # Convert ticket image for tkinter
+        ticket_photo = ImageTk.PhotoImage(ticket_image)
+        ticket_label.config(image=ticket_photo, text='')
+        ticket_label.image = ticket_photo  # Keep reference
+    
+    return show_ticket
 
-def confirm_booking():
-    """Handle booking confirmation and ticket generation."""
+def confirm_booking(selected_movie_data, on_conflict=None, holder=None, busy=()):
+    """
+    Handle booking confirmation and ticket generation.
+    
+    Args:
+        selected_movie_data (dict): The show the seat window was opened
+            for; book_seats checks it is still running
+        on_conflict (callable): Called with the list of seats another
+            kiosk booked or held first, so the seat grid can mark them as taken
+        holder (str): Seat-hold owner of the seat window; its holds on the
+            selected seats become the booking
+        busy (tuple): Widgets disabled while the booking is saved
+    """
     if not selected_seats:
         messagebox.showwarning("No Seats", "Please select seats first!")
         return
         
-    if not hasattr(root, 'logged_in_user') or not root.logged_in_user:
-        messagebox.showinfo("Login Required", "Please login to book tickets")
+    # The customer comes from the session, not from root.logged_in_user
+    user = sessions.get_session_user(getattr(root, 'session_token', None))
+    if user is None:
+        if getattr(root, 'logged_in_user', None):
+            log_out()
+            messagebox.showinfo("Session Expired", "Your session has expired. Please login again to book tickets")
+        else:
+            messagebox.showinfo("Login Required", "Please login to book tickets")
         return
         
-    try:
-        # Get movie data
-        active_movies = database.get_active_movies_for_date(None)
-        selected_movie_data = next((m for m in active_movies if m['title'] == selected_movie), None)
-        
-        # Get user details from database
-        connection = database.get_db_connection()
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT name, phone_number 
-            FROM nm_users 
-            WHERE user_id = %s
-        """, (root.logged_in_user['user_id'],))
-        user_data = cursor.fetchone()
-        
-        # Generate unique booking ID
-        booking_id = f"NM{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+    seats = list(selected_seats)
+    user_id = user['user_id']
+    movie_title = selected_movie_data['title']
+    window = seat_canvas.winfo_toplevel()
+    
+    def finish_booking(result):
+        booking_id, conflicts, user_data, total_price = result
+        if conflicts:
+            if on_conflict:
+                on_conflict(conflicts)
+            messagebox.showerror(
+                "Seats Unavailable",
+                f"Seat(s) {', '.join(conflicts)} were just booked or held by someone else.\n"
+                "Please choose different seats."
+            )
+            return
+        if not booking_id:
+            booking_failed(Exception("Could not save the booking. Please try again."))
+            return
         
         # Prepare booking data for QR
         booking_data = {
             'booking_id': booking_id,
-            'movie_title': selected_movie,
+            'movie_id': selected_movie_data['movie_id'],
+            'show_date': selected_movie_data['show_date'],
+            'movie_title': movie_title,
             'show_time': str(selected_movie_data['show_time']),
-            'seat_numbers': selected_seats,
+            'seat_numbers': seats,
             'user_name': user_data['name'],
             'phone_number': user_data['phone_number'],
-            'price': float(selected_movie_data['price']) * len(selected_seats)
+            'price': float(total_price or 0),
+            'seat_layout': database.get_show_seat_map(selected_movie_data['movie_id']).name
         }
         
-        # Save seats to database
-        for seat in selected_seats:
-            cursor.execute("""
-                INSERT INTO nm_seats (movie_id, user_id, seat_number, booking_date)
-                VALUES (%s, %s, %s, CURDATE())
-            """, (selected_movie_data['movie_id'], root.logged_in_user['user_id'], seat))
-            
-        connection.commit()
-        
-        # Generate QR code
-        qr_image = generate_ticket_qr(booking_data)
-        
-        # Create ticket image
-        ticket_image = create_ticket_image(booking_data, qr_image)
-        
-        # Generate and save ticket
+        # Confirm immediately; the ticket is rendered and saved in the background
+        show_ticket = show_ticket_popup(booking_data)
         ticket_filename = f"ticket_{booking_id}.png"
         ticket_path = os.path.join(TICKET_SAVE_PATH, "tickets", ticket_filename)
-        ticket_image.save(ticket_path)
-        
-        # Show ticket popup instead of message box
-        show_ticket_popup(ticket_path, booking_data)
+        ticket_renderer.render(
+            booking_data,
+            lambda data, image: show_ticket(image),
+            poster=get_ticket_poster(movie_title),
+            save_path=ticket_path
+        )
         
         # Close seat selection window
-        parent = seat_buttons[0][0].master.master.master.master
-        if isinstance(parent, tk.Toplevel):
-            parent.destroy()
-            
-    except Exception as e:
+        if isinstance(window, tk.Toplevel) and window.winfo_exists():
+            window.destroy()
+    
+    def booking_failed(e):
+        if isinstance(e, database.ShowUnavailableError):
+            messagebox.showerror("Show Unavailable", str(e))
+            return
         messagebox.showerror("Error", f"Failed to complete booking: {str(e)}")
-        if 'connection' in locals():
-            connection.rollback()
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'connection' in locals():
-            connection.close()
+    
+    # The booking must land even if the seat window is closed meanwhile,
+    # so the result is not tied to it (owner=root)
+    run_in_background(save_booking, selected_movie_data, seats, user_id, holder,
+                      on_done=finish_booking, on_error=booking_failed,
+                      busy=busy, owner=root, key=('booking', holder))
+
+def save_booking(show, seats, user_id, holder):
+    """
+    Book seats for a user in one transaction (worker thread).
+
+    Returns:
+        tuple: (booking_id, conflicts, user contact, total price)
+    """
+    # Get user details from database
+    user_data = database.get_user_contact(user_id)
+    
+    # Claim all seats in one atomic statement; the price is the show's
+    # current one, read in the booking transaction
+    booking_id, conflicts = database.book_seats(
+        show['movie_id'],
+        seats,
+        user_id,
+        holder=holder
+    )
+    total_price = None
+    if booking_id:
+        booking = database.get_booking(booking_id)
+        total_price = booking['total_amount'] if booking else show['price'] * len(seats)
+    return booking_id, conflicts, user_data, total_price
 
 def check_login_status():
     """
@@ -776,9 +918,21 @@ def check_login_status():
         root.wait_window(login_window)  # Wait for login window to close
         if hasattr(login_window, 'logged_in_user'):
             root.logged_in_user = login_window.logged_in_user
+            root.session_token = login_window.session_token
         return root.logged_in_user is not None
     return True
 
+def end_session():
+    """End the logged-in user's session and clear the login state."""
+    sessions.logout(getattr(root, 'session_token', None))
+    root.session_token = None
+    root.logged_in_user = None
+
+def log_out():
+    """End the session and turn the logout button back into "Login"."""
+    end_session()
+    login_button.config(text="Login")
+
 def create_back_button(parent, command):
     """
     Create styled back button with hover effect.
@@ -823,7 +977,7 @@ def show_seat_selection_window():
     """
     Display seat selection interface with validation.
     """
-    if not selected_movie:
+    if not selected_show_id:
         messagebox.showerror("Error", "Please select a movie first!")
         return
         
@@ -832,13 +986,21 @@ def show_seat_selection_window():
         messagebox.showinfo("Login Required", "Please login to book tickets")
         return
 
-    # Get the selected movie's data
-    active_movies = database.get_active_movies_for_date(None)
-    selected_movie_data = next((m for m in active_movies if m['title'] == selected_movie), None)
-    
+    def show_load_error(e):
+        print(f"[ERROR] Could not load the show: {e}")
+        messagebox.showerror("Error", f"Could not load the show: {str(e)}")
+
+    # The catalog may need reloading, so the show is resolved on a worker
+    run_in_background(load_show, selected_show_id,
+                      on_done=open_seat_window, on_error=show_load_error,
+                      owner=root, key='open_seats')
+
+def open_seat_window(selected_movie_data):
+    """Create the seat selection window for a show (see show_seat_selection_window)."""
     if not selected_movie_data:
-        messagebox.showerror("Error", "Movie data not found!")
+        messagebox.showerror("Show Unavailable", "This show is no longer running. Please pick another show.")
         return
+    selected_movie = selected_movie_data['title']
 
     seat_window = tk.Toplevel()
     seat_window.title(f"Seat Selection - {selected_movie}")
@@ -870,19 +1032,14 @@ def show_seat_selection_window():
     poster_container = tk.Frame(left_frame, bg='#080808')
     poster_container.pack(pady=(40, 0))
     
-    # Fetch poster if not already in cache
-    if selected_movie not in movie_posters:
-        fetch_movie_poster(selected_movie)
-    
-    if selected_movie in movie_posters:
-        poster_label = tk.Label(poster_container, 
-                              image=movie_posters[selected_movie],
-                              bg='#080808')
-        poster_label.pack()
+    # Show cached poster, or a placeholder while it downloads
+    poster_label = create_poster_label(poster_container, selected_movie, '#080808')
+    poster_label.pack()
     
     # Show movie info with show time
     movie_info = tk.Label(poster_container, 
-                         text=f"{selected_movie}\nShow Time: {str(selected_movie_data['show_time'])[:5]}", 
+                         text=(f"{selected_movie}\nShow Time: {str(selected_movie_data['show_time'])[:5]}"
+                               f"\n{selected_movie_data['screen_name'] or ''}"), 
                          font="Helvetica 16 bold",
                          bg="#080808", 
                          fg="#ff3b3b",
@@ -894,7 +1051,7 @@ def show_seat_selection_window():
     right_frame = tk.Frame(main_container, bg='#080808')
     right_frame.pack(side='left', expand=True, fill='both', padx=(0, 30))
     
-    create_seat_layout(right_frame)
+    create_seat_layout(right_frame, selected_movie_data)
 
 def login_function():
     """
@@ -936,41 +1093,70 @@ def refresh_movies_display():
     Update movie display to show current active movies.
     
     Process:
-    1. Clears existing display
-    2. Updates movie dates
-    3. Fetches active movies
-    4. Creates movie cards
-    5. Adds booking button
-    6. Shows message if no movies
+    1. Updates movie dates and fetches active movies (in the background)
+    2. Clears existing display
+    3. Creates one movie card per title, listing its shows
+    4. Adds booking button
+    5. Shows message if no movies
     """
-    global movies_frame
+    run_in_background(load_movie_catalog, on_done=show_movie_catalog,
+                      on_error=show_refresh_error, owner=movies_frame, key='movies')
+
+def load_movie_catalog():
+    """Roll active shows over to today and return today's catalog (worker thread)."""
+    # Update dates for active movies
+    database.update_movie_dates()
+    
+    # Today's shows, grouped by title (cached; admin edits reload it)
+    return database.get_catalog()
+
+def show_refresh_error(e):
+    print(f"Error refreshing movies: {e}")
+    messagebox.showerror("Error", f"Failed to refresh movies: {str(e)}")
+
+def show_movie_catalog(catalog):
+    """Rebuild the movie cards from a catalog (see database.get_catalog)."""
+    global movies_frame, selected_movie, selected_show_id
     
     # Clear existing movies
     for widget in movies_frame.winfo_children():
         widget.destroy()
+    movie_cards.clear()
     
     try:
-        # Update dates for active movies
-        database.update_movie_dates()
+        active_movies = catalog['shows']
+        shows_by_title = catalog['by_title']
         
-        # Get active movies
-        active_movies = database.get_active_movies_for_date(None)
+        # Drop a selection whose show is no longer running
+        if selected_show_id not in catalog['by_id']:
+            selected_movie = None
+            selected_show_id = None
         
         if active_movies:
-            # Create a container for movie cards
-            movies_container = tk.Frame(movies_frame, bg='#101010')
-            movies_container.pack(expand=True, fill='both')
+            # Cards sit in a horizontally scrolling strip so any number of
+            # titles fits the window
+            strip = tk.Canvas(movies_frame, bg='#101010', highlightthickness=0)
+            movies_container = tk.Frame(strip, bg='#101010')
+            strip.create_window((0, 0), window=movies_container, anchor='nw')
+            
+            def fit_strip(event):
+                strip.configure(scrollregion=(0, 0, event.width, event.height),
+                                width=min(event.width, MOVIE_STRIP_MAX_WIDTH),
+                                height=event.height)
+            
+            movies_container.bind('<Configure>', fit_strip)
+            strip.pack()
+            if len(shows_by_title) > CARDS_PER_VIEW:
+                scrollbar = ttk.Scrollbar(movies_frame, orient='horizontal', command=strip.xview)
+                strip.configure(xscrollcommand=scrollbar.set)
+                scrollbar.pack(fill='x')
             
             # Display movies
-            for idx, movie in enumerate(active_movies):
-                movie_data = {
-                    'title': movie['title'],
-                    'genre': movie['genre'],
-                    'price': movie['price'],
-                    'show_time': str(movie['show_time']),
-                    'show_date': movie['show_date']
-                }
-                create_movie_card(movies_container, movie_data, idx)
+            for idx, shows in enumerate(shows_by_title.values()):
+                create_movie_card(movies_container, shows, idx)
+            
+            if selected_show_id:
+                select_show(catalog['by_id'][selected_show_id])
 
             # Add booking button
             book_button = create_premium_button(movies_frame, "BOOK NOW", show_seat_selection_window)
@@ -988,8 +1174,7 @@ def refresh_movies_display():
             no_movies_label.pack(pady=50)
             
     except Exception as e:
-        print(f"Error refreshing movies: {e}")
-        messagebox.showerror("Error", f"Failed to refresh movies: {str(e)}")
+        show_refresh_error(e)
 
 def find_login_button(root_window):
     """
@@ -1032,6 +1217,7 @@ def handle_login_click():
         root.wait_window(login_window)
         if hasattr(login_window, 'logged_in_user') and login_window.logged_in_user:
             root.logged_in_user = login_window.logged_in_user
+            root.session_token = login_window.session_token
             # Update login button text
             login_button.config(text="Logout")
             
@@ -1044,8 +1230,7 @@ def handle_login_click():
                 create_admin_panel(admin_window, root.logged_in_user)
     else:
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
-            root.logged_in_user = None
-            login_button.config(text="Login")  # Directly update the global login_button
+            log_out()
             root.deiconify()  # Show main window if it was hidden
             refresh_movies_display()
 
@@ -1066,8 +1251,7 @@ def handle_admin_logout(admin_window):
     global login_button
     
     if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
-        root.logged_in_user = None
-        login_button.config(text="Login")  # Directly update the global login_button
+        log_out()
         admin_window.destroy()
         root.deiconify()  # Show main window
         refresh_movies_display()
@@ -1088,8 +1272,9 @@ def create_main_widgets(root):
     """
     global movies_frame, main_frame, login_button
     
-    # Add refresh_movies_display as a method of root window
+    # Add refresh_movies_display and log_out as methods of root window
     root.refresh_movies_display = refresh_movies_display
+    root.log_out = log_out
     
     # Create outer frame
     outer_frame = tk.Frame(root, bg='#080808')
@@ -1232,9 +1417,12 @@ def main():
     - Database connection issues
     - Initialization failures
     """
-    global root, movies_frame
+    global root, movies_frame, poster_loader, ticket_renderer
     
     try:
+        # Boot the password hashing processes while the login window opens
+        passwords.start()
+        
         # Check database connection first
         try:
             conn = database.get_db_connection()
@@ -1243,7 +1431,8 @@ def main():
         except Exception as e:
             messagebox.showerror(
                 "Database Error",
-                f"Failed to connect to database. Please check if MySQL is running and credentials are correct.\n\nError: {str(e)}"
+                f"Failed to connect to database. Please check if MySQL is running and credentials are correct "
+                f"(or set DB_BACKEND=sqlite to use a local database file).\n\nError: {str(e)}"
             )
             return
             
@@ -1260,6 +1449,24 @@ def main():
         root = tk.Tk()
         root.title("Nova Movies Booking")
         root.logged_in_user = None
+        root.session_token = None
+        
+        # Background poster downloads report back through the Tk event loop
+        poster_cache = PosterCache(POSTER_CACHE_DIR,
+                                   max_bytes=POSTER_CACHE_MAX_MB * 1024 * 1024,
+                                   ttl=POSTER_CACHE_TTL_DAYS * 24 * 3600)
+        dispatcher = TkDispatcher(root)
+        # Database calls made from the windows run on these workers
+        start_task_runner(dispatcher, max_workers=TASK_WORKERS)
+        poster_loader = PosterLoader(MOVIE_API, dispatcher=dispatcher,
+                                     cache=poster_cache)
+        ticket_renderer = TicketRenderer(dispatcher=dispatcher)
+        
+        # Live seat updates from other kiosks
+        try:
+            seat_feed.start_seat_feed(dispatcher)
+        except Exception as e:
+            print(f"[ERROR] Live seat updates unavailable: {e}")
         
         # Configure root window
         root.configure(bg='#080808')
@@ -1271,6 +1478,14 @@ def main():
         # Start the main event loop
         root.mainloop()
         
+        # Stop background work and release pooled database connections
+        stop_task_runner(wait=True)
+        poster_loader.shutdown()
+        ticket_renderer.shutdown(wait=True)  # Finish writing queued tickets
+        seat_feed.stop_seat_feed()
+        database.close_connection_pool()
+        passwords.shutdown()
+        
     except Exception as e:
         print(f"Error starting application: {e}")
         messagebox.showerror("Error", f"Failed to start application: {str(e)}")
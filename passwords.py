@@ -0,0 +1,216 @@
+"""
+Password hashing for nm_users.password.
+
+Passwords are stored as scrypt hashes with a random per-user salt and
+their cost parameters, so the cost can be raised later without breaking
+existing rows:
+
+    scrypt$<log2 N>$<r>$<p>$<salt, base64>$<hash, base64>
+
+Rows written before this module existed hold a bare, unsalted SHA-256
+hex digest. They still verify, and needs_rehash() tells the login code
+to replace them with a scrypt hash once the right password is known.
+
+scrypt is deliberately slow and memory-hard, so verification runs on a
+small process pool (PASSWORD_WORKERS) with a bounded queue instead of in
+the caller's thread, and successful verifications are remembered for a
+few minutes so a kiosk user logging in again does not pay for it twice.
+The cache stores keyed HMACs, never passwords.
+"""
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+SCHEME = "scrypt"
+# Cost: N = 2**PASSWORD_SCRYPT_LOG_N; memory used is 128 * N * r bytes
+SCRYPT_LOG_N = int(os.getenv("PASSWORD_SCRYPT_LOG_N", "14"))
+SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+# Verifier processes (0 hashes in the calling thread) and how many
+# hash/verify jobs may wait for them before callers are turned away
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "2"))
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", "16"))
+PASSWORD_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_QUEUE_TIMEOUT", "10"))
+
+# Successful verifications remembered, and for how long (seconds)
+VERIFY_CACHE_SIZE = int(os.getenv("PASSWORD_CACHE_SIZE", "1024"))
+VERIFY_CACHE_TTL = float(os.getenv("PASSWORD_CACHE_TTL", "300"))
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(PASSWORD_MAX_PENDING)
+
+_cache = OrderedDict()    # HMAC of (stored hash, password) -> expiry time
+_cache_lock = threading.Lock()
+_cache_key = os.urandom(32)  # Per process, so cache entries are useless elsewhere
+
+
+class PasswordBusyError(Exception):
+    """Too many password hashes are already queued; try again shortly."""
+
+
+def hash_password(password, log_n=None, r=None, p=None):
+    """
+    Hash a password with scrypt and a new random salt.
+
+    Args:
+        password (str): Plain-text password
+        log_n (int): log2 of the scrypt N cost (default SCRYPT_LOG_N)
+        r (int): scrypt block size (default SCRYPT_R)
+        p (int): scrypt parallelism (default SCRYPT_P)
+
+    Returns:
+        str: Encoded hash for nm_users.password
+    """
+    log_n = SCRYPT_LOG_N if log_n is None else log_n
+    r = SCRYPT_R if r is None else r
+    p = SCRYPT_P if p is None else p
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, log_n, r, p)
+    return "$".join((SCHEME, str(log_n), str(r), str(p), _b64(salt), _b64(digest)))
+
+
+def verify_password(password, stored):
+    """
+    Check a password against a stored hash (scrypt or legacy SHA-256).
+
+    Runs in the calling thread and ignores the cache; see check_password.
+
+    Returns:
+        bool: True if the password matches
+    """
+    if not stored:
+        return False
+    if stored.startswith(SCHEME + "$"):
+        try:
+            _, log_n, r, p, salt, digest = stored.split("$")
+            expected = base64.b64decode(digest)
+            actual = _scrypt(password, base64.b64decode(salt), int(log_n), int(r), int(p))
+        except (ValueError, TypeError):
+            print("[ERROR] Malformed password hash")
+            return False
+        return hmac.compare_digest(actual, expected)
+    # Legacy rows: unsalted SHA-256 hex digest
+    legacy = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(legacy, stored)
+
+
+def needs_rehash(stored):
+    """True if a stored hash is legacy SHA-256 or uses other cost parameters."""
+    if not stored or not stored.startswith(SCHEME + "$"):
+        return True
+    try:
+        _, log_n, r, p, _, _ = stored.split("$")
+        return (int(log_n), int(r), int(p)) != (SCRYPT_LOG_N, SCRYPT_R, SCRYPT_P)
+    except ValueError:
+        return True
+
+
+def check_password(password, stored):
+    """
+    Verify a password on the verifier pool, using the verification cache.
+
+    Raises:
+        PasswordBusyError: If the verifier queue stays full for
+            PASSWORD_QUEUE_TIMEOUT seconds
+    """
+    key = _cache_entry(password, stored)
+    with _cache_lock:
+        expires = _cache.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                _cache.move_to_end(key)
+                return True
+            del _cache[key]
+
+    ok = _run(verify_password, password, stored)
+    if ok and VERIFY_CACHE_SIZE > 0:
+        with _cache_lock:
+            _cache[key] = time.monotonic() + VERIFY_CACHE_TTL
+            _cache.move_to_end(key)
+            while len(_cache) > VERIFY_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return ok
+
+
+def make_password_hash(password):
+    """
+    hash_password on the verifier pool (for registration and rehashing).
+
+    Raises:
+        PasswordBusyError: If the verifier queue stays full
+    """
+    return _run(hash_password, password)
+
+
+def clear_cache():
+    """Forget all remembered verifications (e.g. after a password change)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def start():
+    """
+    Start the verifier processes ahead of the first login.
+
+    They are spawned, not forked, so each boots a fresh interpreter; call
+    this at startup so the first login does not wait for that.
+    """
+    if PASSWORD_WORKERS > 0:
+        pool = _get_pool()
+        for _ in range(PASSWORD_WORKERS):
+            pool.submit(int)
+
+
+def shutdown():
+    """Stop the verifier processes."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def _run(func, *args):
+    if PASSWORD_WORKERS <= 0:
+        return func(*args)
+    if not _pending.acquire(timeout=PASSWORD_QUEUE_TIMEOUT):
+        raise PasswordBusyError("Too many logins in progress, please try again")
+    try:
+        return _get_pool().submit(func, *args).result()
+    finally:
+        _pending.release()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the Tk app already runs worker, poster and
+            # seat-feed threads when the first login needs the pool
+            _pool = ProcessPoolExecutor(max_workers=PASSWORD_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _scrypt(password, salt, log_n, r, p):
+    n = 1 << log_n
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=128 * n * r * p + (1 << 20), dklen=HASH_BYTES)
+
+
+def _cache_entry(password, stored):
+    return hmac.new(_cache_key, f"{stored}\0{password}".encode(), hashlib.sha256).digest()
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
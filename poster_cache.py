@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from PIL import Image
+
+THUMB_SIZE = (130, 195)
+TICKET_SIZE = (200, 300)
+VARIANTS = ('thumb', 'ticket')
+INDEX_FILE = "index.json"
+
+
+def normalize_title(title):
+    """Normalize a movie title so 'The Matrix ' and 'the  matrix' share a cache entry."""
+    return re.sub(r'\s+', ' ', title).strip().lower()
+
+
+def title_key(title):
+    """Return the file-system safe cache key for a movie title."""
+    return hashlib.sha1(normalize_title(title).encode('utf-8')).hexdigest()
+
+
+class PosterCache:
+    """
+    Persistent on-disk cache of resized movie posters.
+
+    Each movie is keyed by its normalized title. An entry remembers the hash
+    of the OMDB response it was built from, so revalidation can tell whether
+    the poster changed without downloading the image again. Two variants are
+    stored per poster: the 130x195 card thumbnail and a 200x300 version used
+    on printed tickets.
+
+    Args:
+        directory (str): Cache directory (created if missing)
+        max_bytes (int): Total size cap; least recently used entries are
+            evicted beyond it
+        ttl (float): Seconds after which an entry should be revalidated
+
+    Movies without a poster are cached too (without images) so they do not
+    trigger a lookup on every launch.
+    """
+
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024, ttl=7 * 24 * 3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(directory, exist_ok=True)
+        self._index = self._load_index()
+
+    def contains(self, title):
+        """Check whether the cache knows this movie (with or without a poster)."""
+        with self._lock:
+            return title_key(title) in self._index
+
+    def get(self, title, variant='thumb'):
+        """
+        Load a cached poster variant.
+
+        Returns:
+            PIL.Image.Image: The cached image
+            None: If the movie is not cached or has no poster
+        """
+        key = title_key(title)
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry or not entry.get('files'):
+                return None
+            entry['last_access'] = time.time()
+            self._dirty = True
+            path = os.path.join(self.directory, entry['files'][variant])
+
+        try:
+            with Image.open(path) as image:
+                image.load()
+                return image.copy()
+        except (OSError, KeyError):
+            # File went missing or is corrupt - forget the entry
+            self.remove(title)
+            return None
+
+    def is_stale(self, title):
+        """Check whether the entry is older than the TTL."""
+        with self._lock:
+            entry = self._index.get(title_key(title))
+            return entry is None or time.time() - entry['validated_at'] > self.ttl
+
+    def matches(self, title, omdb_hash):
+        """Check whether the cached entry was built from this OMDB response."""
+        with self._lock:
+            entry = self._index.get(title_key(title))
+            return entry is not None and entry['omdb_hash'] == omdb_hash
+
+    def mark_validated(self, title):
+        """Reset the TTL after confirming the entry is still current."""
+        with self._lock:
+            entry = self._index.get(title_key(title))
+            if entry:
+                entry['validated_at'] = time.time()
+                self._dirty = True
+        self.flush()
+
+    def store(self, title, omdb_hash, poster_url, image=None):
+        """
+        Cache a poster built from an OMDB response.
+
+        Args:
+            title (str): Movie title
+            omdb_hash (str): Hash of the OMDB metadata response
+            poster_url (str): Poster URL from the response (None if absent)
+            image (PIL.Image.Image): Full-size poster, or None if the movie
+                has no poster
+
+        Returns:
+            PIL.Image.Image: The thumbnail variant, or None
+        """
+        key = title_key(title)
+        files = {}
+        size = 0
+        thumb = None
+        if image is not None:
+            image = image.convert('RGB')
+            resized = {
+                'thumb': image.resize(THUMB_SIZE, Image.Resampling.LANCZOS),
+                'ticket': image.resize(TICKET_SIZE, Image.Resampling.LANCZOS),
+            }
+            for variant, variant_image in resized.items():
+                filename = f"{key}-{omdb_hash[:12]}.{variant}.png"
+                path = os.path.join(self.directory, filename)
+                variant_image.save(path + ".tmp", format='PNG')
+                os.replace(path + ".tmp", path)
+                files[variant] = filename
+                size += os.path.getsize(path)
+            thumb = resized['thumb']
+
+        now = time.time()
+        with self._lock:
+            old = self._index.get(key)
+            self._index[key] = {
+                'title': title,
+                'omdb_hash': omdb_hash,
+                'poster_url': poster_url,
+                'files': files,
+                'bytes': size,
+                'validated_at': now,
+                'last_access': now,
+            }
+            stale_files = [f for f in (old or {}).get('files', {}).values()
+                           if f not in files.values()]
+            evicted = self._evict_locked()
+            self._dirty = True
+
+        self._delete_files(stale_files + evicted)
+        self.flush()
+        return thumb
+
+    def remove(self, title):
+        """Drop a movie from the cache."""
+        with self._lock:
+            entry = self._index.pop(title_key(title), None)
+            self._dirty = True
+        if entry:
+            self._delete_files(entry.get('files', {}).values())
+        self.flush()
+
+    def total_bytes(self):
+        """Total size of cached image files."""
+        with self._lock:
+            return sum(entry['bytes'] for entry in self._index.values())
+
+    def flush(self):
+        """Write the index to disk if it changed (atomic replace)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._index)
+            self._dirty = False
+        path = os.path.join(self.directory, INDEX_FILE)
+        try:
+            with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"[ERROR] Failed to save poster cache index: {e}")
+
+    def _evict_locked(self):
+        """Evict least recently used entries until under max_bytes (lock held)."""
+        total = sum(entry['bytes'] for entry in self._index.values())
+        evicted = []
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if not entry['bytes']:
+                continue
+            del self._index[key]
+            total -= entry['bytes']
+            evicted.extend(entry['files'].values())
+        return evicted
+
+    def _delete_files(self, filenames):
+        for filename in filenames:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+
+    def _load_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Poster cache index unreadable, starting empty: {e}")
+            return {}
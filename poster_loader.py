@@ -0,0 +1,169 @@
+import hashlib
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import requests
+from PIL import Image
+
+OMDB_URL = "http://www.omdbapi.com/"
+POSTER_SIZE = (130, 195)
+
+
+class PosterLoader:
+    """
+    Background OMDB poster fetcher.
+
+    Posters are downloaded on a small thread pool so a slow OMDB response
+    never blocks the Tk main loop. Results are delivered as resized PIL
+    images to the callbacks passed to request(); when a dispatcher (see
+    tk_dispatch.TkDispatcher) is given, callbacks run on the Tk thread.
+
+    Args:
+        api_key (str): OMDB API key
+        dispatcher: Object with post(callback, *args), or None to call
+            back directly on the worker thread
+        max_workers (int): Maximum number of concurrent downloads
+        timeout: requests timeout per HTTP call, (connect, read) seconds
+        base_url (str): OMDB endpoint; point at a local stub server in tests
+        size (tuple): Poster size delivered to callbacks
+        cache: Optional poster_cache.PosterCache for persistent storage
+
+    Features:
+    - Bounded concurrency
+    - Per-request timeouts
+    - Deduplication: concurrent requests for one title share one download
+    - Disk cache with background revalidation of stale entries
+    """
+
+    def __init__(self, api_key, dispatcher=None, max_workers=4,
+                 timeout=(3.05, 10), base_url=OMDB_URL, size=POSTER_SIZE,
+                 cache=None):
+        self.api_key = api_key
+        self.cache = cache
+        self.dispatcher = dispatcher
+        self.timeout = timeout
+        self.base_url = base_url
+        self.size = size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="poster")
+        self._lock = threading.Lock()
+        self._pending = {}    # title -> list of callbacks waiting for it
+        self._local = threading.local()
+
+    def request(self, title, callback):
+        """
+        Fetch the poster for `title` in the background.
+
+        callback(title, image) is called once the download finishes; image
+        is a PIL Image, or None if the movie has no poster or the fetch
+        failed. Pass callback=None to refresh the disk cache only.
+        """
+        with self._lock:
+            if title in self._pending:
+                self._pending[title].append(callback)
+                return
+            self._pending[title] = [callback]
+        self._executor.submit(self._run, title)
+
+    def load_cached(self, title):
+        """
+        Look a poster up in the disk cache without touching the network.
+
+        Stale entries are still returned, and a background revalidation
+        is started for them.
+
+        Returns:
+            tuple: (hit, image) - hit is False if the movie is not cached;
+            image is None for cached movies that have no poster
+        """
+        if self.cache is None or not self.cache.contains(title):
+            return False, None
+        image = self.cache.get(title)
+        if self.cache.is_stale(title):
+            self.revalidate(title)
+        return True, image
+
+    def revalidate(self, title):
+        """Re-check OMDB for `title` in the background and refresh the cache."""
+        self.request(title, None)
+
+    def is_pending(self, title):
+        """Check whether a download for `title` is in flight."""
+        with self._lock:
+            return title in self._pending
+
+    def fetch(self, title):
+        """
+        Download and resize a poster synchronously.
+
+        Returns:
+            PIL.Image.Image: Resized poster
+            None: If the movie has no poster
+        """
+        session = self._session()
+        params = {'t': title, 'apikey': self.api_key}
+        url = f"{self.base_url}?{urllib.parse.urlencode(params)}"
+
+        response = session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        omdb_hash = hashlib.sha256(response.content).hexdigest()
+
+        if self.cache is not None and self.cache.matches(title, omdb_hash):
+            # OMDB data unchanged - keep the cached images
+            self.cache.mark_validated(title)
+            image = self.cache.get(title)
+            # get() drops entries whose files went missing; re-download those
+            if image is not None or self.cache.matches(title, omdb_hash):
+                return image
+
+        movie_data = response.json()
+        poster_url = movie_data.get('Poster')
+        if not poster_url or poster_url == 'N/A':
+            if self.cache is not None:
+                self.cache.store(title, omdb_hash, None)
+            return None
+
+        poster_response = session.get(poster_url, timeout=self.timeout)
+        poster_response.raise_for_status()
+        image = Image.open(BytesIO(poster_response.content))
+        image = image.convert('RGB')
+        if self.cache is not None:
+            self.cache.store(title, omdb_hash, poster_url, image)
+        return image.resize(self.size, Image.Resampling.LANCZOS)
+
+    def shutdown(self, wait=False):
+        """Stop accepting work; in-flight downloads are abandoned if wait=False."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        if self.cache is not None:
+            self.cache.flush()
+
+    def _run(self, title):
+        try:
+            image = self.fetch(title)
+        except Exception as e:
+            print(f"Error fetching poster for {title}: {e}")
+            image = None
+
+        with self._lock:
+            callbacks = self._pending.pop(title, [])
+
+        for callback in callbacks:
+            if callback is None:
+                continue
+            if self.dispatcher is not None:
+                self.dispatcher.post(callback, title, image)
+            else:
+                try:
+                    callback(title, image)
+                except Exception as e:
+                    print(f"[ERROR] Poster callback failed for {title}: {e}")
+
+    def _session(self):
+        # requests.Session is not thread-safe, so keep one per worker thread
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
@@ -0,0 +1,195 @@
+"""
+Seat grid drawn on a single Canvas, shared by the customer and admin windows.
+
+Every seat is one rectangle and one text item instead of a Button or
+Frame widget, so opening, refreshing and closing a grid costs a few
+canvas items per seat rather than a widget tree per seat. One <Motion>
+and one <Button-1> binding serve the whole grid: the pointer position is
+turned into a grid cell by arithmetic and the cell into a seat through a
+lookup table precomputed from the seat map.
+"""
+import tkinter as tk
+from array import array
+
+SEAT_TAG = 'seat'
+LABEL_TAG = 'row_label'
+
+
+def fit_cell_size(seat_map, max_width, max_height, largest=32, smallest=14, gap=4):
+    """
+    Pick the largest seat size (pixels) that fits a seat map in a box.
+
+    Args:
+        seat_map (SeatMap): Layout to draw
+        max_width (int): Available width, including the row-label column
+        max_height (int): Available height
+        largest (int): Size used when the map fits comfortably
+        smallest (int): Never go below this (the canvas grows instead)
+        gap (int): Space between seats
+    """
+    columns = seat_map.width + 1  # Row labels take one column
+    cell = min((max_width + gap) // columns - gap,
+               (max_height + gap) // seat_map.height - gap)
+    return max(smallest, min(largest, cell))
+
+
+class SeatCanvas(tk.Canvas):
+    """
+    Canvas that draws a seat map and tracks one state per seat.
+
+    States are names from `styles` (e.g. 'available', 'booked'); the first
+    one is every seat's initial state. set_state() and paint() only touch
+    the items of seats whose state actually changes.
+
+    Args:
+        parent: Parent widget
+        seat_map (SeatMap): Layout to draw
+        styles (dict): state -> (fill color, text color)
+        cell (int): Seat size in pixels (see fit_cell_size)
+        gap (int): Space between seats in pixels
+        bg (str): Canvas background
+        on_click (callable): Called with the seat id of a clicked seat
+            whose state is in `clickable`
+        clickable (iterable): States that react to clicks (hand cursor)
+        hover (dict): state -> fill color while the pointer is over it
+        tooltip (tuple): (text, states) - text shown next to the pointer
+            over seats in these states
+        label_color (str): Color of the row letters
+    """
+
+    def __init__(self, parent, seat_map, styles, cell=32, gap=4, bg='#080808',
+                 on_click=None, clickable=(), hover=None, tooltip=None,
+                 label_color='#666666'):
+        self.seat_map = seat_map
+        self.styles = styles
+        self.cell = cell
+        self.pitch = cell + gap
+        self.on_click = on_click
+        self.clickable = set(clickable)
+        self.hover = hover or {}
+        self.tooltip_text, tooltip_states = tooltip or (None, ())
+        self.tooltip_states = set(tooltip_states)
+        self.label_color = label_color
+        self._origin_x = self.pitch  # Row-label column
+
+        super().__init__(parent, bg=bg, highlightthickness=0,
+                         width=self._origin_x + seat_map.width * self.pitch - gap,
+                         height=seat_map.height * self.pitch - gap)
+
+        initial = next(iter(styles))
+        count = seat_map.total_seats
+        self._states = [initial] * count
+        self._rects = array('l', [0]) * count
+        self._texts = array('l', [0]) * count
+        # Grid cell (y * width + x) -> seat index, -1 for aisles and gaps
+        self._cell_index = array('l', [-1]) * (seat_map.width * seat_map.height)
+        self._hovered = -1
+        self._tooltip = None
+        self._draw(initial)
+
+        self.bind('<Motion>', self._on_motion)
+        self.bind('<Leave>', self._on_leave)
+        self.bind('<Button-1>', self._on_button)
+
+    def state(self, index):
+        """Return the state of seat `index` (its bit position)."""
+        return self._states[index]
+
+    def set_state(self, index, state):
+        """Set one seat's state, recoloring it only if the state changed."""
+        if self._states[index] == state:
+            return
+        self._states[index] = state
+        self._paint_seat(index)
+
+    def paint(self, bitmap, state):
+        """Set every seat whose bit is set in `bitmap` to `state`."""
+        bitmap &= self.seat_map.full_bitmap
+        while bitmap:
+            low_bit = bitmap & -bitmap
+            self.set_state(low_bit.bit_length() - 1, state)
+            bitmap ^= low_bit
+
+    def seat_at(self, x, y):
+        """Return the index of the seat under canvas point (x, y), or -1."""
+        column, offset_x = divmod(int(self.canvasx(x)) - self._origin_x, self.pitch)
+        row, offset_y = divmod(int(self.canvasy(y)), self.pitch)
+        if (offset_x >= self.cell or offset_y >= self.cell
+                or not 0 <= column < self.seat_map.width
+                or not 0 <= row < self.seat_map.height):
+            return -1
+        return self._cell_index[row * self.seat_map.width + column]
+
+    def _draw(self, initial):
+        seat_map = self.seat_map
+        font_size = 8 if self.cell >= 26 else 7
+        show_text = self.cell >= 20
+        for row, y in zip(seat_map.rows, seat_map.row_ys):
+            self.create_text(self.cell // 2, y * self.pitch + self.cell // 2,
+                             text=row, fill=self.label_color,
+                             font=("Helvetica", 10, "bold"), tags=(LABEL_TAG,))
+
+        fill, text_color = self.styles[initial]
+        for index, seat_id in enumerate(seat_map.seat_ids):
+            x = seat_map.xs[index]
+            y = seat_map.ys[index]
+            self._cell_index[y * seat_map.width + x] = index
+            x0 = self._origin_x + x * self.pitch
+            y0 = y * self.pitch
+            self._rects[index] = self.create_rectangle(
+                x0, y0, x0 + self.cell, y0 + self.cell,
+                fill=fill, outline='', tags=(SEAT_TAG,))
+            self._texts[index] = self.create_text(
+                x0 + self.cell // 2, y0 + self.cell // 2,
+                text=seat_id if show_text else '', fill=text_color,
+                font=("Helvetica", font_size), tags=(SEAT_TAG,))
+
+    def _paint_seat(self, index):
+        state = self._states[index]
+        fill, text_color = self.styles[state]
+        if index == self._hovered and state in self.hover:
+            fill = self.hover[state]
+        self.itemconfigure(self._rects[index], fill=fill)
+        self.itemconfigure(self._texts[index], fill=text_color)
+        if index == self._hovered:
+            self.configure(cursor='hand2' if state in self.clickable else '')
+
+    def _on_motion(self, event):
+        index = self.seat_at(event.x, event.y)
+        if index != self._hovered:
+            previous, self._hovered = self._hovered, index
+            self._hide_tooltip()
+            if previous >= 0:
+                self._paint_seat(previous)
+            if index >= 0:
+                self._paint_seat(index)
+                if self._states[index] in self.tooltip_states:
+                    self._show_tooltip(event)
+            else:
+                self.configure(cursor='')
+
+    def _on_leave(self, event):
+        previous, self._hovered = self._hovered, -1
+        self._hide_tooltip()
+        if previous >= 0:
+            self._paint_seat(previous)
+        self.configure(cursor='')
+
+    def _on_button(self, event):
+        index = self.seat_at(event.x, event.y)
+        if index >= 0 and self.on_click and self._states[index] in self.clickable:
+            self.on_click(self.seat_map.seat_ids[index])
+
+    def _show_tooltip(self, event):
+        if not self.tooltip_text:
+            return
+        self._tooltip = tk.Toplevel(self)
+        self._tooltip.wm_overrideredirect(True)
+        self._tooltip.wm_geometry(f"+{event.x_root + 10}+{event.y_root + 10}")
+        tk.Label(self._tooltip, text=self.tooltip_text, bg='#333333', fg='white',
+                 relief='solid', borderwidth=1).pack()
+
+    def _hide_tooltip(self):
+        if self._tooltip is not None:
+            self._tooltip.destroy()
+            self._tooltip = None
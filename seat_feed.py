@@ -0,0 +1,120 @@
+import itertools
+import threading
+
+import database
+
+_default_feed = None
+
+
+class SeatFeed:
+    """
+    Process-wide subscriber for the nm_seat_events change feed.
+
+    One background thread waits for new events (see
+    database.wait_for_seat_events) and fans them out to every subscribed
+    window, so an admin tab and any number of seat windows share a single
+    cheap query stream instead of each re-reading seats.
+
+    Args:
+        dispatcher: Object with post(callback, *args) used to run
+            subscriber callbacks on the Tk thread (None = worker thread)
+        timeout (float): Wait duration before re-arming
+    """
+
+    def __init__(self, dispatcher=None, timeout=25):
+        self.dispatcher = dispatcher
+        self.timeout = timeout
+        self.cursor = None
+        self._subscribers = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start following the feed from the newest existing event."""
+        if self._thread is not None:
+            return
+        self.cursor = database.SeatEventCursor()
+        self._thread = threading.Thread(target=self._run, name="seat-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+
+    def subscribe(self, callback, movie_id=None):
+        """
+        Register callback(events) for seat changes.
+
+        Args:
+            callback: Called with a list of event dicts
+            movie_id: Only deliver events for this movie (events that
+                affect all movies are always delivered)
+
+        Returns:
+            callable: Call it to unsubscribe
+        """
+        subscription_id = next(self._ids)
+        with self._lock:
+            self._subscribers[subscription_id] = (callback, movie_id)
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers.pop(subscription_id, None)
+
+        return unsubscribe
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                events = database.wait_for_seat_events(self.cursor, timeout=self.timeout)
+            except Exception as e:
+                print(f"[ERROR] Seat feed poll failed: {e}")
+                self._stop.wait(5)
+                continue
+
+            if events:
+                self._publish(events)
+
+    def _publish(self, events):
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+
+        for callback, movie_id in subscribers:
+            if movie_id is None:
+                matching = events
+            else:
+                matching = [e for e in events
+                            if e['movie_id'] is None or e['movie_id'] == movie_id]
+            if not matching:
+                continue
+            if self.dispatcher is not None:
+                self.dispatcher.post(callback, matching)
+            else:
+                try:
+                    callback(matching)
+                except Exception as e:
+                    print(f"[ERROR] Seat feed subscriber failed: {e}")
+
+
+def start_seat_feed(dispatcher=None):
+    """Create and start the application-wide seat feed."""
+    global _default_feed
+    if _default_feed is None:
+        _default_feed = SeatFeed(dispatcher)
+        _default_feed.start()
+    return _default_feed
+
+
+def get_seat_feed():
+    """Return the application-wide seat feed, or None if it is not running."""
+    return _default_feed
+
+
+def stop_seat_feed():
+    """Stop the application-wide seat feed."""
+    global _default_feed
+    if _default_feed is not None:
+        _default_feed.stop()
+        _default_feed = None
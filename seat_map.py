@@ -0,0 +1,245 @@
+"""
+Seat maps: the seat layout of each screen.
+
+A layout is a JSON file (or TOML, on Python 3.11+) in SEAT_MAP_DIR,
+named after nm_screens.layout, e.g. seat_maps/standard.json:
+
+    {
+        "rows": "ABCDEFG",
+        "seats_per_row": 7,
+        "aisles_after": [4],
+        "row_gaps_after": [],
+        "missing": [],
+        "categories": {"standard": "ABCDEFG"}
+    }
+
+rows           one letter per row, front row first
+seats_per_row  seats in every row, numbered from 1
+aisles_after   seat numbers followed by an aisle
+row_gaps_after rows followed by a cross aisle
+missing        seats left out of the grid (corners, wheelchair spaces)
+categories     category name -> rows; rows not listed are "standard"
+
+Each layout is parsed once into a SeatMap, which precomputes every seat's
+id, bit position, grid coordinates and category in flat arrays. Bit n of
+an occupancy bitmap is seat n of the map, numbered row by row from the
+front, so the standard 7x7 map keeps the A1-G7 bit positions used by
+tickets printed before seat maps existed.
+"""
+import json
+import os
+import threading
+from array import array
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: JSON layouts only
+    tomllib = None
+
+DEFAULT_LAYOUT = "standard"
+DEFAULT_CATEGORY = "standard"
+SEAT_MAP_DIR = os.getenv(
+    "SEAT_MAP_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "seat_maps")
+)
+# nm_seats.seat_number is VARCHAR(3): one row letter and up to two digits
+MAX_SEATS_PER_ROW = 99
+
+_seat_maps = {}
+_seat_maps_lock = threading.Lock()
+
+
+class SeatMap:
+    """
+    Precomputed geometry of one seat layout.
+
+    Seat n (its bit position in occupancy bitmaps) has id seat_ids[n],
+    grid position (xs[n], ys[n]) and category categories[category_ids[n]].
+    Grid positions are in seat-sized cells and already include aisles and
+    cross aisles, so a UI only has to multiply by its cell size.
+
+    Args:
+        name (str): Layout name (nm_screens.layout)
+        rows (str): Row letters, front row first
+        seats_per_row (int): Seats per row, numbered from 1
+        aisles_after (iterable): Seat numbers followed by an aisle
+        row_gaps_after (iterable): Row letters followed by a cross aisle
+        missing (iterable): Seat ids left out of the grid
+        categories (dict): Category name -> row letters
+    """
+
+    def __init__(self, name, rows, seats_per_row, aisles_after=(), row_gaps_after=(),
+                 missing=(), categories=None):
+        rows = "".join(rows).upper()
+        if not rows or not rows.isalpha() or len(set(rows)) != len(rows):
+            raise ValueError("rows must be distinct letters")
+        if not 1 <= seats_per_row <= MAX_SEATS_PER_ROW:
+            raise ValueError(f"seats_per_row must be 1-{MAX_SEATS_PER_ROW}")
+
+        aisles_after = set(aisles_after)
+        row_gaps_after = {row.upper() for row in row_gaps_after}
+        missing = {seat.upper() for seat in missing}
+        category_names = [DEFAULT_CATEGORY]
+        row_category = {}
+        for category, category_rows in (categories or {}).items():
+            if category not in category_names:
+                category_names.append(category)
+            for row in category_rows.upper():
+                row_category[row] = category_names.index(category)
+
+        # Cell x of each seat number, shifted right by the aisles before it
+        col_x = []
+        x = 0
+        for number in range(1, seats_per_row + 1):
+            col_x.append(x)
+            x += 2 if number in aisles_after and number < seats_per_row else 1
+
+        self.name = name
+        self.rows = rows
+        self.seats_per_row = seats_per_row
+        self.categories = tuple(category_names)
+        self.width = x
+        self.aisle_xs = tuple(col_x[n - 1] + 1 for n in sorted(aisles_after)
+                              if 0 < n < seats_per_row)
+
+        seat_ids = []
+        xs = array('H')
+        ys = array('H')
+        category_ids = array('B')
+        row_ys = []
+        gap_ys = []
+        y = 0
+        for row in rows:
+            row_ys.append(y)
+            for number in range(1, seats_per_row + 1):
+                seat_id = f"{row}{number}"
+                if seat_id in missing:
+                    continue
+                seat_ids.append(seat_id)
+                xs.append(col_x[number - 1])
+                ys.append(y)
+                category_ids.append(row_category.get(row, 0))
+            y += 1
+            if row in row_gaps_after and row != rows[-1]:
+                gap_ys.append(y)
+                y += 1
+
+        self.seat_ids = tuple(seat_ids)
+        self.xs = xs
+        self.ys = ys
+        self.category_ids = category_ids
+        self.row_ys = tuple(row_ys)
+        self.gap_ys = tuple(gap_ys)
+        self.height = y
+        self.total_seats = len(seat_ids)
+        self.full_bitmap = (1 << self.total_seats) - 1
+        self._index = {seat_id: n for n, seat_id in enumerate(seat_ids)}
+
+    def __contains__(self, seat_id):
+        return seat_id in self._index
+
+    def __len__(self):
+        return self.total_seats
+
+    def __repr__(self):
+        return f"<SeatMap {self.name}: {len(self.rows)} rows, {self.total_seats} seats>"
+
+    def index(self, seat_id):
+        """Return the bit position of a seat like 'C5'."""
+        try:
+            return self._index[seat_id.upper()]
+        except (KeyError, AttributeError):
+            raise ValueError(f"Invalid seat number for layout '{self.name}': {seat_id}") from None
+
+    def category(self, seat_id):
+        """Return the category name of a seat."""
+        return self.categories[self.category_ids[self.index(seat_id)]]
+
+    def to_bitmap(self, seat_ids):
+        """Pack seat ids into an occupancy bitmap."""
+        bitmap = 0
+        for seat_id in seat_ids:
+            bitmap |= 1 << self.index(seat_id)
+        return bitmap
+
+    def to_seats(self, bitmap):
+        """Unpack an occupancy bitmap into seat ids, in seat order."""
+        seats = []
+        bitmap &= self.full_bitmap
+        while bitmap:
+            low_bit = bitmap & -bitmap
+            seats.append(self.seat_ids[low_bit.bit_length() - 1])
+            bitmap ^= low_bit
+        return seats
+
+    def category_bitmap(self, category):
+        """Return a bitmap of every seat in a category."""
+        category_id = self.categories.index(category)
+        bitmap = 0
+        for n, seat_category in enumerate(self.category_ids):
+            if seat_category == category_id:
+                bitmap |= 1 << n
+        return bitmap
+
+
+def load_seat_map(name=None):
+    """
+    Get the SeatMap for a layout name, parsing its file on first use.
+
+    Args:
+        name (str): Layout name (default: DEFAULT_LAYOUT)
+
+    Returns:
+        SeatMap: Cached, shared instance (treat as read-only)
+
+    Raises:
+        ValueError: If the layout file is missing or invalid
+    """
+    name = name or DEFAULT_LAYOUT
+    seat_map = _seat_maps.get(name)
+    if seat_map is not None:
+        return seat_map
+    with _seat_maps_lock:
+        seat_map = _seat_maps.get(name)
+        if seat_map is None:
+            seat_map = _seat_maps[name] = _read_seat_map(name)
+        return seat_map
+
+
+def available_layouts():
+    """List the layout names found in SEAT_MAP_DIR."""
+    extensions = ('.json', '.toml') if tomllib else ('.json',)
+    try:
+        files = os.listdir(SEAT_MAP_DIR)
+    except OSError:
+        return []
+    return sorted({os.path.splitext(f)[0] for f in files
+                   if os.path.splitext(f)[1] in extensions})
+
+
+def _read_seat_map(name):
+    if os.path.basename(name) != name:
+        raise ValueError(f"Invalid seat map name: {name}")
+    path = os.path.join(SEAT_MAP_DIR, f"{name}.json")
+    toml_path = os.path.join(SEAT_MAP_DIR, f"{name}.toml")
+    if not os.path.exists(path) and not (tomllib and os.path.exists(toml_path)):
+        raise ValueError(f"Seat map '{name}' not found in {SEAT_MAP_DIR}")
+    try:
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                spec = json.load(f)
+        else:
+            with open(toml_path, 'rb') as f:
+                spec = tomllib.load(f)
+        return SeatMap(
+            name,
+            spec['rows'],
+            int(spec['seats_per_row']),
+            aisles_after=spec.get('aisles_after', ()),
+            row_gaps_after=spec.get('row_gaps_after', ()),
+            missing=spec.get('missing', ()),
+            categories=spec.get('categories'),
+        )
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        # Parse errors from json and tomllib are ValueErrors too
+        raise ValueError(f"Invalid seat map '{name}': {e}") from None
@@ -0,0 +1,295 @@
+"""
+Login sessions and login rate limiting.
+
+A successful login() returns an opaque session token; the windows keep
+the token and look the user up with get_session_user() instead of
+trusting a user dict on their own. Sessions expire after SESSION_TTL
+seconds without use, and logout() ends one at once.
+
+The session store lives in memory. With SESSION_STORE_PATH set it is
+also written to that JSON file whenever a session starts or ends, so
+sessions survive a restart. The file holds SHA-256 digests of the
+tokens, never the tokens themselves.
+
+Every login attempt first takes a token from two token buckets: one for
+the username and one for the kiosk (KIOSK_ID). An empty bucket rejects
+the attempt with LoginThrottledError before the database or the password
+hasher is touched, so a burst of guesses against one account, or from
+one kiosk, costs next to nothing. Buckets refill continuously; a
+successful login refills the username's bucket.
+"""
+import hashlib
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from collections import OrderedDict
+
+import database
+
+# Seconds a session stays valid without being used
+SESSION_TTL = float(os.getenv("SESSION_TTL", "1800"))
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "")
+
+# Token buckets: attempts allowed in a burst, then one more every REFILL seconds
+LOGIN_USER_BURST = int(os.getenv("LOGIN_USER_BURST", "5"))
+LOGIN_USER_REFILL = float(os.getenv("LOGIN_USER_REFILL", "30"))
+LOGIN_KIOSK_BURST = int(os.getenv("LOGIN_KIOSK_BURST", "20"))
+LOGIN_KIOSK_REFILL = float(os.getenv("LOGIN_KIOSK_REFILL", "3"))
+# Buckets remembered per limiter; the least recently used are dropped
+LOGIN_LIMITER_MAX_KEYS = int(os.getenv("LOGIN_LIMITER_MAX_KEYS", "10000"))
+
+KIOSK_ID = os.getenv("KIOSK_ID") or socket.gethostname()
+
+_store = None
+_user_limiter = None
+_kiosk_limiter = None
+_lock = threading.Lock()
+
+
+class LoginThrottledError(Exception):
+    """Too many login attempts; retry_after says how many seconds to wait."""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Too many login attempts. Please try again in {int(retry_after) + 1} seconds.")
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by a string (thread-safe).
+
+    Args:
+        burst (int): Bucket size: attempts allowed back to back
+        refill (float): Seconds to earn back one attempt
+        max_keys (int): Buckets kept; a dropped bucket starts over full,
+            which only matters for keys idle long enough to be full anyway
+    """
+
+    def __init__(self, burst, refill, max_keys=10000):
+        self.burst = burst
+        self.refill = refill
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, last update]
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        """
+        Take one token from key's bucket.
+
+        Returns:
+            float: 0 if the attempt is allowed, else seconds until it would be
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            if self.refill > 0:
+                tokens = min(self.burst, tokens + (now - last) / self.refill)
+            self._buckets[key] = [tokens, now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            if tokens < 1:
+                return (1 - tokens) * self.refill
+            self._buckets[key][0] = tokens - 1
+            return 0.0
+
+    def reset(self, key):
+        """Refill key's bucket."""
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class SessionStore:
+    """
+    Session tokens and the user each one belongs to (thread-safe).
+
+    Args:
+        ttl (float): Idle seconds before a session expires
+        path (str): JSON file to persist sessions in, or None for memory only
+    """
+
+    def __init__(self, ttl, path=None):
+        self.ttl = ttl
+        self.path = path
+        self._sessions = {}  # SHA-256 of token -> {'user', 'kiosk', 'expires'}
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def create(self, user, kiosk=None):
+        """
+        Start a session for user.
+
+        Returns:
+            str: The session token
+        """
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._purge()
+            self._sessions[_digest(token)] = {
+                'user': dict(user),
+                'kiosk': kiosk,
+                'expires': time.time() + self.ttl,
+            }
+            self._save()
+        return token
+
+    def get(self, token):
+        """
+        Return the session's user and extend the session, or None if the
+        token is unknown or expired.
+        """
+        if not token:
+            return None
+        key = _digest(token)
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                return None
+            if session['expires'] <= now:
+                del self._sessions[key]
+                self._save()
+                return None
+            # Extended in memory only; the file keeps the expiry set at login
+            session['expires'] = now + self.ttl
+            return dict(session['user'])
+
+    def revoke(self, token):
+        """End a session. Unknown tokens are ignored."""
+        if not token:
+            return
+        with self._lock:
+            if self._sessions.pop(_digest(token), None) is not None:
+                self._save()
+
+    def revoke_user(self, user_id):
+        """End every session of a user (e.g. after a password change)."""
+        with self._lock:
+            stale = [key for key, session in self._sessions.items()
+                     if session['user'].get('user_id') == user_id]
+            for key in stale:
+                del self._sessions[key]
+            if stale:
+                self._save()
+
+    def __len__(self):
+        with self._lock:
+            self._purge()
+            return len(self._sessions)
+
+    def _purge(self):
+        now = time.time()
+        for key in [key for key, session in self._sessions.items() if session['expires'] <= now]:
+            del self._sessions[key]
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            data = json.dumps(self._sessions)
+            with open(self.path + ".tmp", 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError as e:
+            print(f"[ERROR] Failed to save sessions: {e}")
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._sessions = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Failed to load sessions, starting empty: {e}")
+            self._sessions = {}
+            return
+        self._purge()
+
+
+def get_session_store():
+    """Return the application-wide session store."""
+    global _store
+    with _lock:
+        if _store is None:
+            _store = SessionStore(SESSION_TTL, SESSION_STORE_PATH or None)
+        return _store
+
+
+def _get_limiters():
+    global _user_limiter, _kiosk_limiter
+    with _lock:
+        if _user_limiter is None:
+            _user_limiter = RateLimiter(LOGIN_USER_BURST, LOGIN_USER_REFILL, LOGIN_LIMITER_MAX_KEYS)
+            _kiosk_limiter = RateLimiter(LOGIN_KIOSK_BURST, LOGIN_KIOSK_REFILL, LOGIN_LIMITER_MAX_KEYS)
+        return _user_limiter, _kiosk_limiter
+
+
+def login(username, password, kiosk=None):
+    """
+    Check credentials (database.check_login) and start a session.
+
+    Args:
+        username (str): Username
+        password (str): Plain-text password
+        kiosk (str): Kiosk the attempt comes from (default KIOSK_ID)
+
+    Returns:
+        tuple: (token, user), or (None, None) if the login failed
+
+    Raises:
+        LoginThrottledError: If the username or kiosk is out of attempts
+        passwords.PasswordBusyError: If the password workers are overloaded
+    """
+    kiosk = kiosk or KIOSK_ID
+    # MySQL compares usernames case-insensitively, so the buckets do too
+    user_key = username.strip().casefold()
+    user_limiter, kiosk_limiter = _get_limiters()
+
+    wait = kiosk_limiter.acquire(kiosk)
+    if not wait:
+        wait = user_limiter.acquire(user_key)
+    if wait:
+        print(f"[INFO] Login throttled for username: {username} (kiosk {kiosk})")
+        raise LoginThrottledError(wait)
+
+    user = database.check_login(username, password)
+    if not user:
+        return None, None
+    user_limiter.reset(user_key)
+    return get_session_store().create(user, kiosk), user
+
+
+def get_session_user(token):
+    """Return the user of a live session (see SessionStore.get), or None."""
+    return get_session_store().get(token)
+
+
+def logout(token):
+    """End a session."""
+    get_session_store().revoke(token)
+
+
+def end_user_sessions(user_ids):
+    """
+    End every session of the given users.
+
+    Call after users are deleted, or their role or password changes, so
+    they cannot keep acting on a session started before.
+    """
+    store = get_session_store()
+    for user_id in user_ids:
+        store.revoke_user(user_id)
+
+
+def delete_users(user_ids):
+    """Delete users (database.delete_users) and end their sessions."""
+    user_ids = list(user_ids)
+    database.delete_users(user_ids)
+    end_user_sessions(user_ids)
+
+
+def _digest(token):
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,226 @@
+"""
+Background tasks for the Tk windows.
+
+Database and network calls block, and a blocked Tk callback freezes the
+whole window until the call returns (up to the connect timeout when the
+database is unreachable). Callbacks therefore hand such calls to the
+application-wide TaskRunner with run_in_background(): the call runs on a
+worker thread, and its result or error comes back on the Tk thread
+through the TkDispatcher.
+
+    run_in_background(database.check_login, username, password,
+                      on_done=finish_login, busy=(login_btn,))
+
+While a task runs, its `busy` widgets are disabled and their windows show
+a busy cursor. A task is dropped - its callbacks never run - when it is
+cancelled, when a newer task with the same `key` is submitted, or when
+its owner widget has been destroyed by the time it finishes.
+"""
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+_default_runner = None
+
+
+class Task:
+    """Handle of a submitted task; cancel() drops its callbacks."""
+
+    def __init__(self, runner, key=None, owner=None, busy=()):
+        self.key = key
+        self.owner = owner
+        self.busy = busy
+        self.cancelled = False
+        self.done = False
+        self._runner = runner
+        self._future = None
+
+    def cancel(self):
+        """
+        Cancel the task (Tk thread only). Its busy widgets are released at
+        once; a call already running finishes but its result is ignored.
+        """
+        if self.cancelled or self.done:
+            return
+        self.cancelled = True
+        if self._future is not None:
+            self._future.cancel()
+        self._runner._forget(self)
+
+
+class TaskRunner:
+    """
+    Worker thread pool whose results are delivered on the Tk thread.
+
+    Args:
+        dispatcher: Object with post(callback, *args) that runs callbacks
+            on the Tk thread (tk_dispatch.TkDispatcher)
+        max_workers (int): Maximum number of concurrent tasks; keep it at
+            or below the database pool size (DB_POOL_SIZE)
+        on_error (callable): Default error handler, called on the Tk
+            thread with the exception of a task that has no on_error
+    """
+
+    def __init__(self, dispatcher, max_workers=4, on_error=None):
+        self.dispatcher = dispatcher
+        self.on_error = on_error or show_task_error
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="task")
+        self._keyed = {}        # key -> latest Task with that key
+        self._busy_counts = {}  # widget -> number of running tasks using it
+
+    def submit(self, func, *args, on_done=None, on_error=None, busy=(),
+               key=None, owner=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on a worker thread.
+
+        Must be called from the Tk thread.
+
+        Args:
+            func (callable): The blocking call
+            on_done (callable): Called on the Tk thread with the result
+            on_error (callable): Called on the Tk thread with the exception
+                (default: the runner's on_error)
+            busy (iterable): Widgets disabled, with a busy cursor, while
+                the task runs
+            key: Tasks with the same key supersede each other: submitting
+                one cancels the previous (e.g. reloads of one list)
+            owner: Widget the result is for (default: the first busy
+                widget); if it is destroyed, the result is dropped
+
+        Returns:
+            Task: Handle for cancel()
+        """
+        busy = tuple(busy)
+        task = Task(self, key, owner if owner is not None else (busy[0] if busy else None), busy)
+        if key is not None:
+            previous = self._keyed.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._keyed[key] = task
+        self._acquire(task)
+        task._future = self._executor.submit(
+            self._run, task, func, args, kwargs, on_done, on_error)
+        return task
+
+    def cancel(self, key):
+        """Cancel the latest task submitted with `key`, if any."""
+        task = self._keyed.get(key)
+        if task is not None:
+            task.cancel()
+
+    def shutdown(self, wait=True):
+        """Stop accepting tasks; queued tasks are dropped, running ones finish if wait."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, task, func, args, kwargs, on_done, on_error):
+        # Worker thread
+        if task.cancelled:
+            return
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.dispatcher.post(self._finish, task, on_error or self.on_error, e)
+        else:
+            self.dispatcher.post(self._finish, task, on_done, result)
+
+    def _finish(self, task, callback, value):
+        # Tk thread
+        if task.cancelled:
+            return
+        task.done = True
+        self._forget(task)
+        if callback is not None and _alive(task.owner):
+            callback(value)
+
+    def _forget(self, task):
+        if task.key is not None and self._keyed.get(task.key) is task:
+            del self._keyed[task.key]
+        self._release(task)
+
+    def _acquire(self, task):
+        for widget in task.busy:
+            count = self._busy_counts.get(widget, 0)
+            self._busy_counts[widget] = count + 1
+            if count == 0:
+                _set_busy(widget, True)
+
+    def _release(self, task):
+        busy, task.busy = task.busy, ()  # Release each task only once
+        for widget in busy:
+            count = self._busy_counts.pop(widget, 1) - 1
+            if count > 0:
+                self._busy_counts[widget] = count
+            else:
+                _set_busy(widget, False)
+
+
+def _alive(widget):
+    if widget is None:
+        return True
+    try:
+        return bool(widget.winfo_exists())
+    except tk.TclError:
+        return False
+
+
+def _set_busy(widget, busy):
+    try:
+        if not widget.winfo_exists():
+            return
+        if 'state' in widget.keys():
+            widget.configure(state='disabled' if busy else 'normal')
+        widget.winfo_toplevel().configure(cursor='watch' if busy else '')
+    except tk.TclError:
+        pass  # Destroyed while the task ran
+
+
+def show_task_error(error):
+    """Default error handler: log the error and show it in a message box."""
+    print(f"[ERROR] Background task failed: {error}")
+    messagebox.showerror("Error", str(error))
+
+
+def start_task_runner(dispatcher, max_workers=4, on_error=None):
+    """Create the application-wide task runner."""
+    global _default_runner
+    if _default_runner is None:
+        _default_runner = TaskRunner(dispatcher, max_workers, on_error)
+    return _default_runner
+
+
+def get_task_runner():
+    """Return the application-wide task runner, or None if it is not running."""
+    return _default_runner
+
+
+def stop_task_runner(wait=True):
+    """Stop the application-wide task runner."""
+    global _default_runner
+    if _default_runner is not None:
+        _default_runner.shutdown(wait=wait)
+        _default_runner = None
+
+
+def run_in_background(func, *args, on_done=None, on_error=None, busy=(),
+                      key=None, owner=None, **kwargs):
+    """
+    Submit a task to the application-wide runner (see TaskRunner.submit).
+
+    Without a running task runner (e.g. admin_panel.py or login.py started
+    on their own) the call runs right away on the calling thread, with the
+    same callbacks, and None is returned.
+    """
+    runner = _default_runner
+    if runner is not None:
+        return runner.submit(func, *args, on_done=on_done, on_error=on_error,
+                             busy=busy, key=key, owner=owner, **kwargs)
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        (on_error or show_task_error)(e)
+        return None
+    busy = tuple(busy)
+    if on_done is not None and _alive(owner if owner is not None else (busy[0] if busy else None)):
+        on_done(result)
+    return None
@@ -0,0 +1,71 @@
+"""
+Shared fixtures: every database test runs on a fresh SQLite file.
+
+Run from the repository root:
+    python -m pytest
+"""
+import os
+import sys
+
+# Settings read when the modules are imported: SQLite instead of MySQL,
+# cheap in-thread password hashing and a fixed ticket signing key
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ.setdefault("PASSWORD_WORKERS", "0")
+os.environ.setdefault("PASSWORD_SCRYPT_LOG_N", "10")
+os.environ.setdefault("TICKET_QR_KEY", "test-signing-key")
+os.environ["SESSION_STORE_PATH"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """The database module, set up on an empty SQLite file."""
+    monkeypatch.setenv("DB_SQLITE_PATH", str(tmp_path / "nova_movie.db"))
+    _reset_database()
+    database.create_database()
+    yield database
+    _reset_database()
+
+
+@pytest.fixture
+def customer(db):
+    """user_id of a registered customer."""
+    assert db.register_user("Test Customer", "customer", "secret", "5551234567")
+    return db.check_login("customer", "secret")['user_id']
+
+
+@pytest.fixture
+def show(db):
+    """movie_id of an active show today on the default screen."""
+    return add_show(db, "Test Movie")
+
+
+def add_show(db, title, status='active', show_time='18:00:00', price=150):
+    """Insert a show dated today and return its movie_id."""
+    connection = db.get_db_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT MIN(screen_id) FROM nm_screens")
+        screen_id = cursor.fetchone()[0]
+        cursor.execute("""
+            INSERT INTO nm_movies (title, genre, price, show_date, show_time, status, screen_id)
+            VALUES (%s, 'Drama', %s, CURDATE(), %s, %s, %s)
+        """, (title, price, show_time, status, screen_id))
+        connection.commit()
+        return cursor.lastrowid
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def _reset_database():
+    database.close_connection_pool()
+    database._backend = None
+    database.invalidate_catalog()
+    database.invalidate_seat_bitmaps()
+    database.invalidate_show_seat_maps()
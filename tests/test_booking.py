@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+from conftest import add_show
+
+
+def test_duplicate_booking_reports_conflicting_seats(db, show, customer):
+    db.book_seats(show, ['A1', 'A2'], customer)
+
+    booking_id, conflicts = db.book_seats(show, ['A2', 'A3'], customer)
+
+    assert booking_id is None
+    assert conflicts == ['A2']
+    # All or nothing: A3 stays free
+    assert db.get_occupied_seats(show) == ['A1', 'A2']
+
+
+def test_book_seats_stores_booking_at_current_price(db, show, customer):
+    booking_id, conflicts = db.book_seats(show, ['C5', 'C4'], customer)
+
+    assert conflicts == []
+    booking = db.get_booking(booking_id)
+    assert booking['seat_numbers'] == ['C4', 'C5']
+    assert float(booking['total_amount']) == 300.0
+    assert db.get_occupied_seats(show) == ['C4', 'C5']
+
+
+def test_clear_old_seat_data_keeps_booking_history(db, customer):
+    show = add_show(db, "Yesterday's Movie")
+    booking_id, _ = db.book_seats(show, ['A1'], customer)
+    yesterday = db._today() - datetime.timedelta(days=1)
+    connection = db.get_db_connection()
+    cursor = connection.cursor()
+    for table in ('nm_bookings', 'nm_seats'):
+        cursor.execute(f"UPDATE {table} SET booking_date = %s", (yesterday,))
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+    assert db.clear_old_seat_data()
+
+    bookings = db.get_show_bookings(show, yesterday)
+    assert [(b['booking_id'], b['seat_numbers']) for b in bookings] == [(booking_id, ['A1'])]
+
+
+def test_seat_held_by_another_window_cannot_be_booked(db, show, customer):
+    assert db.hold_seats(show, ['B1'], 'window-1', customer) == (True, [])
+
+    assert db.book_seats(show, ['B1'], customer, holder='window-2') == (None, ['B1'])
+    booking_id, conflicts = db.book_seats(show, ['B1'], customer, holder='window-1')
+    assert booking_id and conflicts == []
+    assert db.get_held_seats(show) == 0
+
+
+def test_hold_reports_booked_and_held_seats(db, show, customer):
+    db.book_seats(show, ['D1'], customer)
+    db.hold_seats(show, ['D2'], 'window-1')
+
+    held, conflicts = db.hold_seats(show, ['D1', 'D2', 'D3'], 'window-2')
+
+    assert not held
+    assert sorted(conflicts) == ['D1', 'D2']
+
+
+def test_inactive_show_cannot_be_booked(db, show, customer):
+    db.set_movie_active_status(show, 'inactive')
+
+    with pytest.raises(db.ShowUnavailableError):
+        db.book_seats(show, ['A1'], customer)
+    assert not db.mark_seats_as_occupied(show, ['A1'], customer)
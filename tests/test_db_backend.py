@@ -0,0 +1,23 @@
+from db_backend import translate_sql
+
+
+def test_placeholders_become_question_marks():
+    sql = "SELECT * FROM nm_seats WHERE movie_id = %s AND seat_number = %s"
+    assert translate_sql(sql) == "SELECT * FROM nm_seats WHERE movie_id = ? AND seat_number = ?"
+
+
+def test_date_functions_use_local_time():
+    assert translate_sql("WHERE booking_date = CURDATE()") == "WHERE booking_date = date('now', 'localtime')"
+    assert translate_sql("SET updated_at = now()") == "SET updated_at = datetime('now', 'localtime')"
+
+
+def test_interval_keeps_its_parameter():
+    assert translate_sql("VALUES (NOW() + INTERVAL %s SECOND)") == \
+        "VALUES (datetime('now', 'localtime', '+' || ? || ' seconds'))"
+
+
+def test_row_locks_are_dropped():
+    assert translate_sql("SELECT price FROM nm_movies WHERE movie_id = %s FOR SHARE") == \
+        "SELECT price FROM nm_movies WHERE movie_id = ?"
+    assert translate_sql("SELECT seat_number FROM nm_seats\n    FOR UPDATE") == \
+        "SELECT seat_number FROM nm_seats"
@@ -0,0 +1,36 @@
+from gate_verifier import ALREADY_USED, VALID, TicketVerifier
+from ticket_qr import encode_ticket_payload
+
+
+def _ticket(db, booking_id):
+    booking = db.get_booking(booking_id)
+    return encode_ticket_payload(booking_id, booking['movie_id'], booking['seat_numbers'],
+                                 db._today(), seat_map=db.get_show_seat_map(booking['movie_id']))
+
+
+def test_verifier_admits_a_ticket_once(db, show, customer):
+    booking_id, _ = db.book_seats(show, ['C4', 'C5'], customer)
+    verifier = TicketVerifier()
+    verifier.load()
+
+    assert verifier.verify(_ticket(db, booking_id))['status'] == VALID
+    assert verifier.verify(_ticket(db, booking_id))['status'] == ALREADY_USED
+
+
+def test_load_skips_seats_outside_the_layout(db, show, customer):
+    booking_id, _ = db.book_seats(show, ['A1'], customer)
+    connection = db.get_db_connection()
+    cursor = connection.cursor()
+    cursor.execute("""
+        INSERT INTO nm_seats (movie_id, seat_number, booking_date, user_id)
+        VALUES (%s, 'Z9', CURDATE(), %s)
+    """, (show, customer))
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+    verifier = TicketVerifier()
+    verifier.load()
+
+    assert verifier.stats()['booked_seats'] == 1
+    assert verifier.verify(_ticket(db, booking_id))['status'] == VALID
@@ -0,0 +1,72 @@
+import hashlib
+
+import passwords
+
+
+def test_hash_round_trip():
+    stored = passwords.hash_password("secret")
+
+    assert stored.startswith("scrypt$10$")
+    assert passwords.verify_password("secret", stored)
+    assert not passwords.verify_password("Secret", stored)
+    assert stored != passwords.hash_password("secret")  # fresh salt
+
+
+def test_legacy_hash_verifies_and_needs_rehash():
+    legacy = hashlib.sha256(b"secret").hexdigest()
+
+    assert passwords.verify_password("secret", legacy)
+    assert passwords.needs_rehash(legacy)
+    assert passwords.needs_rehash(passwords.hash_password("secret", log_n=11))
+    assert not passwords.needs_rehash(passwords.hash_password("secret"))
+
+
+def test_malformed_hash_does_not_verify():
+    assert not passwords.verify_password("secret", "scrypt$10$8$1$not-base64")
+    assert not passwords.verify_password("secret", "")
+
+
+def test_check_password_remembers_successes(monkeypatch):
+    passwords.clear_cache()
+    stored = passwords.hash_password("secret")
+    calls = []
+    verify = passwords.verify_password
+    monkeypatch.setattr(passwords, 'verify_password',
+                        lambda password, stored: calls.append(password) or verify(password, stored))
+
+    assert passwords.check_password("secret", stored)
+    assert passwords.check_password("secret", stored)
+    assert not passwords.check_password("wrong", stored)
+    assert not passwords.check_password("wrong", stored)
+
+    assert calls == ["secret", "wrong", "wrong"]
+    passwords.clear_cache()
+
+
+def test_check_login_upgrades_legacy_hash(db, customer):
+    legacy = hashlib.sha256(b"old-secret").hexdigest()
+    connection = db.get_db_connection()
+    cursor = connection.cursor()
+    cursor.execute("UPDATE nm_users SET password = %s WHERE user_id = %s", (legacy, customer))
+    connection.commit()
+
+    assert db.check_login("customer", "wrong") is None
+    assert db.check_login("customer", "old-secret")['user_id'] == customer
+
+    cursor.execute("SELECT password FROM nm_users WHERE user_id = %s", (customer,))
+    assert cursor.fetchone()[0].startswith("scrypt$")
+    cursor.close()
+    connection.close()
+
+
+def test_worker_processes_are_spawned(monkeypatch):
+    monkeypatch.setattr(passwords, 'PASSWORD_WORKERS', 1)
+    try:
+        passwords.start()
+        assert passwords._pool._mp_context.get_start_method() == "spawn"
+
+        stored = passwords.make_password_hash("secret")
+        assert passwords.verify_password("secret", stored)
+        assert passwords._run(passwords.verify_password, "secret", stored)
+    finally:
+        passwords.shutdown()
@@ -0,0 +1,83 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip("requests")
+Image = pytest.importorskip("PIL.Image")
+
+from poster_loader import PosterLoader
+
+
+class OmdbStub(BaseHTTPRequestHandler):
+    """Answers like OMDB for 'Inception' and serves the poster it points to."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/poster.png":
+            buffer = BytesIO()
+            Image.new('RGB', (300, 450), (200, 30, 30)).save(buffer, format='PNG')
+            self._reply('image/png', buffer.getvalue())
+            return
+        query = parse_qs(url.query)
+        self.server.queries.append(query)
+        if query.get('t') == ['Inception']:
+            poster = f"http://127.0.0.1:{self.server.server_port}/poster.png"
+        else:
+            poster = "N/A"
+        self._reply('application/json', json.dumps({'Title': query['t'][0], 'Poster': poster}).encode())
+
+    def _reply(self, content_type, body):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def loader():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OmdbStub)
+    server.queries = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    loader = PosterLoader("test-key", base_url=f"http://127.0.0.1:{server.server_port}/",
+                          timeout=5, size=(65, 97))
+    loader.server = server
+    yield loader
+    loader.shutdown(wait=True)
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_downloads_and_resizes_the_poster(loader):
+    image = loader.fetch("Inception")
+
+    assert image.size == (65, 97)
+    assert image.getpixel((30, 40)) == (200, 30, 30)
+    assert loader.server.queries == [{'t': ['Inception'], 'apikey': ['test-key']}]
+
+
+def test_fetch_without_poster_returns_none(loader):
+    assert loader.fetch("Unknown Movie") is None
+
+
+def test_request_calls_back_with_the_image(loader):
+    done = threading.Event()
+    results = []
+
+    def callback(title, image):
+        results.append((title, image.size if image else None))
+        done.set()
+
+    loader.request("Inception", callback)
+
+    assert done.wait(10)
+    assert results == [("Inception", (65, 97))]
+    assert not loader.is_pending("Inception")
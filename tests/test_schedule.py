@@ -0,0 +1,64 @@
+import pytest
+
+from conftest import add_show
+
+
+def test_overlapping_show_cannot_be_activated(db, show):
+    late = add_show(db, "Late Movie", status='inactive', show_time='18:05:00')
+
+    with pytest.raises(Exception, match="18:00"):
+        db.set_movie_active_status(late, 'active')
+    assert db.get_show(late)['status'] == 'inactive'
+
+    assert db.set_movie_active_status(late, 'active', show_time='21:00:00')
+
+
+def test_save_show_refuses_an_overlapping_slot(db, show):
+    screen_id = db.get_show(show)['screen_id']
+    other_screen = db.add_screen("Screen 2", 'standard')
+    new_show = ("New Movie", 'Drama', 120.0, db._today(), '19:30:00', screen_id, 'active')
+
+    assert db.save_show(None, new_show) is None
+    assert not db.check_time_slot_available('19:30:00', None, screen_id)
+    # Inactive shows and other screens do not take the slot
+    assert db.save_show(None, new_show[:6] + ('inactive',))
+    movie_id = db.save_show(None, new_show[:5] + (other_screen, 'active'))
+    assert db.get_show(movie_id)['screen_id'] == other_screen
+    assert db.check_time_slot_available('21:00:00', None, screen_id)
+
+
+def _move_to_grand_screen(db, movie_id):
+    grand = db.add_screen("Grand", 'grand')
+    show = db.get_show(movie_id)
+    return db.save_show(movie_id, (show['title'], show['genre'], show['price'], show['show_date'],
+                                   str(show['show_time']), grand, show['status']))
+
+
+def test_show_with_booked_or_held_seats_keeps_its_screen(db, show, customer):
+    screen_id = db.get_show(show)['screen_id']
+    db.hold_seats(show, ['B2'], 'window-1')
+
+    with pytest.raises(Exception, match="booked or held"):
+        _move_to_grand_screen(db, show)
+
+    db.release_seat_holds(show, 'window-1')
+    db.book_seats(show, ['A1', 'G7'], customer)
+    with pytest.raises(Exception, match="booked or held"):
+        _move_to_grand_screen(db, show)
+    assert db.get_show(show)['screen_id'] == screen_id
+    assert db.get_show_seat_map(show).name == 'standard'
+
+
+def test_moving_a_show_switches_its_seat_map(db, show, customer):
+    db.get_seat_snapshot(show)  # cached on the standard layout
+    cursor = db.SeatEventCursor()
+
+    assert _move_to_grand_screen(db, show) == show
+
+    assert [(e['movie_id'], e['seat_number']) for e in cursor.fetch()] == [(show, None)]
+    assert db.get_show_seat_map(show).name == 'grand'
+    booking_id, _ = db.book_seats(show, ['R22'], customer)
+    assert booking_id
+    status, = db.get_movie_seat_status(show)
+    assert status['seat_bitmap'] == db.get_show_seat_map(show).to_bitmap(['R22'])
+    assert db.get_seat_snapshot(show)['bitmap'] == status['seat_bitmap']
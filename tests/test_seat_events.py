@@ -0,0 +1,33 @@
+def test_seat_event_cursor_reads_events_committed_out_of_order(db, show):
+    cursor = db.SeatEventCursor()
+    start = cursor.last_event_id
+    _insert_event(db, start + 2, show, 'A2')
+
+    assert [e['event_id'] for e in cursor.fetch()] == [start + 2]
+
+    # The lower id commits last; it must still be delivered once
+    _insert_event(db, start + 1, show, 'A1')
+    assert [e['event_id'] for e in cursor.fetch()] == [start + 1]
+    assert cursor.fetch() == []
+
+
+def test_deleting_a_show_logs_a_cleared_event(db, show, customer):
+    db.book_seats(show, ['E1'], customer)
+    cursor = db.SeatEventCursor()
+
+    db.delete_movies([show])
+
+    events = cursor.fetch()
+    assert [(e['movie_id'], e['seat_number'], e['action']) for e in events] == [(show, None, 'cleared')]
+
+
+def _insert_event(db, event_id, movie_id, seat_number):
+    connection = db.get_db_connection()
+    cursor = connection.cursor()
+    cursor.execute("""
+        INSERT INTO nm_seat_events (event_id, movie_id, seat_number, booking_date, action)
+        VALUES (%s, %s, %s, CURDATE(), 'booked')
+    """, (event_id, movie_id, seat_number))
+    connection.commit()
+    cursor.close()
+    connection.close()
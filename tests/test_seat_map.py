@@ -0,0 +1,52 @@
+import pytest
+
+from seat_map import SeatMap, load_seat_map
+
+
+def test_standard_layout():
+    seat_map = load_seat_map('standard')
+
+    assert seat_map.total_seats == 49
+    assert seat_map.index('A1') == 0
+    assert seat_map.index('g7') == 48
+    assert seat_map.full_bitmap == (1 << 49) - 1
+
+
+def test_bitmap_round_trip():
+    seat_map = load_seat_map('standard')
+
+    bitmap = seat_map.to_bitmap(['C5', 'A1', 'G7'])
+
+    assert bitmap == 1 | 1 << 18 | 1 << 48
+    assert seat_map.to_seats(bitmap) == ['A1', 'C5', 'G7']
+    assert seat_map.to_seats(0) == []
+
+
+def test_unknown_seat_is_rejected():
+    seat_map = load_seat_map('standard')
+
+    assert 'H1' not in seat_map
+    for seat in ('H1', 'A8', '', None):
+        with pytest.raises(ValueError):
+            seat_map.index(seat)
+
+
+def test_grand_layout_categories_and_missing_seats():
+    seat_map = load_seat_map('grand')
+
+    assert seat_map.total_seats == 16 * 22 - 10
+    assert 'A1' not in seat_map and 'I1' not in seat_map
+    assert seat_map.category('A3') == 'standard'
+    assert seat_map.category('L1') == 'premium'
+    assert seat_map.category('R22') == 'recliner'
+    recliners = seat_map.to_seats(seat_map.category_bitmap('recliner'))
+    assert len(recliners) == 2 * 22 - 4
+    assert recliners[0] == 'Q1'
+
+
+def test_aisles_shift_seats_right():
+    seat_map = SeatMap('test', 'AB', 4, aisles_after=[2], row_gaps_after=['A'])
+
+    assert list(seat_map.xs[:4]) == [0, 1, 3, 4]
+    assert list(seat_map.ys[4:]) == [2, 2, 2, 2]
+    assert seat_map.width == 5 and seat_map.height == 3
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+
+import sessions
+from sessions import LoginThrottledError, RateLimiter, SessionStore
+
+
+class Clock:
+    """Stand-in for time.monotonic / time.time that only moves when told."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sessions.time, 'monotonic', clock)
+    monkeypatch.setattr(sessions.time, 'time', clock)
+    return clock
+
+
+def test_rate_limiter_allows_a_burst_then_refills(clock):
+    limiter = RateLimiter(burst=3, refill=10)
+
+    assert [limiter.acquire('kiosk-1') for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire('kiosk-1') == pytest.approx(10)
+    assert limiter.acquire('kiosk-2') == 0
+
+    clock.now += 4
+    assert limiter.acquire('kiosk-1') == pytest.approx(6)
+    clock.now += 6
+    assert limiter.acquire('kiosk-1') == 0
+
+
+def test_rate_limiter_reset_refills_the_bucket(clock):
+    limiter = RateLimiter(burst=1, refill=60)
+    limiter.acquire('alice')
+    assert limiter.acquire('alice') > 0
+
+    limiter.reset('alice')
+
+    assert limiter.acquire('alice') == 0
+
+
+def test_rate_limiter_drops_least_recently_used_keys(clock):
+    limiter = RateLimiter(burst=1, refill=60, max_keys=2)
+    for key in ('a', 'b', 'c'):
+        limiter.acquire(key)
+
+    # 'a' was dropped and starts over full; 'c' is still empty
+    assert limiter.acquire('a') == 0
+    assert limiter.acquire('c') > 0
+
+
+def test_session_lifecycle(clock):
+    store = SessionStore(ttl=60)
+    token = store.create({'user_id': 1, 'username': 'alice'})
+
+    assert store.get(token)['username'] == 'alice'
+    assert store.get('not-a-token') is None
+    assert store.get(None) is None
+
+    store.revoke(token)
+    assert store.get(token) is None
+    assert len(store) == 0
+
+
+def test_session_expires_when_idle(clock):
+    store = SessionStore(ttl=60)
+    token = store.create({'user_id': 1})
+
+    clock.now += 50
+    assert store.get(token) is not None  # use extends the session
+    clock.now += 50
+    assert store.get(token) is not None
+    clock.now += 61
+    assert store.get(token) is None
+
+
+def test_revoke_user_ends_all_their_sessions(clock):
+    store = SessionStore(ttl=60)
+    first = store.create({'user_id': 1})
+    second = store.create({'user_id': 1})
+    other = store.create({'user_id': 2})
+
+    store.revoke_user(1)
+
+    assert store.get(first) is None and store.get(second) is None
+    assert store.get(other) == {'user_id': 2}
+
+
+def test_sessions_persist_without_raw_tokens(clock, tmp_path):
+    path = str(tmp_path / "sessions.json")
+    token = SessionStore(ttl=60, path=path).create({'user_id': 1})
+
+    with open(path, encoding='utf-8') as f:
+        assert token not in f.read()
+    assert SessionStore(ttl=60, path=path).get(token) == {'user_id': 1}
+
+    with open(path, encoding='utf-8') as f:
+        assert len(json.load(f)) == 1
+    clock.now += 61
+    assert len(SessionStore(ttl=60, path=path)) == 0
+
+
+def test_login_is_throttled_before_checking_the_password(monkeypatch, clock):
+    checked = []
+
+    def check_login(username, password):
+        checked.append(username)
+        return None
+
+    monkeypatch.setattr(sessions.database, 'check_login', check_login)
+    monkeypatch.setattr(sessions, '_user_limiter', RateLimiter(2, 30))
+    monkeypatch.setattr(sessions, '_kiosk_limiter', RateLimiter(100, 1))
+
+    assert sessions.login("Alice", "guess", kiosk="k1") == (None, None)
+    assert sessions.login("alice ", "guess", kiosk="k1") == (None, None)
+    with pytest.raises(LoginThrottledError) as excinfo:
+        sessions.login("ALICE", "guess", kiosk="k1")
+
+    assert excinfo.value.retry_after == pytest.approx(30)
+    assert checked == ["Alice", "alice "]
+
+
+def test_successful_login_starts_a_session(monkeypatch, clock):
+    user = {'user_id': 5, 'username': 'alice', 'role': 'customer'}
+    monkeypatch.setattr(sessions.database, 'check_login', lambda username, password: user)
+    monkeypatch.setattr(sessions, '_user_limiter', RateLimiter(1, 30))
+    monkeypatch.setattr(sessions, '_kiosk_limiter', RateLimiter(100, 1))
+    monkeypatch.setattr(sessions, '_store', SessionStore(ttl=60))
+
+    token, logged_in = sessions.login("alice", "secret", kiosk="k1")
+
+    assert logged_in == user
+    assert sessions.get_session_user(token) == user
+    # The username's bucket was refilled by the successful login
+    assert sessions.login("alice", "secret", kiosk="k1")[1] == user
+    sessions.logout(token)
+    assert sessions.get_session_user(token) is None
+
+
+def test_deleted_users_lose_their_sessions(db, customer, monkeypatch):
+    monkeypatch.setattr(sessions, '_store', SessionStore(ttl=60))
+    monkeypatch.setattr(sessions, '_user_limiter', RateLimiter(5, 30))
+    monkeypatch.setattr(sessions, '_kiosk_limiter', RateLimiter(100, 1))
+    token, user = sessions.login("customer", "secret", kiosk="k1")
+    assert sessions.get_session_user(token) == user
+
+    sessions.delete_users([customer])
+
+    assert sessions.get_session_user(token) is None
+    assert db.check_login("customer", "secret") is None
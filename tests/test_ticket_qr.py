@@ -0,0 +1,104 @@
+import datetime
+import threading
+
+import pytest
+
+import ticket_qr
+
+from seat_map import load_seat_map
+from ticket_qr import (PAYLOAD_PREFIX, InvalidTicketError, SigningKeyError, base45_decode,
+                       base45_encode, encode_ticket_payload, verify_ticket_payload)
+
+KEY = b"test-signing-key"
+
+
+def test_base45_round_trip():
+    for data in (b"", b"\x00", b"AB", b"\xff\xff\xff", bytes(range(40))):
+        assert base45_decode(base45_encode(data)) == data
+
+
+def test_payload_round_trip():
+    payload = encode_ticket_payload("BK-1042", 7, ['C5', 'C4'], '2026-10-17', key=KEY)
+
+    ticket = verify_ticket_payload(payload, key=KEY)
+
+    assert payload.startswith(PAYLOAD_PREFIX)
+    assert ticket['booking_id'] == "BK-1042"
+    assert ticket['movie_id'] == 7
+    assert ticket['show_date'] == datetime.date(2026, 10, 17)
+    assert ticket['seat_numbers'] == ['C4', 'C5']
+
+
+def test_payload_on_a_custom_layout():
+    grand = load_seat_map('grand')
+    payload = encode_ticket_payload("BK-7", 3, ['R22', 'L1'], '2026-10-17', key=KEY,
+                                    seat_map=grand)
+
+    ticket = verify_ticket_payload(payload, key=KEY, seat_maps={3: grand})
+
+    assert ticket['seat_numbers'] == ['L1', 'R22']
+    assert ticket['seat_bitmap'] == grand.to_bitmap(['L1', 'R22'])
+
+
+def test_tampered_payload_is_rejected():
+    payload = encode_ticket_payload("BK-1042", 7, ['C4'], '2026-10-17', key=KEY)
+    data = bytearray(base45_decode(payload[len(PAYLOAD_PREFIX):]))
+    data[5] ^= 0x01  # another show
+    tampered = PAYLOAD_PREFIX + base45_encode(bytes(data))
+
+    with pytest.raises(InvalidTicketError):
+        verify_ticket_payload(tampered, key=KEY)
+
+
+def test_wrong_key_is_rejected():
+    payload = encode_ticket_payload("BK-1042", 7, ['C4'], '2026-10-17', key=KEY)
+
+    with pytest.raises(InvalidTicketError):
+        verify_ticket_payload(payload, key=b"another-key")
+
+
+@pytest.mark.parametrize("payload", ["BK-1042", "NM:", "NM:!!!", "NM:" + base45_encode(b"short")])
+def test_malformed_payload_is_rejected(payload):
+    with pytest.raises(InvalidTicketError):
+        verify_ticket_payload(payload, key=KEY)
+
+
+def test_empty_key_is_refused():
+    with pytest.raises(SigningKeyError):
+        encode_ticket_payload("BK-1042", 7, ['C4'], '2026-10-17', key=b"")
+    payload = encode_ticket_payload("BK-1042", 7, ['C4'], '2026-10-17', key=KEY)
+    with pytest.raises(SigningKeyError):
+        verify_ticket_payload(payload, key=b"")
+
+
+@pytest.fixture
+def key_file(tmp_path, monkeypatch):
+    path = tmp_path / "ticket_qr.key"
+    monkeypatch.setenv("TICKET_QR_KEY", " ")
+    monkeypatch.setenv("TICKET_QR_KEY_FILE", str(path))
+    monkeypatch.setattr(ticket_qr, 'KEY_FILE_READ_INTERVAL', 0.01)
+    return path
+
+
+def test_key_file_is_created_once(key_file):
+    key = ticket_qr._load_signing_key()
+
+    assert len(key) == 64
+    assert key_file.read_bytes() == key
+    assert ticket_qr._load_signing_key() == key
+
+
+def test_blank_key_file_is_refused(key_file):
+    key_file.write_bytes(b" \n")
+
+    with pytest.raises(SigningKeyError):
+        ticket_qr._load_signing_key()
+
+
+def test_key_file_being_written_is_waited_for(key_file):
+    key_file.write_bytes(b"")
+    writer = threading.Timer(0.05, key_file.write_bytes, (b"shared-key\n",))
+    writer.start()
+
+    assert ticket_qr._load_signing_key() == b"shared-key"
+    writer.join()
@@ -0,0 +1,227 @@
+"""
+Batch ticket generation for group bookings and re-issues.
+
+Renders many tickets in parallel worker processes and writes them either
+as individual PNG files or as one multi-page PDF.
+
+Usage:
+    python ticket_batch.py bookings.json --out-dir tickets/
+    python ticket_batch.py bookings.json --pdf group.pdf --poster-cache poster_cache
+    python ticket_batch.py --movie-id 3 --pdf show3.pdf    # re-issue a whole show
+
+bookings.json holds a list of booking dicts with the same fields as a
+single ticket: booking_id, movie_id, show_date (YYYY-MM-DD), movie_title,
+show_time, seat_numbers, user_name, phone_number and price, plus an
+optional seat_layout (the screen's seat map name, default "standard").
+"""
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+from ticket_qr import get_signing_key
+from ticket_renderer import get_ticket_template, render_ticket
+
+# Below this many tickets, starting worker processes costs more than it saves
+MIN_PARALLEL_BATCH = 4
+PDF_RESOLUTION = 100.0
+
+# Per-process state, set up once by _init_worker
+_worker_posters = {}
+
+
+def render_batch(bookings, output_dir=None, pdf_path=None, posters=None,
+                 max_workers=None, filename="ticket_{booking_id}.png"):
+    """
+    Render many tickets in parallel.
+
+    Each worker process loads the ticket template (fonts and background
+    layer) once and receives the posters once, then renders its share of
+    the bookings. In PNG mode workers also encode and write the files; in
+    PDF mode they send back compressed pages which are bound into one
+    document in booking order.
+
+    Args:
+        bookings (list): Booking dicts (see module docstring)
+        output_dir (str): Write one PNG per booking here
+        pdf_path (str): Write all tickets into this PDF, one per page
+        posters (dict): movie title -> PIL poster image
+        max_workers (int): Worker processes (default: CPU count)
+        filename (str): PNG file name pattern, formatted with the booking
+
+    Returns:
+        dict: files (PNG paths), pdf, count, errors (list of
+        (booking_id, message)) and elapsed seconds
+    """
+    if not output_dir and not pdf_path:
+        raise ValueError("Pass output_dir and/or pdf_path")
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    posters = posters or {}
+    get_signing_key()  # Create the key file (if needed) before workers start
+    jobs = [
+        (booking,
+         os.path.join(output_dir, filename.format(**booking)) if output_dir else None,
+         bool(pdf_path))
+        for booking in bookings
+    ]
+
+    if len(jobs) < MIN_PARALLEL_BATCH or max_workers == 1:
+        _init_worker(posters)
+        results = [_render_job(job) for job in jobs]
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (workers * 4))
+        # spawn, not fork: callers such as the Tk app have live threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker,
+                                 initargs=(posters,)) as executor:
+            results = list(executor.map(_render_job, jobs, chunksize=chunksize))
+
+    files = []
+    pages = []
+    errors = []
+    for booking, (path, page, error) in zip(bookings, results):
+        if error:
+            errors.append((booking['booking_id'], error))
+            continue
+        if path:
+            files.append(path)
+        if page:
+            pages.append(page)
+
+    if pdf_path and pages:
+        _write_pdf(pages, pdf_path)
+
+    return {
+        'files': files,
+        'pdf': pdf_path if pdf_path and pages else None,
+        'count': len(bookings) - len(errors),
+        'errors': errors,
+        'elapsed': time.perf_counter() - started,
+    }
+
+
+def _init_worker(posters):
+    global _worker_posters
+    _worker_posters = posters
+    get_ticket_template()  # Load fonts before the first job
+
+
+def _render_job(job):
+    """Render one ticket in a worker. Returns (png_path, pdf_page, error)."""
+    booking, png_path, want_page = job
+    try:
+        ticket = render_ticket(booking, _worker_posters.get(booking['movie_title']))
+        if png_path:
+            ticket.save(png_path + ".tmp", format='PNG')
+            os.replace(png_path + ".tmp", png_path)
+        page = None
+        if want_page:
+            # JPEG keeps the transfer back to the parent (and memory) small;
+            # the PDF stores pages as JPEG anyway
+            buffer = BytesIO()
+            ticket.save(buffer, format='JPEG', quality=92)
+            page = buffer.getvalue()
+        return png_path, page, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _write_pdf(pages, pdf_path):
+    images = [Image.open(BytesIO(page)) for page in pages]
+    directory = os.path.dirname(os.path.abspath(pdf_path))
+    os.makedirs(directory, exist_ok=True)
+    images[0].save(pdf_path + ".tmp", format='PDF', save_all=True,
+                   append_images=images[1:], resolution=PDF_RESOLUTION)
+    os.replace(pdf_path + ".tmp", pdf_path)
+
+
+def load_show_bookings(movie_id, booking_date=None):
+    """Load every booking of a show (default: today) as ticket booking dicts."""
+    import database
+    tickets = []
+    for booking in database.get_show_bookings(movie_id, booking_date):
+        if not booking['seat_numbers']:
+            continue
+        tickets.append({
+            'booking_id': booking['booking_id'],
+            'movie_id': booking['movie_id'],
+            'show_date': str(booking['booking_date']),
+            'movie_title': booking['title'],
+            'show_time': str(booking['show_time']),
+            'seat_numbers': booking['seat_numbers'],
+            'user_name': booking['name'],
+            'phone_number': booking['phone_number'],
+            'price': float(booking['total_amount'] or 0),
+            'seat_layout': database.get_show_seat_map(movie_id).name,
+        })
+    return tickets
+
+
+def load_posters(titles, cache_dir):
+    """Load ticket-size posters for the given titles from a poster cache."""
+    from poster_cache import PosterCache
+    cache = PosterCache(cache_dir)
+    posters = {}
+    for title in titles:
+        poster = cache.get(title, 'ticket')
+        if poster is not None:
+            posters[title] = poster
+    return posters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render many Nova Movies tickets at once")
+    parser.add_argument('bookings', nargs='?', help="JSON file with a list of bookings")
+    parser.add_argument('--movie-id', type=int,
+                        help="Re-issue every booking of this show instead of reading a file")
+    parser.add_argument('--date', help="Show date for --movie-id (YYYY-MM-DD, default today)")
+    parser.add_argument('--out-dir', help="Write one PNG per booking to this folder")
+    parser.add_argument('--pdf', help="Write all tickets into this PDF")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--poster-cache', help="Poster cache folder to take posters from")
+    args = parser.parse_args()
+
+    if not args.out_dir and not args.pdf:
+        parser.error("pass --out-dir and/or --pdf")
+    if bool(args.bookings) == bool(args.movie_id):
+        parser.error("pass either a bookings file or --movie-id")
+
+    if args.movie_id:
+        show_date = datetime.date.fromisoformat(args.date) if args.date else None
+        bookings = load_show_bookings(args.movie_id, show_date)
+        if not bookings:
+            print(f"[+] No bookings found for movie {args.movie_id}")
+            return
+    else:
+        with open(args.bookings, encoding='utf-8') as f:
+            bookings = json.load(f)
+
+    posters = {}
+    if args.poster_cache:
+        posters = load_posters({b['movie_title'] for b in bookings}, args.poster_cache)
+
+    result = render_batch(bookings, output_dir=args.out_dir, pdf_path=args.pdf,
+                          posters=posters, max_workers=args.workers)
+
+    print(f"[+] Rendered {result['count']} ticket(s) in {result['elapsed']:.2f}s")
+    if result['pdf']:
+        print(f"[+] PDF: {result['pdf']}")
+    if args.out_dir:
+        print(f"[+] PNG files: {args.out_dir}")
+    for booking_id, error in result['errors']:
+        print(f"[ERROR] Ticket {booking_id} failed: {error}")
+
+
+if __name__ == "__main__":
+    main()
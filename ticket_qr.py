@@ -0,0 +1,258 @@
+"""
+Compact, signed QR payloads for tickets.
+
+A ticket QR code carries only what the gate needs to check a ticket:
+booking id, movie id, show date and the booked seats as a bitmap.
+The fields are packed into a few dozen bytes, signed with a truncated
+HMAC-SHA256 and encoded as base45 (RFC 9285), which fits QR alphanumeric
+mode. The result is a small, low-density code that scans quickly, and
+forged or edited codes are rejected without a database lookup.
+
+Binary layout (big-endian), before base45:
+
+    version      1 byte   PAYLOAD_VERSION
+    movie_id     4 bytes
+    show_date    2 bytes  days since 2000-01-01
+    map length   1 byte
+    seat bitmap  m bytes  bit n set = seat n of the screen's seat map booked
+    id length    1 byte
+    booking_id   n bytes  ASCII
+    signature    8 bytes  HMAC-SHA256(key, all bytes above)[:8]
+
+Version 1 tickets, printed before screens had their own seat maps, have
+a fixed 7-byte bitmap of the standard 7x7 layout and no map length; they
+are still accepted.
+
+The signing key comes from TICKET_QR_KEY, or from the key file named by
+TICKET_QR_KEY_FILE (default ticket_qr.key, created on first use). Every
+kiosk and gate scanner must share the same key. An empty key is refused
+(SigningKeyError): anyone could sign tickets with it.
+"""
+import datetime
+import hashlib
+import hmac
+import os
+import secrets
+import struct
+import threading
+import time
+
+from database import bitmap_to_seats, seats_to_bitmap
+
+PAYLOAD_PREFIX = "NM:"
+PAYLOAD_VERSION = 2
+SIGNATURE_BYTES = 8
+DATE_EPOCH = datetime.date(2000, 1, 1)
+DEFAULT_KEY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ticket_qr.key")
+# An empty key file may still be being written by the process that created it
+KEY_FILE_READ_ATTEMPTS = 20
+KEY_FILE_READ_INTERVAL = 0.05
+
+BASE45_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+_BASE45_INDEX = {char: index for index, char in enumerate(BASE45_ALPHABET)}
+
+_HEADER = struct.Struct(">BIHB")
+_HEADER_V1 = struct.Struct(">BIH7sB")
+_signing_key = None
+_signing_key_lock = threading.Lock()
+
+
+class InvalidTicketError(Exception):
+    """Raised when a QR payload is malformed or its signature does not match."""
+
+
+class SigningKeyError(Exception):
+    """Raised when the ticket signing key is empty or cannot be read."""
+
+
+def base45_encode(data):
+    """Encode bytes as base45 text (RFC 9285)."""
+    chars = []
+    for i in range(0, len(data) - 1, 2):
+        value = data[i] * 256 + data[i + 1]
+        value, c = divmod(value, 45)
+        e, d = divmod(value, 45)
+        chars.extend((BASE45_ALPHABET[c], BASE45_ALPHABET[d], BASE45_ALPHABET[e]))
+    if len(data) % 2:
+        d, c = divmod(data[-1], 45)
+        chars.extend((BASE45_ALPHABET[c], BASE45_ALPHABET[d]))
+    return "".join(chars)
+
+
+def base45_decode(text):
+    """Decode base45 text (RFC 9285) back to bytes."""
+    try:
+        values = [_BASE45_INDEX[char] for char in text]
+    except KeyError as e:
+        raise ValueError(f"Invalid base45 character {e}") from None
+    if len(values) % 3 == 1:
+        raise ValueError("Invalid base45 length")
+
+    data = bytearray()
+    for i in range(0, len(values), 3):
+        chunk = values[i:i + 3]
+        if len(chunk) == 3:
+            value = chunk[0] + chunk[1] * 45 + chunk[2] * 45 * 45
+            if value > 0xFFFF:
+                raise ValueError("Invalid base45 triplet")
+            data.extend(divmod(value, 256))
+        else:
+            value = chunk[0] + chunk[1] * 45
+            if value > 0xFF:
+                raise ValueError("Invalid base45 pair")
+            data.append(value)
+    return bytes(data)
+
+
+def get_signing_key():
+    """Return the shared ticket signing key (see module docstring)."""
+    global _signing_key
+    with _signing_key_lock:
+        if _signing_key is None:
+            _signing_key = _load_signing_key()
+        return _signing_key
+
+
+def encode_ticket_payload(booking_id, movie_id, seat_numbers, show_date, key=None,
+                          seat_map=None):
+    """
+    Build the signed QR text for a ticket.
+
+    Args:
+        booking_id (str): Booking reference (ASCII, up to 255 chars)
+        movie_id (int): Show the ticket is valid for
+        seat_numbers (list): Seats like ['C4', 'C5']
+        show_date: datetime.date or 'YYYY-MM-DD'
+        key (bytes): Signing key (default: get_signing_key())
+        seat_map (SeatMap): Seat map of the show's screen (default: standard)
+
+    Returns:
+        str: Payload for the QR code, e.g. 'NM:...'
+
+    Raises:
+        SigningKeyError: If the signing key is empty
+    """
+    booking_bytes = str(booking_id).encode('ascii')
+    if len(booking_bytes) > 255:
+        raise ValueError("Booking id too long for a ticket QR code")
+    days = (_to_date(show_date) - DATE_EPOCH).days
+    bitmap = seats_to_bitmap(seat_numbers, seat_map)
+    bitmap_bytes = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'big')
+
+    body = (_HEADER.pack(PAYLOAD_VERSION, int(movie_id), days, len(bitmap_bytes))
+            + bitmap_bytes + bytes([len(booking_bytes)]) + booking_bytes)
+    return PAYLOAD_PREFIX + base45_encode(body + _sign(body, key))
+
+
+def verify_ticket_payload(payload, key=None, seat_maps=None):
+    """
+    Check a scanned QR payload and unpack it.
+
+    Args:
+        payload (str): Scanned text
+        key (bytes): Signing key (default: get_signing_key())
+        seat_maps (dict): movie_id -> SeatMap, used to name the seats;
+            shows not in it use the standard layout
+
+    Returns:
+        dict: booking_id, movie_id, show_date (date), seat_bitmap and
+        seat_numbers
+
+    Raises:
+        InvalidTicketError: If the payload is malformed, from an unknown
+            version, or the signature does not match
+        SigningKeyError: If the signing key is empty
+    """
+    if not payload.startswith(PAYLOAD_PREFIX):
+        raise InvalidTicketError("Not a Nova Movies ticket")
+    try:
+        data = base45_decode(payload[len(PAYLOAD_PREFIX):])
+    except ValueError as e:
+        raise InvalidTicketError(f"Damaged ticket code: {e}") from None
+    if len(data) < _HEADER.size + 1 + SIGNATURE_BYTES:
+        raise InvalidTicketError("Ticket code too short")
+
+    body, signature = data[:-SIGNATURE_BYTES], data[-SIGNATURE_BYTES:]
+    if not hmac.compare_digest(signature, _sign(body, key)):
+        raise InvalidTicketError("Ticket signature does not match")
+
+    version = body[0]
+    if version == PAYLOAD_VERSION:
+        _, movie_id, days, bitmap_length = _HEADER.unpack_from(body)
+        offset = _HEADER.size + bitmap_length
+        bitmap_bytes = body[_HEADER.size:offset]
+        if len(body) <= offset:
+            raise InvalidTicketError("Ticket code length mismatch")
+        id_length = body[offset]
+        booking_bytes = body[offset + 1:]
+    elif version == 1:
+        if len(body) < _HEADER_V1.size:
+            raise InvalidTicketError("Ticket code too short")
+        _, movie_id, days, bitmap_bytes, id_length = _HEADER_V1.unpack_from(body)
+        booking_bytes = body[_HEADER_V1.size:]
+    else:
+        raise InvalidTicketError(f"Unsupported ticket version {version}")
+    if len(booking_bytes) != id_length:
+        raise InvalidTicketError("Ticket code length mismatch")
+
+    bitmap = int.from_bytes(bitmap_bytes, 'big')
+    seat_map = (seat_maps or {}).get(movie_id)
+    return {
+        'booking_id': booking_bytes.decode('ascii'),
+        'movie_id': movie_id,
+        'show_date': DATE_EPOCH + datetime.timedelta(days=days),
+        'seat_bitmap': bitmap,
+        'seat_numbers': bitmap_to_seats(bitmap, seat_map),
+    }
+
+
+def _sign(body, key):
+    key = key if key is not None else get_signing_key()
+    if not key:
+        # An empty HMAC key is public: anyone could sign tickets with it
+        raise SigningKeyError("Ticket signing key is empty")
+    return hmac.new(key, body, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def _to_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+def _load_signing_key():
+    env_key = os.getenv("TICKET_QR_KEY", "").strip()
+    if env_key:
+        return env_key.encode('utf-8')
+    key_file = os.getenv("TICKET_QR_KEY_FILE", DEFAULT_KEY_FILE)
+    try:
+        return _read_key_file(key_file)
+    except FileNotFoundError:
+        pass
+
+    # First run: create a random key; copy this file to every gate scanner.
+    # Exclusive create, so concurrent processes all end up with one key.
+    key = secrets.token_hex(32).encode('ascii')
+    try:
+        with open(key_file, 'xb') as f:
+            f.write(key)
+        print(f"[+] Created ticket signing key {key_file}")
+        return key
+    except FileExistsError:
+        return _read_key_file(key_file)
+
+
+def _read_key_file(key_file):
+    for attempt in range(KEY_FILE_READ_ATTEMPTS):
+        if attempt:
+            time.sleep(KEY_FILE_READ_INTERVAL)
+        with open(key_file, 'rb') as f:
+            key = f.read().strip()
+        if key:
+            return key
+    raise SigningKeyError(
+        f"Ticket signing key file {key_file} is empty. Copy the key from a kiosk, "
+        "or delete the file to create a new key (tickets already printed will "
+        "then be rejected).")
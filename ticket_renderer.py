@@ -0,0 +1,377 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+from seat_map import load_seat_map
+from ticket_qr import encode_ticket_payload
+
+TICKET_SIZE = (1000, 500)
+POSTER_HEIGHT = 300
+QR_SIZE = 200
+
+# Fonts tried in order; TICKET_FONT (a .ttf path) takes precedence
+FONT_CANDIDATES = (
+    "arial.ttf",
+    "Arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "LiberationSans-Regular.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+)
+
+_default_template = None
+_default_template_lock = threading.Lock()
+
+
+def generate_ticket_qr(booking_data):
+    """
+    Generate the ticket QR code.
+
+    The code holds a compact signed payload (see ticket_qr) with the
+    booking id, movie id, show date and seats, which gate scanners verify
+    offline. booking_data needs booking_id, movie_id, seat_numbers and
+    show_date; seat_layout names the screen's seat map (default standard).
+    """
+    qr_content = encode_ticket_payload(
+        booking_data['booking_id'],
+        booking_data['movie_id'],
+        booking_data['seat_numbers'],
+        booking_data['show_date'],
+        seat_map=load_seat_map(booking_data.get('seat_layout'))
+    )
+    
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_H,
+        box_size=10,
+        border=4
+    )
+    qr.add_data(qr_content)
+    qr.make(fit=True)
+
+    return qr.make_image(fill_color="black", back_color="white")
+
+def load_font(size, candidates=None):
+    """
+    Load a TrueType font, trying several common fonts before giving up.
+
+    Returns:
+        tuple: (font, name) - name is None when falling back to Pillow's
+        built-in font
+    """
+    if candidates is None:
+        candidates = FONT_CANDIDATES
+        if os.getenv("TICKET_FONT"):
+            candidates = (os.getenv("TICKET_FONT"),) + candidates
+    for name in candidates:
+        try:
+            return ImageFont.truetype(name, size), name
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size), None
+    except TypeError:
+        # Pillow < 10.1 has no scalable built-in font
+        return ImageFont.load_default(), None
+
+
+class TicketTemplate:
+    """
+    Reusable ticket layout.
+
+    Fonts are loaded once, and the static layer (background, header,
+    footer, title, field labels, "Scan to verify") is drawn once per layout
+    and copied for every ticket. Only the booking values, poster and QR
+    code are drawn per ticket. The layout depends on the poster width, so
+    one background is cached per width (posters from the cache are all
+    200x300, so in practice there are two: with and without poster).
+
+    Per-stage render times are accumulated and available from stats().
+    """
+
+    def __init__(self):
+        self.width, self.height = TICKET_SIZE
+        self.title_font, title_name = load_font(48)
+        self.heading_font, _ = load_font(24)
+        self.detail_font, _ = load_font(20)
+        self.font_name = title_name
+        if title_name is None:
+            print("[WARN] No TrueType font found for tickets, using Pillow's built-in font "
+                  "(set TICKET_FONT to a .ttf file)")
+        self._backgrounds = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def render(self, booking_data, qr_image, poster=None, timings=None):
+        """
+        Draw one ticket.
+
+        Args:
+            booking_data (dict): Booking fields printed on the ticket
+            qr_image: QR code image from generate_ticket_qr
+            poster (PIL.Image.Image): Movie poster, or None
+            timings (dict): If given, filled with seconds per stage
+
+        Returns:
+            PIL.Image.Image: The ticket
+        """
+        timings = {} if timings is None else timings
+
+        started = time.perf_counter()
+        if poster:
+            poster_width = int((POSTER_HEIGHT / poster.height) * poster.width)
+            if poster.size != (poster_width, POSTER_HEIGHT):
+                poster = poster.resize((poster_width, POSTER_HEIGHT), Image.Resampling.LANCZOS)
+        else:
+            poster_width = 0
+        timings['poster'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        ticket = self._background(poster_width).copy()
+        timings['background'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if poster:
+            ticket.paste(poster, (40, 100))
+        qr_image = qr_image.resize((QR_SIZE, QR_SIZE))
+        ticket.paste(qr_image, self._qr_position())
+        timings['paste'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        draw = ImageDraw.Draw(ticket)
+        details_x = self._details_x(poster_width)
+        y_pos = 120
+        with self._lock:  # FreeType faces are not safe to share between threads
+            for value in self._detail_values(booking_data):
+                draw.text((details_x + 160, y_pos), str(value),
+                          font=self.detail_font, fill='#000000')
+                y_pos += 45
+        timings['text'] = time.perf_counter() - started
+
+        self._record(timings)
+        return ticket
+
+    def stats(self):
+        """
+        Get accumulated per-stage timings.
+
+        Returns:
+            dict: stage -> {'count', 'total_ms', 'avg_ms'}
+        """
+        with self._lock:
+            return {
+                stage: {
+                    'count': count,
+                    'total_ms': round(total * 1000, 3),
+                    'avg_ms': round(total / count * 1000, 3),
+                }
+                for stage, (count, total) in self._stats.items()
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def _background(self, poster_width):
+        with self._lock:
+            background = self._backgrounds.get(poster_width)
+            if background is None:
+                background = self._draw_background(poster_width)
+                self._backgrounds[poster_width] = background
+            return background
+
+    def _draw_background(self, poster_width):
+        """Draw everything that is the same on every ticket (lock held)."""
+        background = Image.new('RGB', (self.width, self.height), 'white')
+        draw = ImageDraw.Draw(background)
+
+        # Add decorative elements
+        draw.rectangle([0, 0, self.width, 80], fill='#ff3b3b')  # Header
+        draw.rectangle([0, self.height-60, self.width, self.height], fill='#ff3b3b')  # Footer
+
+        # Add title
+        draw.text((40, 20), "NOVA MOVIES", font=self.title_font, fill='white')
+
+        # Field labels
+        details_x = self._details_x(poster_width)
+        y_pos = 120
+        for label in ("Booking ID:", "Movie:", "Show Time:", "Seats:",
+                      "Customer:", "Phone:", "Amount:"):
+            draw.text((details_x, y_pos), label, font=self.heading_font, fill='#333333')
+            y_pos += 45
+
+        # Add verification text under QR
+        qr_x, qr_y = self._qr_position()
+        verify_text = "Scan to verify"
+        verify_width = draw.textlength(verify_text, font=self.detail_font)
+        verify_x = qr_x + (QR_SIZE - verify_width) // 2
+        draw.text((verify_x, qr_y + QR_SIZE + 10), verify_text,
+                  font=self.detail_font, fill='#666666')
+        return background
+
+    def _details_x(self, poster_width):
+        # Details start after the poster (40px margin each side)
+        return 40 + poster_width + 40 if poster_width else 40
+
+    def _qr_position(self):
+        # QR code on the right side, vertically centred
+        return self.width - QR_SIZE - 50, (self.height - QR_SIZE) // 2
+
+    @staticmethod
+    def _detail_values(booking_data):
+        return (
+            booking_data['booking_id'],
+            booking_data['movie_title'],
+            booking_data['show_time'],
+            ', '.join(booking_data['seat_numbers']),
+            booking_data['user_name'],
+            booking_data['phone_number'],
+            f"₹{booking_data['price']:.2f}",
+        )
+
+    def _record(self, timings):
+        with self._lock:
+            for stage, seconds in timings.items():
+                count, total = self._stats.get(stage, (0, 0.0))
+                self._stats[stage] = (count + 1, total + seconds)
+
+
+def get_ticket_template():
+    """Return the process-wide ticket template (fonts load on first use)."""
+    global _default_template
+    with _default_template_lock:
+        if _default_template is None:
+            _default_template = TicketTemplate()
+        return _default_template
+
+def create_ticket_image(booking_data, qr_image, poster=None, timings=None):
+    """
+    Create ticket image with movie poster and QR code.
+
+    Args:
+        booking_data (dict): Booking fields printed on the ticket
+        qr_image: QR code image from generate_ticket_qr
+        poster (PIL.Image.Image): Movie poster, or None for no poster
+        timings (dict): If given, filled with seconds per render stage
+    """
+    try:
+        return get_ticket_template().render(booking_data, qr_image, poster, timings)
+
+    except Exception as e:
+        print(f"Error creating ticket image: {e}")
+        # Create simple fallback ticket
+        width, height = TICKET_SIZE
+        ticket = Image.new('RGB', (width, height), 'white')
+        draw = ImageDraw.Draw(ticket)
+        draw.text((20, 20), "NOVA MOVIES TICKET", font=ImageFont.load_default(), fill='black')
+        draw.text((20, 50), f"Booking ID: {booking_data['booking_id']}",
+                 font=ImageFont.load_default(), fill='black')
+        ticket.paste(qr_image, (width-qr_image.size[0]-20, 20))
+        return ticket
+
+def render_ticket(booking_data, poster=None, timings=None):
+    """
+    Render a complete ticket (QR code + ticket image) synchronously.
+
+    If `timings` is a dict it receives seconds per stage: 'qr' plus the
+    template stages ('poster', 'background', 'paste', 'text').
+    """
+    timings = {} if timings is None else timings
+    started = time.perf_counter()
+    qr_image = generate_ticket_qr(booking_data)
+    timings['qr'] = time.perf_counter() - started
+    return create_ticket_image(booking_data, qr_image, poster, timings)
+
+
+class TicketRenderer:
+    """
+    Background ticket rendering and saving.
+
+    Rendering (QR encoding, drawing, poster resize) runs on a worker pool
+    and the finished PIL image is handed straight to the caller, so the
+    booking popup never waits for the PNG to be written and read back.
+    PNG files are written afterwards on a separate single writer thread.
+
+    Args:
+        dispatcher: Object with post(callback, *args) used to deliver
+            results on the Tk thread (None = call on the worker thread)
+        max_workers (int): Concurrent ticket renders
+
+    Nothing here touches Tk, so posters must be passed in as PIL images.
+    """
+
+    def __init__(self, dispatcher=None, max_workers=2):
+        self.dispatcher = dispatcher
+        self._render_executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                   thread_name_prefix="ticket-render")
+        self._save_executor = ThreadPoolExecutor(max_workers=1,
+                                                 thread_name_prefix="ticket-save")
+
+    def render(self, booking_data, callback, poster=None, save_path=None, on_saved=None):
+        """
+        Render a ticket in the background.
+
+        Args:
+            booking_data (dict): Booking fields printed on the ticket
+            callback: callback(booking_data, image) once rendered; image is
+                None if rendering failed
+            poster (PIL.Image.Image): Movie poster, or None
+            save_path (str): Where to write the PNG (None = do not save)
+            on_saved: Optional on_saved(path, error) after the PNG write;
+                error is None on success
+
+        Returns:
+            concurrent.futures.Future: Resolves to the rendered image
+        """
+        return self._render_executor.submit(
+            self._run, booking_data, callback, poster, save_path, on_saved
+        )
+
+    def stats(self):
+        """Per-stage render timings so far (see TicketTemplate.stats)."""
+        return get_ticket_template().stats()
+
+    def shutdown(self, wait=True):
+        """Stop the workers; with wait=True, queued tickets are still saved."""
+        self._render_executor.shutdown(wait=wait)
+        self._save_executor.shutdown(wait=wait)
+
+    def _run(self, booking_data, callback, poster, save_path, on_saved):
+        try:
+            image = render_ticket(booking_data, poster)
+        except Exception as e:
+            print(f"[ERROR] Ticket rendering failed for {booking_data['booking_id']}: {e}")
+            image = None
+
+        self._deliver(callback, booking_data, image)
+        if image is not None and save_path:
+            self._save_executor.submit(self._save, image, save_path, on_saved)
+        return image
+
+    def _save(self, image, path, on_saved):
+        error = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.save(path + ".tmp", format='PNG')
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"[ERROR] Failed to save ticket {path}: {e}")
+            error = e
+        if on_saved:
+            self._deliver(on_saved, path, error)
+
+    def _deliver(self, callback, *args):
+        if callback is None:
+            return
+        if self.dispatcher is not None:
+            self.dispatcher.post(callback, *args)
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"[ERROR] Ticket callback failed: {e}")
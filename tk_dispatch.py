@@ -0,0 +1,53 @@
+import queue
+import tkinter as tk
+
+
+class TkDispatcher:
+    """
+    Run callbacks posted from worker threads on the Tk main thread.
+
+    Tk widgets must only be touched from the thread running mainloop(), so
+    background workers post() their results here. A short root.after() loop
+    drains the queue on the main thread.
+
+    Args:
+        root: Tk root (or any widget) whose event loop runs the callbacks
+        interval_ms (int): How often the queue is drained
+    """
+
+    def __init__(self, root, interval_ms=30):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._running = True
+        self._schedule()
+
+    def post(self, callback, *args, **kwargs):
+        """Queue callback(*args, **kwargs) to run on the Tk thread (thread-safe)."""
+        if self._running:
+            self._queue.put((callback, args, kwargs))
+
+    def stop(self):
+        """Stop draining the queue; pending callbacks are dropped."""
+        self._running = False
+
+    def _schedule(self):
+        try:
+            self.root.after(self.interval_ms, self._drain)
+        except tk.TclError:
+            # Root window destroyed - nothing left to update
+            self._running = False
+
+    def _drain(self):
+        if not self._running:
+            return
+        while True:
+            try:
+                callback, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"[ERROR] UI callback failed: {e}")
+        self._schedule()